@@ -0,0 +1,405 @@
+"""
+Generates a deterministic synthetic data set shaped like schema.prisma, for benchmarks at scale.
+
+Every value is a pure function of the seed and the row's index, so the same sizes and
+seed always produce the same rows, however the work is chunked. The shapes follow
+what real data looks like rather than uniform noise: project sizes follow a power
+law, a few users belong to many projects, a few posts get most of the feedback, and
+Post.content sizes are heavy tailed.
+
+Rows are written with create_many, one transaction per chunk, in table order. Posts
+are indexed by content hash like writes through the app, and the ContentObject
+reference counts of each chunk are written in the same transaction. With
+--resume, tables that are already complete are skipped and a partly written table
+continues after its last committed chunk, so an interrupted load of millions of rows
+can be picked up where it stopped. Pass the same sizes, seed and --anchor to resume.
+
+    poetry run python -m benchmarks.generate --users 100000 --projects 20000 --posts 1000000 --feedback 10000000
+    poetry run python -m benchmarks.generate --feedback 10000000 --resume --anchor 2024-05-10
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import prisma
+import project.workspace_summary
+from prisma import Prisma
+from project.content_index import content_hash
+from project.feedback_counts import recount_feedback_counts
+from project.passwords import hash_password
+from pydantic import BaseModel, Field
+
+BENCHMARK_PASSWORD = "benchmark-password"
+
+TABLES = (
+    "Feedback",
+    "Post",
+    "Task",
+    "ProjectMember",
+    "Project",
+    "Portfolio",
+    "Profile",
+    "User",
+    "ContentObject",
+    "WorkspaceSummary",
+)
+
+_MASK = (1 << 64) - 1
+
+# Each ContentObject row takes 3 parameters, and Postgres allows at most 32767 per statement.
+CONTENT_OBJECTS_PER_STATEMENT = 5000
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua ut enim ad minim veniam quis nostrud "
+).split()
+
+
+class SeedSizes(BaseModel):
+    """
+    The size and shape of a generated data set. Profiles and portfolios are generated one per user.
+    """
+
+    users: int = 1000
+    projects: int = 200
+    posts: int = 2000
+    feedback: int = 20000
+    seed: int = 1
+    anchor: date = Field(default_factory=lambda: datetime.now(timezone.utc).date())
+    min_project_members: int = 2
+    max_project_members: int = 500
+    tasks_per_member: int = 4
+    median_content_bytes: int = 2048
+    max_content_bytes: int = 1024 * 1024
+    chunk_size: int = 10000
+
+
+def _unit(seed: int, stream: int, index: int) -> float:
+    """
+    A uniform number in [0, 1) derived from the seed, a stream and an index with splitmix64, so any row can be generated on its own.
+    """
+    x = (seed * 0x9E3779B97F4A7C15 + stream * 0xD1B54A32D192ED03 + index) & _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return (x ^ (x >> 31)) / 2**64
+
+
+def _skewed(u: float, count: int, skew: float) -> int:
+    """
+    Maps a uniform number to an ID in 1..count, favouring low IDs more the higher skew is. skew 1 is uniform.
+    """
+    return min(count, int(count * u**skew) + 1)
+
+
+def _pareto(u: float, minimum: float, alpha: float) -> float:
+    return minimum * (1 - u) ** (-1 / alpha)
+
+
+class Generator:
+    """
+    Builds the rows of each model for a range of indexes.
+    """
+
+    def __init__(self, sizes: SeedSizes, password: str) -> None:
+        self.sizes = sizes
+        self.password = password
+        self.anchor = datetime.combine(sizes.anchor, datetime.min.time(), timezone.utc)
+
+    def u(self, stream: int, index: int) -> float:
+        return _unit(self.sizes.seed, stream, index)
+
+    def owner(self, project_id: int) -> int:
+        return _skewed(self.u(1, project_id), self.sizes.users, 2.0)
+
+    def members(self, project_id: int) -> List[int]:
+        size = _pareto(self.u(2, project_id), self.sizes.min_project_members, 1.2)
+        size = min(int(size), self.sizes.max_project_members, self.sizes.users)
+        members = {self.owner(project_id)}
+        for position in range(size * 2):
+            if len(members) >= size:
+                break
+            members.add(
+                _skewed(self.u(3, project_id * 4096 + position), self.sizes.users, 3.0)
+            )
+        return sorted(members)
+
+    def users(self, start: int, end: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": user_id,
+                "email": f"user{user_id}@bench.local",
+                "password": self.password,
+                "role": "ADMIN" if user_id % 50 == 1 else "USER",
+            }
+            for user_id in range(start, end)
+        ]
+
+    def profiles(self, start: int, end: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": user_id,
+                "userId": user_id,
+                "bio": f"Bio of user {user_id}",
+                "avatar": f"https://avatars.bench.local/{user_id}.png",
+            }
+            for user_id in range(start, end)
+        ]
+
+    def portfolios(self, start: int, end: int) -> List[Dict[str, Any]]:
+        return [
+            {"id": user_id, "title": f"Portfolio {user_id}", "profileId": user_id}
+            for user_id in range(start, end)
+        ]
+
+    def projects(self, start: int, end: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": project_id,
+                "name": f"Project {project_id}",
+                "status": "ACTIVE" if self.u(4, project_id) < 0.85 else "ARCHIVED",
+                "userId": self.owner(project_id),
+            }
+            for project_id in range(start, end)
+        ]
+
+    def project_members(self, start: int, end: int) -> List[Dict[str, Any]]:
+        rows = []
+        for project_id in range(start, end):
+            owner = self.owner(project_id)
+            rows.extend(
+                {
+                    "projectId": project_id,
+                    "userId": user_id,
+                    "role": "OWNER" if user_id == owner else "MEMBER",
+                }
+                for user_id in self.members(project_id)
+            )
+        return rows
+
+    def tasks(self, start: int, end: int) -> List[Dict[str, Any]]:
+        rows = []
+        for project_id in range(start, end):
+            count = len(self.members(project_id)) * self.sizes.tasks_per_member
+            for task in range(count):
+                u = self.u(5, project_id * 65536 + task)
+                rows.append(
+                    {
+                        "title": f"Task {task} of project {project_id}",
+                        "description": "Generated task",
+                        "dueDate": self.anchor + timedelta(days=int(u * 90) - 30),
+                        "projectId": project_id,
+                    }
+                )
+        return rows
+
+    def content(self, post_id: int) -> Dict[str, Any]:
+        size = _pareto(self.u(6, post_id), self.sizes.median_content_bytes / 2, 1.0)
+        size = min(int(size), self.sizes.max_content_bytes)
+        offset = int(self.u(7, post_id) * len(WORDS))
+        words = WORDS[offset:] + WORDS[:offset]
+        paragraph = " ".join(words)
+        blocks = []
+        while size > 0:
+            text = paragraph[: min(size, 1024)]
+            blocks.append({"type": "paragraph", "text": text})
+            size -= len(text) + 32
+        return {"version": 1, "blocks": blocks}
+
+    def posts(self, start: int, end: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": post_id,
+                "title": f"Post {post_id}",
+                "content": prisma.Json(self.content(post_id)),
+                "type": ("TEXT", "IMAGE", "VIDEO")[int(self.u(8, post_id) * 3)],
+                "createdAt": self.anchor - timedelta(days=self.u(9, post_id) * 365),
+                "userId": _skewed(self.u(10, post_id), self.sizes.users, 2.0),
+            }
+            for post_id in range(start, end)
+        ]
+
+    def feedback(self, start: int, end: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": feedback_id,
+                "content": f"Feedback {feedback_id}",
+                "createdAt": self.anchor
+                - timedelta(minutes=self.u(11, feedback_id) * 90 * 24 * 60),
+                "userId": _skewed(self.u(12, feedback_id), self.sizes.users, 1.5),
+                "postId": _skewed(self.u(13, feedback_id), self.sizes.posts, 4.0),
+            }
+            for feedback_id in range(start, end)
+        ]
+
+    def tables(
+        self,
+    ) -> List[Tuple[str, str, str, int, Callable[[int, int], List[Dict[str, Any]]]]]:
+        """
+        The tables in load order: the Prisma model, the table, the column a chunk's position is read back from when resuming, the number of indexes, and the row builder.
+        """
+        sizes = self.sizes
+        return [
+            ("user", "User", "id", sizes.users, self.users),
+            ("profile", "Profile", "id", sizes.users, self.profiles),
+            ("portfolio", "Portfolio", "id", sizes.users, self.portfolios),
+            ("project", "Project", "id", sizes.projects, self.projects),
+            (
+                "projectmember",
+                "ProjectMember",
+                "projectId",
+                sizes.projects,
+                self.project_members,
+            ),
+            ("task", "Task", "projectId", sizes.projects, self.tasks),
+            ("post", "Post", "id", sizes.posts, self.posts),
+            ("feedback", "Feedback", "id", sizes.feedback, self.feedback),
+        ]
+
+
+def _chunk_size(sizes: SeedSizes, model: str) -> int:
+    """
+    Chunks are counted in indexes. A project expands to a dozen members and several times as many tasks on average, and posts are large, so those chunks cover fewer indexes to keep each transaction a similar size.
+    """
+    if model in ("projectmember", "task"):
+        return max(1, sizes.chunk_size // (12 * max(sizes.tasks_per_member, 1)))
+    if model == "post":
+        return max(1, sizes.chunk_size * 256 // max(sizes.median_content_bytes, 256))
+    return sizes.chunk_size
+
+
+async def truncate(client: Prisma) -> None:
+    """
+    Empties every table and restarts their identities.
+    """
+    tables = ", ".join(f'"{table}"' for table in TABLES)
+    await client.execute_raw(f"TRUNCATE {tables} RESTART IDENTITY CASCADE")
+
+
+async def _resume_from(client: Prisma, table: str, column: str, chunk: int) -> int:
+    rows = await client.query_raw(f'SELECT max("{column}") AS "last" FROM "{table}"')
+    last: Optional[int] = rows[0]["last"] if rows else None
+    if last is None:
+        return 1
+    return (last - 1) // chunk * chunk + chunk + 1
+
+
+def _index_contents(rows: List[Dict[str, Any]]) -> List[Tuple[str, int, int]]:
+    """
+    Sets the contentHash of generated posts, the way writes through the app do, and counts how many of them share each payload.
+
+    Returns:
+        List[Tuple[str, int, int]]: The hash, size and number of posts of each distinct payload.
+    """
+    counts: Counter = Counter()
+    sizes: Dict[str, int] = {}
+    for row in rows:
+        hash, size, _ = content_hash(row["content"].data)
+        row["contentHash"] = hash
+        counts[hash] += 1
+        sizes[hash] = size
+    return [(hash, sizes[hash], count) for hash, count in counts.items()]
+
+
+async def _retain_contents(client: Prisma, objects: List[Tuple[str, int, int]]) -> None:
+    for offset in range(0, len(objects), CONTENT_OBJECTS_PER_STATEMENT):
+        batch = objects[offset : offset + CONTENT_OBJECTS_PER_STATEMENT]
+        values = ", ".join(
+            f"(${position * 3 + 1}, ${position * 3 + 2}, false, ${position * 3 + 3}, now() AT TIME ZONE 'UTC')"
+            for position in range(len(batch))
+        )
+        await client.execute_raw(
+            'INSERT INTO "ContentObject" ("hash", "size", "blob", "refCount", "createdAt") '
+            f"VALUES {values} "
+            'ON CONFLICT ("hash") DO UPDATE SET "refCount" = "ContentObject"."refCount" + EXCLUDED."refCount"',
+            *(value for content_object in batch for value in content_object),
+        )
+
+
+async def _finish(client: Prisma) -> None:
+    for table in ("User", "Profile", "Portfolio", "Project", "Post", "Feedback"):
+        await client.execute_raw(
+            f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+            f'coalesce((SELECT max("id") FROM "{table}"), 0) + 1, false)'
+        )
+    await recount_feedback_counts(client)
+    await client.execute_raw("ANALYZE")
+    await project.workspace_summary.rebuild_workspace_summaries()
+
+
+async def generate(client: Prisma, sizes: SeedSizes, resume: bool = False) -> None:
+    """
+    Loads a generated data set. Without resume the database is emptied first; with resume, loading continues after the last committed chunk of each table.
+
+    Args:
+        client (Prisma): A connected client, registered as the default client.
+        sizes (SeedSizes): The size and shape of the data set.
+        resume (bool): Whether to continue an interrupted load instead of starting over.
+    """
+    generator = Generator(sizes, await hash_password(BENCHMARK_PASSWORD))
+    if not resume:
+        await truncate(client)
+    for model, table, column, count, build in generator.tables():
+        chunk = _chunk_size(sizes, model)
+        start = await _resume_from(client, table, column, chunk) if resume else 1
+        started_at = time.perf_counter()
+        written = 0
+        while start <= count:
+            end = min(start + chunk, count + 1)
+            rows = build(start, end)
+            objects = _index_contents(rows) if model == "post" else []
+            async with client.tx(timeout=timedelta(minutes=10)) as transaction:
+                await getattr(transaction, model).create_many(
+                    data=rows, skip_duplicates=True
+                )
+                await _retain_contents(transaction, objects)
+            written += len(rows)
+            start = end
+            elapsed = time.perf_counter() - started_at
+            print(
+                f"\r{table:<14}{end - 1:>12}/{count:<12}{written / max(elapsed, 1e-9):>10.0f} rows/s",
+                end="",
+                flush=True,
+            )
+        print()
+    await _finish(client)
+
+
+def add_size_arguments(parser: argparse.ArgumentParser) -> None:
+    for name, field in SeedSizes.model_fields.items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            type=date.fromisoformat if name == "anchor" else int,
+            default=None,
+        )
+
+
+def parse_sizes(args: argparse.Namespace) -> SeedSizes:
+    return SeedSizes(
+        **{
+            name: getattr(args, name)
+            for name in SeedSizes.model_fields
+            if getattr(args, name) is not None
+        }
+    )
+
+
+async def main(sizes: SeedSizes, resume: bool) -> None:
+    print(f"Generating {sizes.model_dump_json()}")
+    client = Prisma(auto_register=True)
+    await client.connect()
+    try:
+        await generate(client, sizes, resume)
+    finally:
+        await client.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_size_arguments(parser)
+    parser.add_argument("--resume", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(parse_sizes(args), args.resume))
@@ -0,0 +1,644 @@
+"""
+Load tests every route of the app against a seeded local database.
+
+Requests go through an in-process ASGI client, so the timings cover routing,
+services, Prisma queries and serialization without network overhead. Each route is
+driven at every concurrency level, and the p50/p95/p99 latency, throughput and
+Prisma queries per request (from the Server-Timing header) are reported. Results
+can be saved as a JSON baseline and later runs compared against it.
+
+    poetry run python -m benchmarks.load --reseed --users 1000 --feedback 20000
+    poetry run python -m benchmarks.load --concurrency 1,8,32 --save benchmarks/baselines/main.json
+    poetry run python -m benchmarks.load --compare benchmarks/baselines/main.json
+
+Pass the same sizes and seed the database was generated with (see
+benchmarks/generate.py), or --reseed to generate it first. Routes that delete data
+only run with --destructive; they consume the highest seeded IDs, so reseed before
+the next run.
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import statistics
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import project.server
+from benchmarks.generate import (
+    BENCHMARK_PASSWORD,
+    SeedSizes,
+    add_size_arguments,
+    generate,
+    parse_sizes,
+)
+from project.auth import issue_token
+from pydantic import BaseModel
+
+# Generated users 1, 51, 101, ... are admins; requests are sent with a session of the first.
+BENCHMARK_ADMIN_ID = 1
+
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+class RequestSpec(BaseModel):
+    method: str
+    url: str
+    params: Dict[str, Any] = {}
+    json_body: Any = None
+    content: Optional[bytes] = None
+    headers: Dict[str, str] = {}
+
+
+class Dataset:
+    """
+    Picks IDs out of the seeded data. Reads pick at random with a fixed seed; destructive routes take distinct IDs from the top of each range. Datasets sharing taken never take the same ID twice, so one destructive route does not only hit rows another already deleted.
+    """
+
+    def __init__(self, sizes: SeedSizes, taken: Optional[Counter] = None) -> None:
+        self.sizes = sizes
+        self.rng = random.Random(sizes.seed)
+        self._taken: Counter = taken if taken is not None else Counter()
+
+    def pick(self, model: str) -> int:
+        return self.rng.randint(1, getattr(self.sizes, model))
+
+    def take(self, model: str) -> int:
+        self._taken[model] += 1
+        return getattr(self.sizes, model) + 1 - self._taken[model]
+
+    def unique(self) -> str:
+        return f"{time.time_ns()}-{self.rng.randrange(1 << 30)}"
+
+
+class Scenario:
+    def __init__(
+        self,
+        name: str,
+        build: Callable[[Dataset], RequestSpec],
+        destructive: bool = False,
+    ) -> None:
+        self.name = name
+        self.build = build
+        self.destructive = destructive
+
+
+def _deadline() -> str:
+    return (datetime.now(timezone.utc) + timedelta(days=7)).isoformat()
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario(
+        "GET /projects",
+        lambda d: RequestSpec(method="GET", url="/projects", params={"limit": 50}),
+    ),
+    Scenario(
+        "GET /projects?batchTasks",
+        lambda d: RequestSpec(
+            method="GET",
+            url="/projects",
+            params={"limit": 50, "batchTasks": True, "taskLimit": 10},
+        ),
+    ),
+    Scenario(
+        "GET /projects/{id}",
+        lambda d: RequestSpec(method="GET", url=f"/projects/{d.pick('projects')}"),
+    ),
+    Scenario(
+        "GET /projects/{id}/tasks",
+        lambda d: RequestSpec(
+            method="GET",
+            url=f"/projects/{d.pick('projects')}/tasks",
+            params={"role": "USER"},
+        ),
+    ),
+    Scenario(
+        "GET /public/projects/{id}",
+        lambda d: RequestSpec(
+            method="GET", url=f"/public/projects/{d.pick('projects')}"
+        ),
+    ),
+    Scenario(
+        "GET /users",
+        lambda d: RequestSpec(
+            method="GET", url="/users", params={"role": "ADMIN", "status": ""}
+        ),
+    ),
+    Scenario(
+        "GET /users/{userId}",
+        lambda d: RequestSpec(method="GET", url=f"/users/{d.pick('users')}"),
+    ),
+    Scenario(
+        "GET /portfolios/{userId}",
+        lambda d: RequestSpec(method="GET", url=f"/portfolios/{d.pick('users')}"),
+    ),
+    Scenario(
+        "GET /workspaces",
+        lambda d: RequestSpec(method="GET", url="/workspaces", json_body={}),
+    ),
+    Scenario(
+        "GET /workspace/{workspaceId}",
+        lambda d: RequestSpec(method="GET", url=f"/workspace/{d.pick('users')}"),
+    ),
+    Scenario(
+        "GET /workspace/{workspaceId}/summary",
+        lambda d: RequestSpec(
+            method="GET", url=f"/workspace/{d.pick('users')}/summary"
+        ),
+    ),
+    Scenario(
+        "GET /content",
+        lambda d: RequestSpec(
+            method="GET",
+            url="/content",
+            params={"ids": ",".join(str(d.pick("posts")) for _ in range(50))},
+        ),
+    ),
+    Scenario(
+        "GET /content/{contentId}",
+        lambda d: RequestSpec(method="GET", url=f"/content/{d.pick('posts')}"),
+    ),
+    Scenario(
+        "GET /content/{contentId}/raw",
+        lambda d: RequestSpec(
+            method="GET",
+            url=f"/content/{d.pick('posts')}/raw",
+            headers={"Range": "bytes=0-99"},
+        ),
+    ),
+    Scenario(
+        "GET /content/{contentId}/feedback/summary",
+        lambda d: RequestSpec(
+            method="GET", url=f"/content/{d.pick('posts')}/feedback/summary"
+        ),
+    ),
+    Scenario(
+        "GET /content/dedupe/report",
+        lambda d: RequestSpec(method="GET", url="/content/dedupe/report"),
+    ),
+    Scenario(
+        "GET /feedback",
+        lambda d: RequestSpec(
+            method="GET", url="/feedback", params={"content_id": d.pick("posts")}
+        ),
+    ),
+    Scenario(
+        "GET /feedback/{feedbackId}",
+        lambda d: RequestSpec(method="GET", url=f"/feedback/{d.pick('feedback')}"),
+    ),
+    Scenario(
+        "GET /health/db",
+        lambda d: RequestSpec(method="GET", url="/health/db"),
+    ),
+    Scenario(
+        "GET /metrics/password-hashing",
+        lambda d: RequestSpec(method="GET", url="/metrics/password-hashing"),
+    ),
+    Scenario(
+        "POST /users/authenticate",
+        lambda d: RequestSpec(
+            method="POST",
+            url="/users/authenticate",
+            params={
+                "email": f"user{d.pick('users')}@bench.local",
+                "password": BENCHMARK_PASSWORD,
+            },
+        ),
+    ),
+    Scenario(
+        "POST /users",
+        lambda d: RequestSpec(
+            method="POST",
+            url="/users",
+            params={
+                "name": "Benchmark",
+                "email": f"new-{d.unique()}@bench.local",
+                "password": BENCHMARK_PASSWORD,
+            },
+        ),
+    ),
+    Scenario(
+        "PUT /users/{userId}",
+        lambda d: RequestSpec(
+            method="PUT",
+            url=f"/users/{d.pick('users')}",
+            params={
+                "name": "",
+                "email": "",
+                "password": "",
+                "bio": f"Updated {d.unique()}",
+                "avatar": "",
+            },
+        ),
+    ),
+    Scenario(
+        "POST /projects",
+        lambda d: RequestSpec(
+            method="POST",
+            url="/projects",
+            params={
+                "name": f"Project {d.unique()}",
+                "description": "",
+                "userId": d.pick("users"),
+            },
+            json_body=[d.pick("users") for _ in range(3)],
+        ),
+    ),
+    Scenario(
+        "POST /projects/batch",
+        lambda d: RequestSpec(
+            method="POST",
+            url="/projects/batch",
+            json_body=[
+                {
+                    "name": f"Project {d.unique()}",
+                    "userId": d.pick("users"),
+                    "members": [d.pick("users") for _ in range(3)],
+                }
+                for _ in range(10)
+            ],
+        ),
+    ),
+    Scenario(
+        "PUT /projects/{id}",
+        lambda d: RequestSpec(
+            method="PUT",
+            url=f"/projects/{d.pick('projects')}",
+            params={"name": f"Project {d.unique()}", "description": ""},
+        ),
+    ),
+    Scenario(
+        "POST /projects/{id}/tasks",
+        lambda d: RequestSpec(
+            method="POST",
+            url=f"/projects/{d.pick('projects')}/tasks",
+            params={
+                "project_id": d.pick("projects"),
+                "description": "Benchmark task",
+                "deadline": _deadline(),
+                "assigned_user_id": d.pick("users"),
+            },
+        ),
+    ),
+    Scenario(
+        "POST /projects/tasks/bulk",
+        lambda d: RequestSpec(
+            method="POST",
+            url="/projects/tasks/bulk",
+            json_body=[
+                {
+                    "project_id": d.pick("projects"),
+                    "description": "Benchmark task",
+                    "deadline": _deadline(),
+                    "assigned_user_id": d.pick("users"),
+                }
+                for _ in range(100)
+            ],
+        ),
+    ),
+    Scenario(
+        "POST /workspace",
+        lambda d: RequestSpec(
+            method="POST",
+            url="/workspace",
+            params={
+                "userId": d.pick("users"),
+                "workspaceName": f"Workspace {d.unique()}",
+                "workspaceDescription": "",
+            },
+        ),
+    ),
+    Scenario(
+        "PUT /workspace/{workspaceId}",
+        lambda d: RequestSpec(
+            method="PUT",
+            url=f"/workspace/{d.pick('projects')}",
+            params={"projectName": "", "projectStatus": "ACTIVE", "description": ""},
+        ),
+    ),
+    Scenario(
+        "POST /content/create",
+        lambda d: RequestSpec(
+            method="POST",
+            url="/content/create",
+            params={"userId": d.pick("users"), "title": "Post", "type": "TEXT"},
+            json_body={"text": f"Benchmark post {d.unique()}"},
+        ),
+    ),
+    Scenario(
+        "PUT /content/update/{contentId}",
+        lambda d: RequestSpec(
+            method="PUT",
+            url=f"/content/update/{d.pick('posts')}",
+            params={"title": "Updated", "type": "TEXT"},
+            json_body={"text": f"Updated post {d.unique()}"},
+        ),
+    ),
+    Scenario(
+        "POST /portfolio/upload/{userId}/{contentId}",
+        lambda d: RequestSpec(
+            method="POST",
+            url=f"/portfolio/upload/{d.pick('users')}/{d.pick('posts')}",
+            json_body={"title": "Upload", "type": "TEXT", "data": d.unique() * 20},
+        ),
+    ),
+    Scenario(
+        "POST /portfolio/upload/{userId}/{contentId}/stream",
+        lambda d: RequestSpec(
+            method="POST",
+            url=f"/portfolio/upload/{d.pick('users')}/{d.pick('posts')}/stream",
+            params={"title": "Upload", "type": "IMAGE"},
+            content=d.unique().encode() * 4096,
+            headers={"Content-Type": "application/octet-stream"},
+        ),
+    ),
+    Scenario(
+        "POST /portfolios",
+        lambda d: RequestSpec(
+            method="POST",
+            url="/portfolios",
+            params={
+                "user_id": d.pick("users"),
+                "title": "Portfolio",
+                "description": "",
+                "auth_token": "",
+            },
+        ),
+    ),
+    Scenario(
+        "PUT /portfolios/{userId}",
+        lambda d: RequestSpec(
+            method="PUT",
+            url=f"/portfolios/{d.pick('users')}",
+            params={"title": "Portfolio", "description": ""},
+            json_body=[
+                {
+                    "contentId": d.pick("posts"),
+                    "contentData": f"Portfolio item {d.unique()}",
+                    "contentType": "TEXT",
+                }
+                for _ in range(5)
+            ],
+        ),
+    ),
+    Scenario(
+        "POST /feedback",
+        lambda d: RequestSpec(
+            method="POST",
+            url="/feedback",
+            params={
+                "userId": d.pick("users"),
+                "postId": d.pick("posts"),
+                "content": "Benchmark feedback",
+            },
+        ),
+    ),
+    Scenario(
+        "PATCH /feedback/{feedbackId}/status",
+        lambda d: RequestSpec(
+            method="PATCH",
+            url=f"/feedback/{d.pick('feedback')}/status",
+            params={"newStatus": "reviewed"},
+        ),
+    ),
+    Scenario(
+        "DELETE /feedback/{feedbackId}",
+        lambda d: RequestSpec(method="DELETE", url=f"/feedback/{d.take('feedback')}"),
+        destructive=True,
+    ),
+    Scenario(
+        "DELETE /content/delete/{contentId}",
+        lambda d: RequestSpec(
+            method="DELETE", url=f"/content/delete/{d.take('posts')}"
+        ),
+        destructive=True,
+    ),
+    Scenario(
+        "DELETE /projects/{id}",
+        lambda d: RequestSpec(
+            method="DELETE",
+            url=f"/projects/{d.take('projects')}",
+            params={"admin_user_id": 1},
+        ),
+        destructive=True,
+    ),
+    Scenario(
+        "DELETE /workspace/{workspaceId}",
+        lambda d: RequestSpec(method="DELETE", url=f"/workspace/{d.take('projects')}"),
+        destructive=True,
+    ),
+    Scenario(
+        "DELETE /portfolios/{userId}",
+        lambda d: RequestSpec(method="DELETE", url=f"/portfolios/{d.take('users')}"),
+        destructive=True,
+    ),
+    Scenario(
+        "DELETE /users/{userId}",
+        lambda d: RequestSpec(method="DELETE", url=f"/users/{d.take('users')}"),
+        destructive=True,
+    ),
+]
+
+
+class RouteResult(BaseModel):
+    """
+    The measurements of one route at one concurrency level. Latencies are in milliseconds; errors counts every 4xx and 5xx response.
+    """
+
+    route: str
+    concurrency: int
+    requests: int
+    errors: int
+    statuses: Dict[str, int]
+    p50: float
+    p95: float
+    p99: float
+    throughput: float
+    queriesPerRequest: Optional[float]
+
+
+class Baseline(BaseModel):
+    """
+    The results of a run, saved for comparison with later runs.
+    """
+
+    createdAt: datetime
+    sizes: SeedSizes
+    results: List[RouteResult]
+
+
+def _percentile(timings: List[float], fraction: float) -> float:
+    return timings[min(len(timings) - 1, int(fraction * len(timings)))]
+
+
+async def _send(client: httpx.AsyncClient, spec: RequestSpec) -> httpx.Response:
+    return await client.request(
+        spec.method,
+        spec.url,
+        params=spec.params,
+        json=spec.json_body,
+        content=spec.content,
+        headers=spec.headers,
+    )
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    dataset: Dataset,
+    concurrency: int,
+    requests: int,
+) -> RouteResult:
+    """
+    Sends requests to one route from concurrency workers at once.
+
+    Args:
+        client (httpx.AsyncClient): A client bound to the app.
+        scenario (Scenario): The route to drive.
+        dataset (Dataset): Where request parameters are picked from.
+        concurrency (int): How many requests are in flight at a time.
+        requests (int): How many requests to send in total.
+
+    Returns:
+        RouteResult: The latency, throughput and query count measurements.
+    """
+    specs = [scenario.build(dataset) for _ in range(requests)]
+    timings: List[float] = []
+    queries: List[int] = []
+    statuses: Counter = Counter()
+
+    async def worker() -> None:
+        while specs:
+            spec = specs.pop()
+            started_at = time.perf_counter()
+            response = await _send(client, spec)
+            await response.aread()
+            timings.append((time.perf_counter() - started_at) * 1000)
+            statuses[str(response.status_code)] += 1
+            match = SERVER_TIMING_QUERIES.search(
+                response.headers.get("server-timing", "")
+            )
+            if match:
+                queries.append(int(match.group(1)))
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+    timings.sort()
+    return RouteResult(
+        route=scenario.name,
+        concurrency=concurrency,
+        requests=requests,
+        errors=sum(count for status, count in statuses.items() if int(status) >= 400),
+        statuses=dict(statuses),
+        p50=statistics.median(timings),
+        p95=_percentile(timings, 0.95),
+        p99=_percentile(timings, 0.99),
+        throughput=requests / elapsed,
+        queriesPerRequest=statistics.mean(queries) if queries else None,
+    )
+
+
+def print_result(result: RouteResult, baseline: Optional[RouteResult]) -> None:
+    queries = (
+        f"{result.queriesPerRequest:.1f}"
+        if result.queriesPerRequest is not None
+        else "-"
+    )
+    statuses = " ".join(
+        f"{status}x{count}" for status, count in sorted(result.statuses.items())
+    )
+    line = (
+        f"{result.route:<52}{result.concurrency:>5}{result.p50:>9.1f}"
+        f"{result.p95:>9.1f}{result.p99:>9.1f}{result.throughput:>9.0f}"
+        f"{queries:>8}  {statuses}"
+    )
+    if baseline is not None:
+        line += f"  p95 {(result.p95 / baseline.p95 - 1) * 100:+.0f}%"
+    if result.errors:
+        line += f"  {result.errors} errors"
+    print(line)
+
+
+async def main(args: argparse.Namespace) -> None:
+    sizes = parse_sizes(args)
+    baseline: Dict[Any, RouteResult] = {}
+    if args.compare:
+        previous = Baseline.model_validate_json(Path(args.compare).read_text())
+        baseline = {(r.route, r.concurrency): r for r in previous.results}
+    pattern = re.compile(args.routes) if args.routes else None
+    scenarios = [
+        scenario
+        for scenario in SCENARIOS
+        if (args.destructive or not scenario.destructive)
+        and (pattern is None or pattern.search(scenario.name))
+    ]
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+    results = []
+    app = project.server.app
+    async with app.router.lifespan_context(app):
+        if args.reseed:
+            await generate(project.server.db_client, sizes)
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        token, _ = issue_token(BENCHMARK_ADMIN_ID, "ADMIN")
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://bench",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=None,
+        ) as client:
+            print(
+                f"{'route':<52}{'conc':>5}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+                f"{'req/s':>9}{'queries':>8}  statuses"
+            )
+            taken: Counter = Counter()
+            for scenario in scenarios:
+                dataset = Dataset(sizes, taken)
+                if not scenario.destructive:
+                    for _ in range(args.warmup):
+                        await _send(client, scenario.build(dataset))
+                for concurrency in concurrency_levels:
+                    result = await run_scenario(
+                        client, scenario, dataset, concurrency, args.requests
+                    )
+                    results.append(result)
+                    print_result(result, baseline.get((result.route, concurrency)))
+    if args.save:
+        path = Path(args.save)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            Baseline(
+                createdAt=datetime.now(timezone.utc), sizes=sizes, results=results
+            ).model_dump_json(indent=2)
+        )
+        print(f"Saved baseline to {path}")
+    failed = [result for result in results if result.errors]
+    if failed:
+        # Error responses are usually much faster than real work, so their latencies are not comparable.
+        for result in failed:
+            print(
+                f"{result.route} at concurrency {result.concurrency}: "
+                f"{result.errors} of {result.requests} requests failed"
+            )
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--routes", help="Only run routes matching this regex.")
+    parser.add_argument("--destructive", action="store_true")
+    parser.add_argument(
+        "--reseed", action="store_true", help="Generate the database before the run."
+    )
+    add_size_arguments(parser)
+    parser.add_argument("--save", help="Write the results to this JSON baseline.")
+    parser.add_argument("--compare", help="Compare p95 latencies with this baseline.")
+    asyncio.run(main(parser.parse_args()))
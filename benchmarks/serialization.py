@@ -0,0 +1,156 @@
+"""
+Compares response serialization with the standard library json encoder and orjson.
+
+Each payload is served by two in-process apps that differ only in their default
+response class, and is requested through an ASGI client, so the timings include
+FastAPI's response model validation and rendering but no database or network.
+
+    poetry run python -m benchmarks.serialization --requests 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Type
+
+import httpx
+import prisma.enums
+import project.getProjects_service
+import project.getUser_service
+import project.listFeedback_service
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def projects_payload(projects: int = 500, tasks: int = 10) -> BaseModel:
+    return project.getProjects_service.GetProjectsResponse(
+        projects=[
+            project.getProjects_service.ProjectDetails(
+                id=project_id,
+                name=f"Project {project_id}",
+                status=prisma.enums.ProjectStatus.ACTIVE,
+                tasks=[
+                    project.getProjects_service.TaskDetails(
+                        title=f"Task {task_id}",
+                        dueDate=NOW + timedelta(days=task_id),
+                        description="Lorem ipsum dolor sit amet " * 4,
+                    )
+                    for task_id in range(tasks)
+                ],
+                taskCount=tasks,
+            )
+            for project_id in range(projects)
+        ],
+        nextCursor=projects,
+    )
+
+
+def feedback_payload(entries: int = 500) -> BaseModel:
+    return project.listFeedback_service.FeedbackListResponse(
+        feedbacks=[
+            project.listFeedback_service.FeedbackDetail(
+                id=feedback_id,
+                user_details=project.listFeedback_service.UserDetails(
+                    user_id=feedback_id % 50,
+                    username=f"user{feedback_id % 50}@example.com",
+                    avatar="https://example.com/avatar.png",
+                ),
+                content="Great work, a few comments inline. " * 3,
+                created_at=NOW - timedelta(minutes=feedback_id),
+            )
+            for feedback_id in range(entries)
+        ],
+        next_cursor="MjAyNC0wMS0wMVQwMDowMDowMCswMDowMHw0NTA",
+    )
+
+
+def user_payload(projects: int = 200) -> BaseModel:
+    return project.getUser_service.UserProfileResponse(
+        id=1,
+        email="user@example.com",
+        role=prisma.enums.Role.USER,
+        profile=project.getUser_service.EmbeddedProfileType(
+            bio="Bio " * 50, avatar="https://example.com/avatar.png", portfolio=[]
+        ),
+        projects=[
+            project.getUser_service.Project(
+                id=project_id,
+                name=f"Project {project_id}",
+                status=prisma.enums.ProjectStatus.ACTIVE,
+            )
+            for project_id in range(projects)
+        ],
+        feedbackCount=42,
+    )
+
+
+PAYLOADS: Dict[str, Callable[[], BaseModel]] = {
+    "/projects": projects_payload,
+    "/feedback": feedback_payload,
+    "/users": user_payload,
+}
+
+
+def build_app(
+    response_class: Type[JSONResponse], payloads: Dict[str, BaseModel]
+) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+    for path, payload in payloads.items():
+        app.add_api_route(
+            path, _endpoint(payload), response_model=type(payload), methods=["GET"]
+        )
+    return app
+
+
+def _endpoint(payload: BaseModel) -> Callable[[], Awaitable[BaseModel]]:
+    async def endpoint() -> BaseModel:
+        return payload
+
+    return endpoint
+
+
+async def measure(app: FastAPI, path: str, requests: int) -> List[float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for _ in range(min(10, requests)):
+            (await client.get(path)).raise_for_status()
+        timings = []
+        for _ in range(requests):
+            started_at = time.perf_counter()
+            response = await client.get(path)
+            timings.append((time.perf_counter() - started_at) * 1000)
+            response.raise_for_status()
+    return timings
+
+
+async def main(requests: int) -> None:
+    payloads = {path: build() for path, build in PAYLOADS.items()}
+    apps = {
+        "json": build_app(JSONResponse, payloads),
+        "orjson": build_app(ORJSONResponse, payloads),
+    }
+    print(f"{'route':<12}{'encoder':<8}{'p50 ms':>10}{'p95 ms':>10}{'req/s':>10}")
+    for path in payloads:
+        medians = {}
+        for name, app in apps.items():
+            timings = sorted(await measure(app, path, requests))
+            medians[name] = statistics.median(timings)
+            p95 = timings[int(0.95 * (len(timings) - 1))]
+            print(
+                f"{path:<12}{name:<8}{medians[name]:>10.2f}{p95:>10.2f}"
+                f"{1000 / statistics.mean(timings):>10.0f}"
+            )
+        print(f"{'':<12}speedup {medians['json'] / medians['orjson']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    asyncio.run(main(parser.parse_args().requests))
@@ -1,10 +1,21 @@
+import asyncio
+import logging
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Dict, List, Optional
 
 import prisma
+import prisma.errors
 import prisma.models
+from project.lookups import Lookup, LookupFailed, run_lookups
+from project.workspace_summary import tasks_added
 from pydantic import BaseModel
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_TASK_CHUNK_SIZE = 500
+
+MAX_TASK_CHUNK_SIZE = 5000
+
 
 class TaskDetails(BaseModel):
     """
@@ -27,6 +38,50 @@ class TaskCreationResponse(BaseModel):
     task_details: TaskDetails
 
 
+class BulkTaskInput(BaseModel):
+    """
+    One task of a bulk import, with the same details as a single task creation.
+    """
+
+    project_id: int
+    description: str
+    deadline: datetime
+    assigned_user_id: int
+
+
+class BulkTaskResult(BaseModel):
+    """
+    The outcome of one task of a bulk import, identified by its position in the request.
+    """
+
+    index: int
+    success: bool
+    message: str
+
+
+class BulkTaskProgress(BaseModel):
+    """
+    Progress of a bulk import after one chunk, with the outcome of every task settled since the previous progress report.
+    """
+
+    total: int
+    processed: int
+    inserted: int
+    failed: int
+    results: List[BulkTaskResult]
+
+
+class BulkTaskCreationResponse(BaseModel):
+    """
+    The outcome of a bulk import: how many tasks were inserted, how many failed, and the outcome of each task.
+    """
+
+    total: int
+    inserted: int
+    failed: int
+    results: List[BulkTaskResult]
+
+
 async def addTaskToProject(
     project_id: int, description: str, deadline: datetime, assigned_user_id: int
 ) -> TaskCreationResponse:
@@ -42,12 +97,21 @@ async def addTaskToProject(
     Returns:
         TaskCreationResponse: This model provides feedback on the operation of adding a new task to a project, including the task details with a success message.
     """
-    project = await prisma.models.Project.prisma().find_unique(where={"id": project_id})
-    user = await prisma.models.User.prisma().find_unique(where={"id": assigned_user_id})
-    if not project or not user:
+    try:
+        project, _ = await run_lookups(
+            Lookup(
+                prisma.models.Project.prisma().find_unique(where={"id": project_id}),
+                "Project or User does not exist.",
+            ),
+            Lookup(
+                prisma.models.User.prisma().find_unique(where={"id": assigned_user_id}),
+                "Project or User does not exist.",
+            ),
+        )
+    except LookupFailed as e:
         return TaskCreationResponse(
             success=False,
-            message="Project or User does not exist.",
+            message=e.message,
             task_id=0,
             task_details=TaskDetails(
                 title="", dueDate=deadline, description=description
@@ -70,6 +134,7 @@ async def addTaskToProject(
                 title=description[:255], dueDate=deadline, description=description
             ),
         )
+    await tasks_added(project, [deadline])
     return TaskCreationResponse(
         success=True,
         message="Task successfully added to the project.",
@@ -78,3 +143,129 @@ async def addTaskToProject(
             title=description[:255], dueDate=deadline, description=description
         ),
     )
+
+
+async def streamTasksToProjects(
+    tasks: List[BulkTaskInput], chunk_size: int = DEFAULT_TASK_CHUNK_SIZE
+) -> AsyncIterator[BulkTaskProgress]:
+    """
+    Imports a batch of tasks, reporting progress after each chunk. Every referenced project and user is validated up front with one `in` query each, then the valid tasks are inserted with create_many in chunks of chunk_size. Each chunk is committed on its own, so a failing chunk does not roll back the chunks before it.
+
+    Args:
+        tasks (List[BulkTaskInput]): The tasks to import.
+        chunk_size (int): The number of tasks inserted per create_many.
+
+    Yields:
+        BulkTaskProgress: The running totals, and the outcome of the tasks settled by the latest validation pass or chunk.
+    """
+    total = len(tasks)
+    projects, users = await asyncio.gather(
+        prisma.models.Project.prisma().find_many(
+            where={"id": {"in": list({task.project_id for task in tasks})}}
+        ),
+        prisma.models.User.prisma().find_many(
+            where={"id": {"in": list({task.assigned_user_id for task in tasks})}}
+        ),
+    )
+    projects_by_id = {project.id: project for project in projects}
+    user_ids = {user.id for user in users}
+    rejected = [
+        BulkTaskResult(
+            index=index, success=False, message="Project or User does not exist."
+        )
+        for index, task in enumerate(tasks)
+        if task.project_id not in projects_by_id
+        or task.assigned_user_id not in user_ids
+    ]
+    valid = [
+        (index, task)
+        for index, task in enumerate(tasks)
+        if task.project_id in projects_by_id and task.assigned_user_id in user_ids
+    ]
+    processed = len(rejected)
+    inserted = 0
+    failed = len(rejected)
+    if rejected or not valid:
+        yield BulkTaskProgress(
+            total=total,
+            processed=processed,
+            inserted=inserted,
+            failed=failed,
+            results=rejected,
+        )
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start : start + chunk_size]
+        try:
+            count = await prisma.models.Task.prisma().create_many(
+                data=[
+                    {
+                        "title": task.description[:255],
+                        "description": task.description,
+                        "dueDate": task.deadline,
+                        "projectId": task.project_id,
+                    }
+                    for _, task in chunk
+                ]
+            )
+        except prisma.errors.PrismaError:
+            logger.warning("Creating %d tasks failed", len(chunk), exc_info=True)
+            count = 0
+        if count == len(chunk):
+            results = [
+                BulkTaskResult(
+                    index=index,
+                    success=True,
+                    message="Task successfully added to the project.",
+                )
+                for index, _ in chunk
+            ]
+            inserted += count
+            due_dates: Dict[int, List[datetime]] = {}
+            for _, task in chunk:
+                due_dates.setdefault(task.project_id, []).append(task.deadline)
+            for chunk_project_id, chunk_due_dates in due_dates.items():
+                await tasks_added(projects_by_id[chunk_project_id], chunk_due_dates)
+        else:
+            results = [
+                BulkTaskResult(
+                    index=index, success=False, message="Failed to create a task."
+                )
+                for index, _ in chunk
+            ]
+            failed += len(chunk)
+        processed += len(chunk)
+        yield BulkTaskProgress(
+            total=total,
+            processed=processed,
+            inserted=inserted,
+            failed=failed,
+            results=results,
+        )
+
+
+async def addTasksToProjects(
+    tasks: List[BulkTaskInput], chunk_size: int = DEFAULT_TASK_CHUNK_SIZE
+) -> BulkTaskCreationResponse:
+    """
+    Imports a batch of tasks in one call, instead of one request (and three round-trips) per task. Projects and users are validated with one query each and tasks are inserted with create_many in chunks of chunk_size.
+
+    Args:
+        tasks (List[BulkTaskInput]): The tasks to import.
+        chunk_size (int): The number of tasks inserted per create_many.
+
+    Returns:
+        BulkTaskCreationResponse: The outcome of the import, with one result per task in request order.
+
+    Example:
+        response = await addTasksToProjects([BulkTaskInput(project_id=1, description="Write docs", deadline=datetime(2024, 6, 1), assigned_user_id=2), ...])
+        > BulkTaskCreationResponse(total=5000, inserted=4998, failed=2, results=[BulkTaskResult(index=0, success=True, ...), ...])
+    """
+    results: List[BulkTaskResult] = []
+    inserted = failed = 0
+    async for progress in streamTasksToProjects(tasks, chunk_size):
+        results.extend(progress.results)
+        inserted, failed = progress.inserted, progress.failed
+    results.sort(key=lambda result: result.index)
+    return BulkTaskCreationResponse(
+        total=len(tasks), inserted=inserted, failed=failed, results=results
+    )
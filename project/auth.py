@@ -0,0 +1,311 @@
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional, Set, Tuple
+
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from project.errors import UnauthorizedError
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+SESSION_SECRET = os.getenv("SESSION_SECRET", "")
+
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "3600"))
+
+AUTH_NEGATIVE_CACHE_SECONDS = float(os.getenv("AUTH_NEGATIVE_CACHE_SECONDS", "30"))
+
+AUTH_VERIFIED_CACHE_SECONDS = float(os.getenv("AUTH_VERIFIED_CACHE_SECONDS", "60"))
+
+AUTH_MAX_ATTEMPTS_PER_EMAIL = int(os.getenv("AUTH_MAX_ATTEMPTS_PER_EMAIL", "10"))
+
+AUTH_MAX_ATTEMPTS_PER_CLIENT = int(os.getenv("AUTH_MAX_ATTEMPTS_PER_CLIENT", "30"))
+
+AUTH_RATE_WINDOW_SECONDS = float(os.getenv("AUTH_RATE_WINDOW_SECONDS", "60"))
+
+AUTH_CACHE_MAX_ENTRIES = 100_000
+
+if not SESSION_SECRET:
+    logger.warning(
+        "SESSION_SECRET is not set; session tokens will not survive a restart "
+        "and are only valid on this worker."
+    )
+    SESSION_SECRET = secrets.token_urlsafe(32)
+
+_secret = SESSION_SECRET.encode()
+
+
+class SessionClaims(BaseModel):
+    """
+    The claims carried by a session token.
+    """
+
+    userId: int
+    role: str
+    issuedAt: int
+    expiresAt: int
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str) -> str:
+    return _b64encode(hmac.new(_secret, payload.encode(), hashlib.sha256).digest())
+
+
+def issue_token(user_id: int, role: str) -> Tuple[str, SessionClaims]:
+    """
+    Issues a signed, stateless session token for a user.
+
+    Args:
+        user_id (int): The authenticated user's ID.
+        role (str): The user's role at the time of authentication.
+
+    Returns:
+        Tuple[str, SessionClaims]: The token and the claims it carries.
+    """
+    now = int(time.time())
+    claims = SessionClaims(
+        userId=user_id, role=role, issuedAt=now, expiresAt=now + SESSION_TTL_SECONDS
+    )
+    payload = _b64encode(claims.model_dump_json().encode())
+    return f"{payload}.{_sign(payload)}", claims
+
+
+def verify_token(token: str) -> Optional[SessionClaims]:
+    """
+    Verifies a session token in-process, without touching the database.
+
+    Args:
+        token (str): The token returned by issue_token.
+
+    Returns:
+        Optional[SessionClaims]: The token's claims, or None if the token is malformed, tampered with or expired.
+    """
+    payload, _, signature = token.partition(".")
+    if not signature or not hmac.compare_digest(
+        signature.encode(), _sign(payload).encode()
+    ):
+        return None
+    try:
+        claims = SessionClaims.model_validate_json(_b64decode(payload))
+    except (ValueError, ValidationError):
+        return None
+    if claims.expiresAt <= time.time():
+        return None
+    return claims
+
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+async def require_session(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> SessionClaims:
+    """
+    FastAPI dependency of the routes that need a signed-in caller. Reads the session token from the Authorization: Bearer header and verifies it in-process.
+
+    Returns:
+        SessionClaims: The claims of the caller's session.
+
+    Raises:
+        UnauthorizedError: If the header is missing, or the token is malformed, tampered with or expired.
+    """
+    if credentials is None:
+        raise UnauthorizedError("A session token is required.")
+    claims = verify_token(credentials.credentials)
+    if claims is None:
+        raise UnauthorizedError("The session token is invalid or expired.")
+    return claims
+
+
+def credential_digest(email: str, password: str) -> str:
+    """
+    Derives a keyed digest of a credential pair, so attempts can be cached without keeping passwords in memory.
+
+    Args:
+        email (str): The email the user authenticates with.
+        password (str): The plain text password.
+
+    Returns:
+        str: The hex digest identifying the credential pair.
+    """
+    message = f"{email.lower()}\0{password}".encode()
+    return hmac.new(_secret, message, hashlib.sha256).hexdigest()
+
+
+class CredentialCache:
+    """
+    Short-lived cache of credential checks, keyed by credential digest. Failed checks are remembered for AUTH_NEGATIVE_CACHE_SECONDS so repeated bad credentials are rejected without a query or a bcrypt run; verified checks are remembered for AUTH_VERIFIED_CACHE_SECONDS so repeated logins skip bcrypt.
+    """
+
+    def __init__(self, max_entries: int = AUTH_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Optional[Tuple[int, str]]]]" = (
+            OrderedDict()
+        )
+        self._digests_by_user: Dict[int, Set[str]] = {}
+        self._failures_by_email: Dict[str, Set[str]] = {}
+
+    def _put(self, digest: str, value: Optional[Tuple[int, str]], ttl: float) -> None:
+        self._entries[digest] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            evicted, (_, evicted_value) = self._entries.popitem(last=False)
+            if evicted_value is not None:
+                self._digests_by_user.get(evicted_value[0], set()).discard(evicted)
+        if len(self._failures_by_email) > self.max_entries:
+            self._failures_by_email = {
+                email: live
+                for email, digests in self._failures_by_email.items()
+                if (live := {d for d in digests if d in self._entries})
+            }
+
+    def lookup(self, digest: str) -> Tuple[bool, Optional[Tuple[int, str]]]:
+        """
+        Looks up a credential digest.
+
+        Returns:
+            Tuple[bool, Optional[Tuple[int, str]]]: Whether the digest is cached, and if it was verified, the user's ID and role. A cached digest without a user is a known failure.
+        """
+        entry = self._entries.get(digest)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[digest]
+            return False, None
+        return True, value
+
+    def remember_failure(self, digest: str, email: str) -> None:
+        self._put(digest, None, AUTH_NEGATIVE_CACHE_SECONDS)
+        self._failures_by_email.setdefault(email.lower(), set()).add(digest)
+
+    def remember_success(self, digest: str, user_id: int, role: str) -> None:
+        self._put(digest, (user_id, role), AUTH_VERIFIED_CACHE_SECONDS)
+        self._digests_by_user.setdefault(user_id, set()).add(digest)
+
+    def forget_user(self, user_id: int) -> None:
+        """
+        Drops every verified credential of a user, e.g. after their password or email changed.
+        """
+        for digest in self._digests_by_user.pop(user_id, set()):
+            self._entries.pop(digest, None)
+
+    def forget_email(self, email: str) -> None:
+        """
+        Drops every failed credential check for an email, e.g. after an account was created for it or its password changed.
+        """
+        for digest in self._failures_by_email.pop(email.lower(), set()):
+            entry = self._entries.get(digest)
+            if entry is not None and entry[1] is None:
+                del self._entries[digest]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._digests_by_user.clear()
+        self._failures_by_email.clear()
+
+
+class RateLimiter:
+    """
+    Sliding-window limiter allowing at most max_attempts per key within window_seconds.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int,
+        window_seconds: float,
+        max_keys: int = AUTH_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._attempts: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    def _window(self, key: str, now: float) -> Optional[Deque[float]]:
+        attempts = self._attempts.get(key)
+        while attempts and attempts[0] <= now - self.window_seconds:
+            attempts.popleft()
+        return attempts
+
+    def retry_after(self, key: str) -> Optional[float]:
+        """
+        Checks whether the key may make another attempt, without recording one.
+
+        Args:
+            key (str): What attempts are counted against, e.g. an email or a client address.
+
+        Returns:
+            Optional[float]: None if an attempt is allowed, otherwise the number of seconds until the key may try again.
+        """
+        now = time.monotonic()
+        attempts = self._window(key, now)
+        if attempts and len(attempts) >= self.max_attempts:
+            return attempts[0] + self.window_seconds - now
+        return None
+
+    def hit(self, key: str) -> Optional[float]:
+        """
+        Records an attempt for the key.
+
+        Args:
+            key (str): What the attempt is counted against, e.g. an email or a client address.
+
+        Returns:
+            Optional[float]: None if the attempt is allowed, otherwise the number of seconds until the key may try again.
+        """
+        now = time.monotonic()
+        attempts = self._window(key, now)
+        if attempts is None:
+            attempts = self._attempts[key] = deque()
+            while len(self._attempts) > self.max_keys:
+                self._attempts.popitem(last=False)
+        self._attempts.move_to_end(key)
+        if len(attempts) >= self.max_attempts:
+            return attempts[0] + self.window_seconds - now
+        attempts.append(now)
+        return None
+
+    def clear(self) -> None:
+        self._attempts.clear()
+
+
+credential_cache = CredentialCache()
+
+email_rate_limiter = RateLimiter(AUTH_MAX_ATTEMPTS_PER_EMAIL, AUTH_RATE_WINDOW_SECONDS)
+
+client_rate_limiter = RateLimiter(
+    AUTH_MAX_ATTEMPTS_PER_CLIENT, AUTH_RATE_WINDOW_SECONDS
+)
+
+
+def forget_user_credentials(user_id: int) -> None:
+    """
+    Drops the cached verified credentials of a user. Call this whenever a user's password or email changes.
+
+    Args:
+        user_id (int): The user whose credentials changed.
+    """
+    credential_cache.forget_user(user_id)
+
+
+def forget_failed_logins(email: str) -> None:
+    """
+    Drops the cached failed credential checks for an email. Call this whenever an account is created for an email or a user's password or email changes, so a password that was wrong a moment ago is not refused once it becomes right.
+
+    Args:
+        email (str): The email whose failed checks should be dropped.
+    """
+    credential_cache.forget_email(email)
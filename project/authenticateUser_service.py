@@ -0,0 +1,113 @@
+import hmac
+from datetime import datetime, timezone
+from typing import Optional
+
+import prisma
+import prisma.models
+from project.auth import (
+    client_rate_limiter,
+    credential_cache,
+    credential_digest,
+    email_rate_limiter,
+    issue_token,
+)
+from project.errors import TooManyRequestsError
+from project.passwords import hash_password, verify_dummy_password, verify_password
+from pydantic import BaseModel
+
+
+class AuthenticateUserResponse(BaseModel):
+    """
+    Authentication status of the submitted credentials, along with a signed session token when they are valid.
+    """
+
+    authenticated: bool
+    message: str
+    userId: Optional[int] = None
+    token: Optional[str] = None
+    expiresAt: Optional[datetime] = None
+
+
+class TooManyAttemptsError(TooManyRequestsError):
+    """
+    Raised when an email or client has made too many authentication attempts within the rate limit window.
+    """
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(
+            "Too many authentication attempts. Try again later.", retry_after
+        )
+
+
+def _authenticated(user_id: int, role: str) -> AuthenticateUserResponse:
+    token, claims = issue_token(user_id, role)
+    return AuthenticateUserResponse(
+        authenticated=True,
+        message="Authentication successful.",
+        userId=user_id,
+        token=token,
+        expiresAt=datetime.fromtimestamp(claims.expiresAt, tz=timezone.utc),
+    )
+
+
+INVALID_CREDENTIALS = AuthenticateUserResponse(
+    authenticated=False, message="Invalid email or password."
+)
+
+
+async def authenticateUser(
+    email: str, password: str, client: Optional[str] = None
+) -> AuthenticateUserResponse:
+    """
+    Handles user authentication. Accepts credentials, verifies them against the stored user data, and returns authentication status along with a session token. This action is public to allow Guest and User roles to authenticate.
+
+    Attempts are rate limited per client, and failed attempts are also limited per email and client, so nobody can spend another client's budget for an account and lock its owner out. Unknown emails pay for the same bcrypt check as known ones, so response times do not reveal which accounts exist. Credential checks are cached briefly: repeated bad credentials are rejected without a database query or a bcrypt run, and repeated good credentials skip bcrypt. bcrypt itself runs on the password hashing pool, off the event loop. Users whose password was stored before hashing was introduced are upgraded to a bcrypt hash on their next successful login.
+
+    Args:
+        email (str): The email address of the user.
+        password (str): The plain text password of the user.
+        client (Optional[str]): The address of the client making the attempt, used for per-client rate limiting.
+
+    Returns:
+        AuthenticateUserResponse: Authentication status of the submitted credentials, along with a signed session token when they are valid.
+
+    Raises:
+        TooManyAttemptsError: If the client has exceeded its authentication attempts, or its failed attempts for the email.
+
+    Example:
+        response = await authenticateUser("user@example.com", "correct horse battery staple")
+        > AuthenticateUserResponse(authenticated=True, message='Authentication successful.', userId=1, token='eyJ1c2VySWQiOjF9...', expiresAt=datetime.datetime(...))
+    """
+    retry_after = client_rate_limiter.hit(client) if client else None
+    failure_key = f"{email.lower()}\0{client or ''}"
+    if retry_after is None:
+        retry_after = email_rate_limiter.retry_after(failure_key)
+    if retry_after is not None:
+        raise TooManyAttemptsError(retry_after)
+    digest = credential_digest(email, password)
+    cached, verified = credential_cache.lookup(digest)
+    if cached:
+        if verified:
+            return _authenticated(*verified)
+        email_rate_limiter.hit(failure_key)
+        return INVALID_CREDENTIALS
+    user = await prisma.models.User.prisma().find_unique(where={"email": email})
+    if user is None:
+        await verify_dummy_password(password)
+        credential_cache.remember_failure(digest, email)
+        email_rate_limiter.hit(failure_key)
+        return INVALID_CREDENTIALS
+    if user.password.startswith("$2"):
+        valid = await verify_password(password, user.password)
+    else:
+        valid = hmac.compare_digest(user.password.encode(), password.encode())
+        if valid:
+            await prisma.models.User.prisma().update(
+                where={"id": user.id}, data={"password": await hash_password(password)}
+            )
+    if not valid:
+        credential_cache.remember_failure(digest, email)
+        email_rate_limiter.hit(failure_key)
+        return INVALID_CREDENTIALS
+    credential_cache.remember_success(digest, user.id, user.role.name)
+    return _authenticated(user.id, user.role.name)
@@ -0,0 +1,217 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+from project.errors import PayloadTooLargeError, UnsupportedMediaTypeError
+from pydantic import BaseModel, ValidationError
+
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR", "blobs")
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(512 * 1024 * 1024)))
+
+ALLOWED_MEDIA_TYPES = frozenset(
+    media_type.strip().lower()
+    for media_type in os.getenv(
+        "ALLOWED_MEDIA_TYPES",
+        "image/png,image/jpeg,image/gif,image/webp,video/mp4,video/webm,"
+        "audio/mpeg,audio/ogg,application/pdf,text/plain,application/octet-stream",
+    ).split(",")
+    if media_type.strip()
+)
+
+
+class BlobTooLargeError(PayloadTooLargeError):
+    """
+    Raised when an upload exceeds MAX_UPLOAD_BYTES. Whatever was spooled so far is discarded.
+    """
+
+
+def is_allowed_media_type(media_type: str) -> bool:
+    """
+    Whether a media type may be uploaded and served inline. Types that browsers render as active documents, such as text/html or image/svg+xml, are left out of ALLOWED_MEDIA_TYPES so uploads cannot run script on the API's origin.
+    """
+    return media_type.split(";", 1)[0].strip().lower() in ALLOWED_MEDIA_TYPES
+
+
+def upload_media_type(media_type: str) -> str:
+    """
+    Validates the media type of an upload and normalizes it to its lowercase essence, without parameters.
+
+    Args:
+        media_type (str): The Content-Type of the upload.
+
+    Returns:
+        str: The media type to store, e.g. 'video/mp4'.
+
+    Raises:
+        UnsupportedMediaTypeError: If the media type is not in ALLOWED_MEDIA_TYPES.
+    """
+    essence = media_type.split(";", 1)[0].strip().lower()
+    if essence not in ALLOWED_MEDIA_TYPES:
+        raise UnsupportedMediaTypeError(f"Uploads of type {essence!r} are not allowed.")
+    return essence
+
+
+class BlobReference(BaseModel):
+    """
+    What Post.content holds for content stored in the blob store: the SHA-256 of the bytes, their size and media type.
+    """
+
+    sha256: str
+    size: int
+    mediaType: str
+
+
+class SpooledBlob(BaseModel):
+    """
+    An upload spooled to a temporary file and hashed, but not stored under its hash yet.
+    """
+
+    reference: BlobReference
+    path: Path
+
+
+class BlobStore:
+    """
+    Content-addressed store of uploaded bytes on local disk. Each blob lives at <root>/<aa>/<bb>/<sha256>, so identical uploads share one file. Uploads are spooled to a temporary file inside the root and atomically renamed into place once their hash is known and referenced.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+
+    def path_for(self, sha256: str) -> Path:
+        """
+        Returns the path of a blob, whether or not it exists.
+
+        Args:
+            sha256 (str): The hex digest of the blob.
+
+        Returns:
+            Path: Where the blob is stored.
+
+        Raises:
+            ValueError: If sha256 is not a hex SHA-256 digest.
+        """
+        if len(sha256) != 64 or any(c not in "0123456789abcdef" for c in sha256):
+            raise ValueError("Invalid blob hash.")
+        return self.root / sha256[:2] / sha256[2:4] / sha256
+
+    def exists(self, sha256: str) -> bool:
+        return self.path_for(sha256).is_file()
+
+    async def spool_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        media_type: str,
+        max_bytes: int = MAX_UPLOAD_BYTES,
+    ) -> SpooledBlob:
+        """
+        Spools a stream of chunks to a temporary file, hashing it on the way. Only one chunk is held in memory at a time, and disk writes run off the event loop. Pass the result to commit once the blob is referenced, and to discard in any case.
+
+        Args:
+            chunks (AsyncIterator[bytes]): The bytes to store, e.g. a request body stream.
+            media_type (str): The media type of the bytes.
+            max_bytes (int): The maximum number of bytes to accept.
+
+        Returns:
+            SpooledBlob: The blob's reference and the temporary file holding it.
+
+        Raises:
+            BlobTooLargeError: If the stream is longer than max_bytes.
+        """
+        spool_dir = self.root / "tmp"
+        await asyncio.to_thread(spool_dir.mkdir, parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, spool_path = tempfile.mkstemp(dir=spool_dir)
+        try:
+            with os.fdopen(fd, "wb") as spool:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise BlobTooLargeError(
+                            f"Upload exceeds the maximum size of {max_bytes} bytes."
+                        )
+                    digest.update(chunk)
+                    await asyncio.to_thread(spool.write, chunk)
+        except BaseException:
+            os.unlink(spool_path)
+            raise
+        reference = BlobReference(
+            sha256=digest.hexdigest(), size=size, mediaType=media_type
+        )
+        return SpooledBlob(reference=reference, path=Path(spool_path))
+
+    async def commit(self, spooled: SpooledBlob) -> bool:
+        """
+        Moves a spooled blob into place under its hash, unless an identical blob is already stored. Call this while holding the content lock of the hash and after taking a reference to it, so a concurrent collection cannot delete the blob before the reference commits.
+
+        Args:
+            spooled (SpooledBlob): The result of spool_stream.
+
+        Returns:
+            bool: True if the blob was new, False if an identical blob was already stored.
+        """
+        return await asyncio.to_thread(
+            self._commit, spooled.path, spooled.reference.sha256
+        )
+
+    def _commit(self, spool_path: Path, sha256: str) -> bool:
+        target = self.path_for(sha256)
+        if target.is_file():
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(spool_path, target)
+        return True
+
+    async def discard(self, spooled: SpooledBlob) -> None:
+        """
+        Deletes the temporary file of a spooled blob, if it was not committed.
+        """
+        await asyncio.to_thread(spooled.path.unlink, missing_ok=True)
+
+    async def delete(self, sha256: str) -> None:
+        """
+        Deletes a blob if it exists.
+
+        Args:
+            sha256 (str): The hex digest of the blob.
+        """
+        await asyncio.to_thread(self.path_for(sha256).unlink, missing_ok=True)
+
+
+blob_store = BlobStore(BLOB_STORE_DIR)
+
+
+def blob_content(reference: BlobReference) -> dict:
+    """
+    Builds the Post.content value that points at a stored blob.
+
+    Args:
+        reference (BlobReference): The stored blob.
+
+    Returns:
+        dict: The JSON to store in Post.content.
+    """
+    return {"blob": reference.model_dump()}
+
+
+def parse_blob_content(content: Any) -> Optional[BlobReference]:
+    """
+    Reads the blob reference out of a Post.content value.
+
+    Args:
+        content (Any): The Post.content value.
+
+    Returns:
+        Optional[BlobReference]: The reference, or None if the content is stored inline.
+    """
+    if not isinstance(content, dict) or "blob" not in content:
+        return None
+    try:
+        return BlobReference.model_validate(content["blob"])
+    except ValidationError:
+        return None
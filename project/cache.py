@@ -0,0 +1,216 @@
+import abc
+import functools
+import inspect
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Optional,
+    Tuple,
+    TypeVar,
+    get_type_hints,
+)
+
+from pydantic import BaseModel
+
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+
+ResponseT = TypeVar("ResponseT", bound=BaseModel)
+
+
+class CacheBackend(abc.ABC):
+    """
+    Storage for cached responses. Values are serialized JSON strings, so a backend shared between workers (e.g. Redis or Memcached) only has to store and expire strings.
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Returns the value stored under the key, or None if it is missing or expired.
+        """
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        """
+        Stores the value under the key for ttl seconds.
+        """
+
+    @abc.abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Removes the key, if present.
+        """
+
+    @abc.abstractmethod
+    async def delete_prefix(self, prefix: str) -> None:
+        """
+        Removes every key starting with the prefix.
+        """
+
+    @abc.abstractmethod
+    async def clear(self) -> None:
+        """
+        Removes every key.
+        """
+
+
+class InMemoryCache(CacheBackend):
+    """
+    In-process cache backend with per-entry TTL and least-recently-used eviction once max_entries is reached.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_backend: CacheBackend = InMemoryCache()
+
+
+def configure_cache(backend: CacheBackend) -> None:
+    """
+    Replaces the cache backend used by every cached endpoint, e.g. with a backend shared between workers.
+
+    Args:
+        backend (CacheBackend): The backend to store cached responses in.
+    """
+    global _backend
+    _backend = backend
+
+
+def get_cache() -> CacheBackend:
+    """
+    Returns the cache backend currently in use.
+    """
+    return _backend
+
+
+def _encode_param(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def cache_key(endpoint: str, **params: Any) -> str:
+    """
+    Builds the cache key of an endpoint call. Parameters are sorted by name, so the key does not depend on the order they were passed in.
+
+    Args:
+        endpoint (str): The name of the cached endpoint, e.g. "getUser".
+        **params: The parameters of the call.
+
+    Returns:
+        str: The cache key, prefixed with the endpoint name.
+
+    Example:
+        cache_key("getUser", userId=1)
+        > 'getUser:{"userId": 1}'
+    """
+    return f"{endpoint}:{json.dumps(params, sort_keys=True, default=_encode_param)}"
+
+
+def cached(
+    endpoint: str, ttl: Optional[float] = None
+) -> Callable[
+    [Callable[..., Awaitable[ResponseT]]], Callable[..., Awaitable[ResponseT]]
+]:
+    """
+    Caches the response model returned by an async service function, keyed by the endpoint name and the call's arguments. Exceptions are not cached.
+
+    Args:
+        endpoint (str): The name the cache keys of this function are prefixed with. Writers use it to invalidate the cached responses.
+        ttl (Optional[float]): How long a response stays cached, in seconds. Defaults to CACHE_TTL_SECONDS; 0 disables caching.
+
+    Returns:
+        Callable: A decorator for the service function.
+
+    Example:
+        @cached("getUser")
+        async def getUser(userId: int) -> UserProfileResponse:
+            ...
+    """
+
+    def decorator(
+        func: Callable[..., Awaitable[ResponseT]],
+    ) -> Callable[..., Awaitable[ResponseT]]:
+        signature = inspect.signature(func)
+        response_model = get_type_hints(func)["return"]
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> ResponseT:
+            expires_in = CACHE_TTL_SECONDS if ttl is None else ttl
+            if expires_in <= 0:
+                return await func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = cache_key(endpoint, **bound.arguments)
+            hit = await _backend.get(key)
+            if hit is not None:
+                return response_model.model_validate_json(hit)
+            response = await func(*args, **kwargs)
+            await _backend.set(key, response.model_dump_json(), expires_in)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+async def invalidate(endpoint: str, **params: Any) -> None:
+    """
+    Removes the cached response of one endpoint call. The parameters must be named as in the cached service function.
+
+    Args:
+        endpoint (str): The name of the cached endpoint.
+        **params: The parameters of the call to invalidate.
+
+    Example:
+        await invalidate("getUser", userId=1)
+    """
+    await _backend.delete(cache_key(endpoint, **params))
+
+
+async def invalidate_endpoint(endpoint: str) -> None:
+    """
+    Removes every cached response of an endpoint, for writes that affect calls whose parameters are not known.
+
+    Args:
+        endpoint (str): The name of the cached endpoint.
+    """
+    await _backend.delete_prefix(f"{endpoint}:")
@@ -0,0 +1,117 @@
+import hashlib
+import json
+from typing import Any, Iterable, Optional, Tuple
+
+import prisma
+from project.blob_store import blob_store, parse_blob_content
+
+RETAIN_QUERY = """
+INSERT INTO "ContentObject" ("hash", "size", "blob", "refCount", "createdAt")
+VALUES ($1, $2, $3, 1, now() AT TIME ZONE 'UTC')
+ON CONFLICT ("hash") DO UPDATE SET
+    "refCount" = "ContentObject"."refCount" + 1,
+    "blob" = "ContentObject"."blob" OR EXCLUDED."blob"
+RETURNING "refCount"
+"""
+
+LOCK_QUERY = """
+SELECT pg_advisory_xact_lock(hashtextextended($1, 0))
+"""
+
+RELEASE_QUERY = """
+UPDATE "ContentObject" SET "refCount" = "refCount" - 1 WHERE "hash" = $1
+"""
+
+
+def content_hash(content: Any) -> Tuple[str, int, bool]:
+    """
+    Identifies a Post.content payload by hash. Blob-backed content is identified by the hash of its blob, so it matches streamed uploads of the same bytes; inline content is hashed in a canonical JSON form, so key order does not matter.
+
+    Args:
+        content (Any): The Post.content value.
+
+    Returns:
+        Tuple[str, int, bool]: The hex SHA-256 of the payload, its size in bytes, and whether it is stored in the blob store.
+    """
+    blob = parse_blob_content(content)
+    if blob is not None:
+        return blob.sha256, blob.size, True
+    if isinstance(content, str):
+        payload = content.encode()
+    else:
+        payload = json.dumps(content, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(payload).hexdigest(), len(payload), False
+
+
+async def lock(hash: str, client: prisma.Prisma) -> None:
+    """
+    Takes the content lock of a payload for the rest of a transaction. Blob files are only put in place or deleted under this lock, along with the payload's index entry, so the file and the entry change together.
+
+    Args:
+        hash (str): The payload's hash, from content_hash.
+        client (prisma.Prisma): The transaction to lock in.
+    """
+    await client.execute_raw(LOCK_QUERY, hash)
+
+
+async def retain(
+    hash: str, size: int, blob: bool, client: Optional[prisma.Prisma] = None
+) -> bool:
+    """
+    Records one more post referencing a payload, creating its index entry if it is new.
+
+    Args:
+        hash (str): The payload's hash, from content_hash.
+        size (int): The payload's size in bytes.
+        blob (bool): Whether the payload is stored in the blob store.
+        client (Optional[prisma.Prisma]): The transaction to run in, if any.
+
+    Returns:
+        bool: True if an identical payload was already stored, i.e. the write was a duplicate.
+    """
+    rows = await (client or prisma.get_client()).query_raw(
+        RETAIN_QUERY, hash, size, blob
+    )
+    return rows[0]["refCount"] > 1
+
+
+async def release(hash: Optional[str], client: Optional[prisma.Prisma] = None) -> None:
+    """
+    Records one less post referencing a payload. Call collect_unreferenced once the surrounding transaction has committed, to drop payloads nothing references anymore.
+
+    Args:
+        hash (Optional[str]): The payload's hash, or None for posts written before content was indexed.
+        client (Optional[prisma.Prisma]): The transaction to run in, if any.
+    """
+    if hash is not None:
+        await (client or prisma.get_client()).execute_raw(RELEASE_QUERY, hash)
+
+
+async def collect_unreferenced(hashes: Iterable[Optional[str]]) -> None:
+    """
+    Deletes the index entries of the given payloads that no post references anymore, along with their blobs. Each payload is locked first, so an upload taking a new reference either commits before the entry is checked, or waits and stores the blob again.
+
+    The blob of a payload without an index entry is deleted too, which cleans up after an upload whose transaction failed once its blob was in place.
+
+    Args:
+        hashes (Iterable[Optional[str]]): The payloads that were released.
+    """
+    hashes = sorted({hash for hash in hashes if hash is not None})
+    if not hashes:
+        return
+    placeholders = ", ".join(f"${position}" for position in range(1, len(hashes) + 1))
+    async with prisma.get_client().tx() as transaction:
+        for hash in hashes:
+            await lock(hash, transaction)
+        await transaction.execute_raw(
+            f'DELETE FROM "ContentObject" WHERE "hash" IN ({placeholders}) AND "refCount" <= 0',
+            *hashes,
+        )
+        rows = await transaction.query_raw(
+            f'SELECT "hash" FROM "ContentObject" WHERE "hash" IN ({placeholders})',
+            *hashes,
+        )
+        referenced = {row["hash"] for row in rows}
+        for hash in hashes:
+            if hash not in referenced:
+                await blob_store.delete(hash)
@@ -3,6 +3,9 @@ from typing import Dict
 import prisma
 import prisma.enums
 import prisma.models
+from project.blob_store import parse_blob_content
+from project.content_index import content_hash, retain
+from project.errors import InvalidRequestError
 from pydantic import BaseModel
 
 
@@ -14,6 +17,7 @@ class CreateContentResponse(BaseModel):
     success: bool
     message: str
     contentId: int
+    duplicate: bool = False
 
 
 async def createContent(
@@ -28,25 +32,39 @@ async def createContent(
         content (Dict): Actual multimedia content in a JSON format, which could be a text, image, or video content.
         type (str): Type of the content being posted, must be one of the predefined types in the PostType enum.
 
+    The payload is indexed by hash in the same transaction, and the response reports whether an identical payload was already stored.
+
     Returns:
         CreateContentResponse: Response Model for the POST /content/create endpoint that returns information about the newly created content.
+
+    Raises:
+        InvalidRequestError: If the content is shaped like a blob reference. Those are only written by streamed uploads, for blobs that were actually stored.
     """
+    if parse_blob_content(content) is not None:
+        raise InvalidRequestError("Content may not be a blob reference.")
     user = await prisma.models.User.prisma().find_unique(where={"id": userId})
     if not user or user.role not in [prisma.enums.Role.ADMIN, prisma.enums.Role.USER]:
         return CreateContentResponse(
             success=False, message="Unauthorized or user not found", contentId=-1
         )
     try:
-        post = await prisma.models.Post.prisma().create(
-            data={
-                "userId": userId,
-                "title": title,
-                "content": content,
-                "type": prisma.enums.PostType[type],
-            }
-        )
+        hash, size, blob = content_hash(content)
+        async with prisma.get_client().tx() as transaction:
+            duplicate = await retain(hash, size, blob, transaction)
+            post = await prisma.models.Post.prisma(transaction).create(
+                data={
+                    "userId": userId,
+                    "title": title,
+                    "content": content,
+                    "contentHash": hash,
+                    "type": prisma.enums.PostType[type],
+                }
+            )
         return CreateContentResponse(
-            success=True, message="Content created successfully", contentId=post.id
+            success=True,
+            message="Content created successfully",
+            contentId=post.id,
+            duplicate=duplicate,
         )
     except Exception as e:
         return CreateContentResponse(success=False, message=str(e), contentId=-1)
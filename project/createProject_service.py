@@ -1,9 +1,20 @@
-from typing import List, Optional
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
 
 import prisma
 import prisma.enums
 import prisma.models
-from pydantic import BaseModel
+from project.cache import invalidate, invalidate_endpoint
+from project.workspace_summary import project_created
+from pydantic import BaseModel, Field
+
+BATCH_TRANSACTION_TIMEOUT = timedelta(seconds=30)
+
+RESERVE_PROJECT_IDS_QUERY = """
+SELECT nextval(pg_get_serial_sequence('"Project"', 'id'))::int AS "id"
+FROM generate_series(1, $1)
+"""
 
 
 class CreateProjectResponse(BaseModel):
@@ -16,12 +27,55 @@ class CreateProjectResponse(BaseModel):
     roleAssignmentStatus: str
 
 
+class ProjectCreationRequest(BaseModel):
+    """
+    The details of one project to create in a batch, along with its initial members.
+    """
+
+    name: str
+    description: Optional[str] = None
+    userId: int
+    members: List[int] = Field(default_factory=list)
+
+
+class CreateProjectsBatchResponse(BaseModel):
+    """
+    Response data for a batch of newly created projects, in the order they were requested.
+    """
+
+    projects: List[CreateProjectResponse]
+
+
+def _memberships(
+    project_id: int, userId: int, members: List[int]
+) -> List[Dict[str, Any]]:
+    """
+    Builds the ProjectMember rows of a new project. The creator is always the owner, even if they are also listed as a member, and duplicate members are added once.
+
+    Args:
+        project_id (int): The ID of the new project.
+        userId (int): The ID of the user creating the project.
+        members (List[int]): The IDs of the users to add as members.
+
+    Returns:
+        List[Dict[str, Any]]: The rows to pass to ProjectMember create_many.
+    """
+    roles = {member_id: prisma.enums.ProjectRole.MEMBER for member_id in members}
+    roles[userId] = prisma.enums.ProjectRole.OWNER
+    return [
+        {"projectId": project_id, "userId": member_id, "role": role}
+        for member_id, role in roles.items()
+    ]
+
+
 async def createProject(
     name: str, description: Optional[str], userId: int, members: List[int]
 ) -> CreateProjectResponse:
     """
     Allows the creation of a new project. Users can post project details, which are then saved in the project database. This route also sends a notification to the User Management module to assign default roles to the project.
 
+    The project and all of its memberships are written in a single transaction, with the memberships inserted by one create_many, so a failure never leaves a half-populated project behind.
+
     Args:
         name (str): The name of the new project.
         description (Optional[str]): An optional description of the project.
@@ -35,25 +89,74 @@ async def createProject(
         createProject("Super Trooper Project", "A project for supertrooper creations", 1, [2, 3, 4])
         > {'projectId': 101, 'status': 'success', 'roleAssignmentStatus': 'success'}
     """
-    project = await prisma.models.Project.prisma().create(
-        data={"name": name, "description": description, "userId": userId}
-    )
-    for member_id in members:
-        await prisma.models.ProjectMember.prisma().create(
-            data={
-                "projectId": project.id,
-                "userId": member_id,
-                "role": prisma.enums.ProjectRole.MEMBER,
-            }
+    async with prisma.get_client().tx() as transaction:
+        project = await prisma.models.Project.prisma(transaction).create(
+            data={"name": name, "description": description, "userId": userId}
         )
-    await prisma.models.ProjectMember.prisma().create(
-        data={
-            "projectId": project.id,
-            "userId": userId,
-            "role": prisma.enums.ProjectRole.OWNER,
-        }
-    )
+        await prisma.models.ProjectMember.prisma(transaction).create_many(
+            data=_memberships(project.id, userId, members)
+        )
+    await invalidate_endpoint("listAllWorkspaces")
+    await invalidate("getUser", userId=userId)
+    await project_created(userId)
     response = CreateProjectResponse(
         projectId=project.id, status="success", roleAssignmentStatus="success"
     )
     return response
+
+
+async def createProjects(
+    projects: List[ProjectCreationRequest],
+) -> CreateProjectsBatchResponse:
+    """
+    Creates a batch of projects with their members in one call, for bulk imports. Either every project and membership is created or, if any of them fails, none are.
+
+    The IDs of the new projects are reserved from the Project sequence first, so the projects and then the memberships of every project are each inserted by a single create_many, all within one transaction.
+
+    Args:
+        projects (List[ProjectCreationRequest]): The projects to create, each with its creator and initial members.
+
+    Returns:
+        CreateProjectsBatchResponse: Response data for each newly created project, in the order they were requested.
+
+    Example:
+        createProjects([ProjectCreationRequest(name="Alpha", userId=1, members=[2, 3]), ProjectCreationRequest(name="Beta", userId=2)])
+        > {'projects': [{'projectId': 101, 'status': 'success', 'roleAssignmentStatus': 'success'}, {'projectId': 102, ...}]}
+    """
+    if not projects:
+        return CreateProjectsBatchResponse(projects=[])
+    async with prisma.get_client().tx(timeout=BATCH_TRANSACTION_TIMEOUT) as transaction:
+        reserved = await transaction.query_raw(RESERVE_PROJECT_IDS_QUERY, len(projects))
+        project_ids = [row["id"] for row in reserved]
+        await prisma.models.Project.prisma(transaction).create_many(
+            data=[
+                {
+                    "id": project_id,
+                    "name": request.name,
+                    "description": request.description,
+                    "userId": request.userId,
+                }
+                for project_id, request in zip(project_ids, projects)
+            ]
+        )
+        await prisma.models.ProjectMember.prisma(transaction).create_many(
+            data=[
+                membership
+                for project_id, request in zip(project_ids, projects)
+                for membership in _memberships(
+                    project_id, request.userId, request.members
+                )
+            ]
+        )
+    await invalidate_endpoint("listAllWorkspaces")
+    for user_id, count in Counter(request.userId for request in projects).items():
+        await invalidate("getUser", userId=user_id)
+        await project_created(user_id, count)
+    return CreateProjectsBatchResponse(
+        projects=[
+            CreateProjectResponse(
+                projectId=project_id, status="success", roleAssignmentStatus="success"
+            )
+            for project_id in project_ids
+        ]
+    )
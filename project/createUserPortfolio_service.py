@@ -1,5 +1,7 @@
 from typing import Optional
 
+from project.cache import invalidate
+from project.lookups import Lookup, LookupFailed, run_lookups
 from pydantic import BaseModel
 
 
@@ -34,17 +36,20 @@ async def createUserPortfolio(
     """
     import prisma.models
 
-    user = await prisma.models.User.prisma().find_unique(where={"id": user_id})
-    if not user:
-        return CreatePortfolioResponse(
-            success=False, portfolio_id=0, message="User not found.", link=""
+    try:
+        _, profile = await run_lookups(
+            Lookup(
+                prisma.models.User.prisma().find_unique(where={"id": user_id}),
+                "User not found.",
+            ),
+            Lookup(
+                prisma.models.Profile.prisma().find_unique(where={"userId": user_id}),
+                "User profile not found.",
+            ),
         )
-    profile = await prisma.models.Profile.prisma().find_unique(
-        where={"userId": user_id}
-    )
-    if not profile:
+    except LookupFailed as e:
         return CreatePortfolioResponse(
-            success=False, portfolio_id=0, message="User profile not found.", link=""
+            success=False, portfolio_id=0, message=e.message, link=""
         )
     new_portfolio = await prisma.models.Portfolio.prisma().create(
         data={
@@ -53,6 +58,8 @@ async def createUserPortfolio(
             "profileId": profile.id,
         }
     )
+    await invalidate("getUserPortfolio", userId=user_id)
+    await invalidate("getUser", userId=user_id)
     return CreatePortfolioResponse(
         success=True,
         portfolio_id=new_portfolio.id,
@@ -2,6 +2,8 @@ from datetime import datetime
 
 import prisma
 import prisma.models
+from project.auth import forget_failed_logins
+from project.passwords import hash_password
 from pydantic import BaseModel
 
 
@@ -28,13 +30,14 @@ async def createUser(name: str, email: str, password: str) -> CreateUserProfileR
     Returns:
         CreateUserProfileResponse: This model provides the details of the newly created user profile. It returns essential information about the user, confirming the successful creation of the profile.
     """
-    hashed_password = password
+    hashed_password = await hash_password(password)
     new_user = await prisma.models.User.prisma().create(
         data={"email": email, "password": hashed_password}
     )
     profile = await prisma.models.Profile.prisma().create(
         data={"userId": new_user.id, "bio": "", "avatar": ""}
     )
+    forget_failed_logins(new_user.email)
     return CreateUserProfileResponse(
         user_id=new_user.id, name=name, email=new_user.email, created_at=datetime.now()
     )
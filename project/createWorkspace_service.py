@@ -1,5 +1,7 @@
 import prisma
 import prisma.models
+from project.cache import invalidate, invalidate_endpoint
+from project.workspace_summary import project_created
 from pydantic import BaseModel
 
 
@@ -46,6 +48,9 @@ async def createWorkspace(
     project = await prisma.models.Project.prisma().create(
         data={"name": workspaceName, "status": "ACTIVE", "userId": userId}
     )
+    await invalidate_endpoint("listAllWorkspaces")
+    await invalidate("getUser", userId=userId)
+    await project_created(userId)
     return WorkspaceCreationResponse(
         workspaceId=project.id,
         workspaceName=workspaceName,
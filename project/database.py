@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import prisma
+import prisma.models
+
+logger = logging.getLogger(__name__)
+
+DATABASE_CONNECTION_LIMIT = os.getenv("DATABASE_CONNECTION_LIMIT")
+
+DATABASE_POOL_TIMEOUT = os.getenv("DATABASE_POOL_TIMEOUT")
+
+DATABASE_CONNECT_TIMEOUT = os.getenv("DATABASE_CONNECT_TIMEOUT")
+
+DATABASE_WARMUP = os.getenv("DATABASE_WARMUP", "true").lower() in ("1", "true", "yes")
+
+DATABASE_WARMUP_TIMEOUT_SECONDS = float(
+    os.getenv("DATABASE_WARMUP_TIMEOUT_SECONDS", "30")
+)
+
+POOL_PARAMETERS = {
+    "connection_limit": DATABASE_CONNECTION_LIMIT,
+    "pool_timeout": DATABASE_POOL_TIMEOUT,
+    "connect_timeout": DATABASE_CONNECT_TIMEOUT,
+}
+
+
+def pooled_url(url: str) -> str:
+    """
+    Adds the configured pool parameters to a Postgres connection string. Parameters that are not configured keep the value in the URL, if any, or Prisma's default.
+
+    Args:
+        url (str): The connection string, e.g. DATABASE_URL.
+
+    Returns:
+        str: The connection string with the pool parameters applied.
+
+    Example:
+        pooled_url("postgresql://user:pass@db:5432/app")
+        > 'postgresql://user:pass@db:5432/app?connection_limit=20&pool_timeout=10'
+    """
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.update({key: value for key, value in POOL_PARAMETERS.items() if value})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def datasource() -> Optional[Dict[str, str]]:
+    """
+    The datasource override to create the Prisma client with, so the pool settings apply. None if DATABASE_URL is not in the environment, in which case Prisma reads it from .env without them.
+    """
+    url = os.getenv("DATABASE_URL")
+    if url is None:
+        if any(POOL_PARAMETERS.values()):
+            logger.warning(
+                "DATABASE_URL is not set in the environment; pool settings are not applied."
+            )
+        return None
+    return {"url": pooled_url(url)}
+
+
+def connection_limit() -> int:
+    """
+    The size of the connection pool: the connection_limit of the URL the client connects with, which is DATABASE_CONNECTION_LIMIT if set, or Prisma's default of twice the CPU count plus one.
+    """
+    url = os.getenv("DATABASE_URL")
+    limit = DATABASE_CONNECTION_LIMIT
+    if url is not None:
+        limit = dict(parse_qsl(urlsplit(pooled_url(url)).query)).get("connection_limit")
+    if limit:
+        return int(limit)
+    return (os.cpu_count() or 1) * 2 + 1
+
+
+async def _warm_connection() -> None:
+    # The short sleep keeps each connection busy, so concurrent calls open distinct pool connections.
+    client = prisma.get_client()
+    await client.query_raw("SELECT pg_sleep(0.05)")
+    await prisma.models.User.prisma().find_first(include={"profile": True})
+    await prisma.models.Project.prisma().find_first(
+        include={"tasks": True, "members": True}
+    )
+    await prisma.models.Post.prisma().find_first()
+    await prisma.models.Feedback.prisma().find_first(
+        order=[{"createdAt": "desc"}, {"id": "desc"}]
+    )
+
+
+async def warm_up() -> None:
+    """
+    Opens every connection of the pool and runs the most common query shapes on each, so the first requests after a deploy do not pay for connection setup and statement preparation. Failures are logged and do not stop startup.
+    """
+    if not DATABASE_WARMUP:
+        return
+    started_at = time.perf_counter()
+    limit = connection_limit()
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(_warm_connection() for _ in range(limit))),
+            DATABASE_WARMUP_TIMEOUT_SECONDS,
+        )
+    except Exception:
+        logger.warning("Database warmup failed", exc_info=True)
+        return
+    logger.info(
+        "Warmed up %d database connections in %.0fms",
+        limit,
+        (time.perf_counter() - started_at) * 1000,
+    )
+
+
+def metric_values(metrics: Any) -> Dict[str, Any]:
+    """
+    Indexes Prisma client metrics by key.
+
+    Args:
+        metrics (prisma.Metrics): The result of Prisma.get_metrics().
+
+    Returns:
+        Dict[str, Any]: The value of each counter, gauge and histogram by key.
+    """
+    return {
+        metric.key: metric.value
+        for metric in [*metrics.counters, *metrics.gauges, *metrics.histograms]
+    }
@@ -2,6 +2,8 @@ from typing import Optional
 
 import prisma
 import prisma.models
+from project.cache import invalidate
+from project.content_index import collect_unreferenced, release
 from pydantic import BaseModel
 
 
@@ -17,7 +19,8 @@ class DeleteContentResponse(BaseModel):
 async def deleteContent(contentId: int) -> DeleteContentResponse:
     """
     The DELETE endpoint allows the deletion of content by contentId for Admins and authority-holding Users.
-    Upon successful deletion, confirms the action with a success response.
+    Upon successful deletion, confirms the action with a success response. The post's reference to its payload is released, and a
+    blob-backed payload no other post references is deleted from the blob store.
 
     Args:
         contentId (int): The unique identifier of the content to be deleted, provided through the URL path.
@@ -25,8 +28,15 @@ async def deleteContent(contentId: int) -> DeleteContentResponse:
     Returns:
         DeleteContentResponse: Confirms the success of the content deletion operation with an indicator flag.
     """
-    post = await prisma.models.Post.prisma().delete(where={"id": contentId})
+    async with prisma.get_client().tx() as transaction:
+        post = await prisma.models.Post.prisma(transaction).delete(
+            where={"id": contentId}
+        )
+        if post:
+            await release(post.contentHash, transaction)
     if post:
+        await collect_unreferenced([post.contentHash])
+        await invalidate("fetchContent", contentId=contentId)
         return DeleteContentResponse(
             success=True,
             message=f"Content with ID {contentId} was successfully deleted.",
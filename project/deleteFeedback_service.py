@@ -0,0 +1,55 @@
+import prisma
+import prisma.models
+from project.cache import invalidate
+from project.workspace_summary import feedback_deleted
+from pydantic import BaseModel
+
+
+class DeleteFeedbackResponse(BaseModel):
+    """
+    Confirms whether the feedback entry was deleted.
+    """
+
+    success: bool
+    message: str
+
+
+async def deleteFeedback(feedbackId: int) -> DeleteFeedbackResponse:
+    """
+    Permits an admin to delete a feedback entry. The feedback counters of the content and the user it belongs to are decremented in the same transaction, and the feedback is uncounted from the workspace summaries it was counted in.
+
+    Args:
+        feedbackId (int): The unique identifier of the feedback entry to delete.
+
+    Returns:
+        DeleteFeedbackResponse: Confirms whether the feedback entry was deleted.
+
+    Example:
+        response = await deleteFeedback(7)
+        > DeleteFeedbackResponse(success=True, message='Feedback deleted successfully.')
+    """
+    async with prisma.get_client().tx() as transaction:
+        feedback = await prisma.models.Feedback.prisma(transaction).delete(
+            where={"id": feedbackId}
+        )
+        if feedback is None:
+            return DeleteFeedbackResponse(success=False, message="Feedback not found.")
+        if feedback.postId is not None:
+            await prisma.models.Post.prisma(transaction).update(
+                where={"id": feedback.postId},
+                data={"feedbackCount": {"decrement": 1}},
+            )
+        if feedback.userId is not None:
+            await prisma.models.User.prisma(transaction).update(
+                where={"id": feedback.userId},
+                data={"feedbackCount": {"decrement": 1}},
+            )
+    await invalidate("getFeedback", feedbackId=feedbackId)
+    if feedback.postId is not None:
+        await invalidate("fetchContent", contentId=feedback.postId)
+    if feedback.userId is not None:
+        await invalidate("getUser", userId=feedback.userId)
+    await feedback_deleted(feedback.userId, feedback.createdAt)
+    return DeleteFeedbackResponse(
+        success=True, message="Feedback deleted successfully."
+    )
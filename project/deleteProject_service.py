@@ -1,6 +1,9 @@
 import prisma
 import prisma.enums
 import prisma.models
+from project.cache import invalidate, invalidate_endpoint
+from project.lookups import Lookup, LookupFailed, run_lookups
+from project.workspace_summary import project_removed
 from pydantic import BaseModel
 
 
@@ -31,17 +34,27 @@ async def deleteProject(id: int, admin_user_id: int) -> DeleteProjectResponse:
         else:
             print(f"Failed to delete project: {response.message}")
     """
-    admin_user = await prisma.models.User.prisma().find_unique(
-        where={"id": admin_user_id}
-    )
-    if admin_user is None or admin_user.role != prisma.enums.Role.ADMIN:
-        return DeleteProjectResponse(
-            success=False, message="User is not authorized to delete projects."
+    try:
+        _, project = await run_lookups(
+            Lookup(
+                prisma.models.User.prisma().find_unique(where={"id": admin_user_id}),
+                "User is not authorized to delete projects.",
+                lambda admin_user: admin_user is not None
+                and admin_user.role == prisma.enums.Role.ADMIN,
+            ),
+            Lookup(
+                prisma.models.Project.prisma().find_unique(where={"id": id}),
+                "Project not found.",
+            ),
         )
-    project = await prisma.models.Project.prisma().find_unique(where={"id": id})
-    if project is None:
-        return DeleteProjectResponse(success=False, message="Project not found.")
+    except LookupFailed as e:
+        return DeleteProjectResponse(success=False, message=e.message)
     await prisma.models.ProjectMember.prisma().delete_many(where={"projectId": id})
     await prisma.models.Task.prisma().delete_many(where={"projectId": id})
     await prisma.models.Project.prisma().delete(where={"id": id})
+    await invalidate("publicProjectInfo", id=id)
+    await invalidate_endpoint("listAllWorkspaces")
+    if project.userId is not None:
+        await invalidate("getUser", userId=project.userId)
+    await project_removed(project.userId)
     return DeleteProjectResponse(success=True, message="Project deleted successfully.")
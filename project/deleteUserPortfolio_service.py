@@ -1,5 +1,6 @@
 import prisma
 import prisma.models
+from project.cache import invalidate
 from pydantic import BaseModel
 
 
@@ -32,4 +33,6 @@ async def deleteUserPortfolio(userId: int) -> DeletePortfolioResponse:
         await prisma.models.Portfolio.prisma().delete_many(
             where={"profileId": profile.id}
         )
+        await invalidate("getUserPortfolio", userId=userId)
+        await invalidate("getUser", userId=userId)
     return DeletePortfolioResponse(message="User's portfolio successfully deleted.")
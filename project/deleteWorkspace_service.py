@@ -1,5 +1,7 @@
 import prisma
 import prisma.models
+from project.cache import invalidate, invalidate_endpoint
+from project.workspace_summary import project_removed
 from pydantic import BaseModel
 
 
@@ -37,6 +39,11 @@ async def deleteWorkspace(workspaceId: int) -> DeleteWorkspaceResponse:
         where={"projectId": workspaceId}
     )
     await prisma.models.Project.prisma().delete(where={"id": workspaceId})
+    await invalidate("publicProjectInfo", id=workspaceId)
+    await invalidate_endpoint("listAllWorkspaces")
+    if existing_project.userId is not None:
+        await invalidate("getUser", userId=existing_project.userId)
+    await project_removed(existing_project.userId)
     return DeleteWorkspaceResponse(
         message=f"Workspace with ID {workspaceId} has been successfully deleted."
     )
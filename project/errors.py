@@ -0,0 +1,250 @@
+import logging
+import math
+import os
+import sys
+import time
+import traceback
+from typing import Dict, Optional, Tuple
+
+import prisma.errors
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from project.responses import error_response
+from pydantic import BaseModel
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+TRACEBACK_LOG_WINDOW_SECONDS = float(os.getenv("TRACEBACK_LOG_WINDOW_SECONDS", "60"))
+
+
+class ErrorResponse(BaseModel):
+    """
+    The body of every error response: a human readable message and a stable machine readable code.
+    """
+
+    error: str
+    code: str
+
+
+class ServiceError(Exception):
+    """
+    Base class of the errors services raise for expected failures. Each subclass maps to an HTTP status code; they are returned as an ErrorResponse and logged in one line, without a traceback.
+    """
+
+    status_code = 500
+    code = "internal_error"
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
+
+    def headers(self) -> Optional[Dict[str, str]]:
+        return None
+
+
+class InvalidRequestError(ServiceError, ValueError):
+    status_code = 400
+    code = "invalid_request"
+
+
+class UnauthorizedError(ServiceError):
+    """
+    Raised when a request needs a session token and has no valid one.
+    """
+
+    status_code = 401
+    code = "unauthorized"
+
+    def headers(self) -> Optional[Dict[str, str]]:
+        return {"WWW-Authenticate": "Bearer"}
+
+
+class PermissionDeniedError(ServiceError):
+    status_code = 403
+    code = "permission_denied"
+
+
+class NotFoundError(ServiceError, ValueError):
+    status_code = 404
+    code = "not_found"
+
+
+class ConflictError(ServiceError):
+    status_code = 409
+    code = "conflict"
+
+
+class PayloadTooLargeError(ServiceError, ValueError):
+    status_code = 413
+    code = "payload_too_large"
+
+
+class UnsupportedMediaTypeError(ServiceError, ValueError):
+    status_code = 415
+    code = "unsupported_media_type"
+
+
+class TooManyRequestsError(ServiceError):
+    """
+    Raised when a client must back off; retry_after is returned in the Retry-After header, rounded up to whole seconds.
+    """
+
+    status_code = 429
+    code = "too_many_requests"
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    def headers(self) -> Optional[Dict[str, str]]:
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
+
+
+class ServiceUnavailableError(ServiceError):
+    """
+    Raised when the service is temporarily overloaded; clients are asked to retry after a second.
+    """
+
+    status_code = 503
+    code = "service_unavailable"
+
+    def headers(self) -> Optional[Dict[str, str]]:
+        return {"Retry-After": "1"}
+
+
+PRISMA_ERRORS: Dict[type, Tuple[int, str, str]] = {
+    prisma.errors.RecordNotFoundError: (404, "not_found", "Record not found."),
+    prisma.errors.UniqueViolationError: (
+        409,
+        "conflict",
+        "A record with the same unique value already exists.",
+    ),
+    prisma.errors.ForeignKeyViolationError: (
+        409,
+        "conflict",
+        "The request refers to a record that does not exist or is still referenced.",
+    ),
+    prisma.errors.MissingRequiredValueError: (
+        400,
+        "invalid_request",
+        "A required value is missing.",
+    ),
+}
+
+
+class TracebackLogLimiter:
+    """
+    Logs the full traceback of an unexpected error at most once per window for each place it is raised from, identified by the exception type and the innermost frame. Repeats within the window are counted and reported in one line when the window ends.
+    """
+
+    def __init__(self, window_seconds: float) -> None:
+        self.window_seconds = window_seconds
+        self._windows: Dict[Tuple[str, str, int], Tuple[float, int]] = {}
+
+    @staticmethod
+    def _key(exc: BaseException) -> Tuple[str, str, int]:
+        frames = traceback.extract_tb(exc.__traceback__)
+        last = frames[-1] if frames else None
+        return (
+            type(exc).__qualname__,
+            last.filename if last else "",
+            (last.lineno or 0) if last else 0,
+        )
+
+    def log(self, exc: BaseException, method: str, path: str) -> None:
+        key = self._key(exc)
+        now = time.monotonic()
+        started_at, suppressed = self._windows.get(key, (0.0, 0))
+        if now - started_at < self.window_seconds:
+            self._windows[key] = (started_at, suppressed + 1)
+            return
+        if suppressed:
+            logger.error(
+                "%s raised at %s:%d %d more times in the last %.0fs",
+                key[0],
+                key[1],
+                key[2],
+                suppressed,
+                now - started_at,
+            )
+        self._windows[key] = (now, 0)
+        logger.error(
+            "Unhandled error processing %s %s",
+            method,
+            path,
+            exc_info=(type(exc), exc, exc.__traceback__),
+        )
+
+
+traceback_log_limiter = TracebackLogLimiter(TRACEBACK_LOG_WINDOW_SECONDS)
+
+
+async def _service_error_handler(request: Request, exc: Exception) -> Response:
+    assert isinstance(exc, ServiceError)
+    logger.info(
+        "%s %s -> %d %s: %s",
+        request.method,
+        request.url.path,
+        exc.status_code,
+        exc.code,
+        exc.message,
+    )
+    return error_response(exc.message, exc.status_code, exc.code, exc.headers())
+
+
+async def _prisma_error_handler(request: Request, exc: Exception) -> Response:
+    # The query engine's message can name tables, columns and values, so it is only logged.
+    status_code, code, message = next(
+        mapping
+        for error_type, mapping in PRISMA_ERRORS.items()
+        if isinstance(exc, error_type)
+    )
+    logger.info(
+        "%s %s -> %d %s: %s", request.method, request.url.path, status_code, code, exc
+    )
+    return error_response(message, status_code, code)
+
+
+class ErrorMiddleware:
+    """
+    Catch-all for errors no exception handler mapped. Returns a generic 500 ErrorResponse, without leaking the error's details to the client, and logs the traceback through traceback_log_limiter. Written as a pure ASGI middleware so it adds no per-request overhead to streaming responses.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            exc = sys.exc_info()[1]
+            traceback_log_limiter.log(exc, scope["method"], scope["path"])
+            if response_started:
+                raise
+            response = error_response("Internal server error.", 500, "internal_error")
+            await response(scope, receive, send)
+
+
+def install_error_handling(app: FastAPI) -> None:
+    """
+    Installs the exception mapping layer: typed ServiceErrors and known Prisma errors become ErrorResponses with 4xx or 503 codes, and anything else a 500 with a rate limited traceback.
+
+    Args:
+        app (FastAPI): The application to install it on.
+    """
+    app.add_exception_handler(ServiceError, _service_error_handler)
+    for error_type in PRISMA_ERRORS:
+        app.add_exception_handler(error_type, _prisma_error_handler)
+    app.add_middleware(ErrorMiddleware)
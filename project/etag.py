@@ -0,0 +1,60 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+def compute_etag(body: bytes) -> str:
+    """
+    Computes a strong ETag for a response body. Serialized pydantic models are deterministic, so the same resource state always yields the same ETag.
+
+    Args:
+        body (bytes): The serialized response body.
+
+    Returns:
+        str: The quoted ETag value.
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Checks an If-None-Match header against an ETag, using the weak comparison required for conditional GETs.
+
+    Args:
+        if_none_match (Optional[str]): The value of the If-None-Match request header.
+        etag (str): The current ETag of the resource.
+
+    Returns:
+        bool: True if the client's copy is still current.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_response(request: Request, model: BaseModel) -> Response:
+    """
+    Serializes a response model with its ETag, or returns 304 Not Modified without a body if the request's If-None-Match already names that ETag.
+
+    Args:
+        request (Request): The incoming request.
+        model (BaseModel): The response model of the resource.
+
+    Returns:
+        Response: A 200 JSON response carrying the ETag, or an empty 304 response.
+    """
+    body = model.model_dump_json().encode()
+    etag = compute_etag(body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,65 @@
+"""
+Recounts the Post.feedbackCount and User.feedbackCount counters from the Feedback table.
+
+The counters are maintained incrementally as feedback is submitted and deleted, so
+run this once after adding the columns, to backfill the feedback that already
+exists, or whenever they are suspected to have drifted.
+
+    poetry run python -m project.feedback_counts
+"""
+
+import asyncio
+from typing import Optional
+
+import prisma
+
+RECOUNT_POST_FEEDBACK_QUERY = """
+UPDATE "Post" SET "feedbackCount" = counts."count"
+FROM (
+    SELECT p."id", count(f."id")::int AS "count"
+    FROM "Post" p
+    LEFT JOIN "Feedback" f ON f."postId" = p."id"
+    GROUP BY p."id"
+) AS counts
+WHERE "Post"."id" = counts."id" AND "Post"."feedbackCount" <> counts."count"
+"""
+
+RECOUNT_USER_FEEDBACK_QUERY = """
+UPDATE "User" SET "feedbackCount" = counts."count"
+FROM (
+    SELECT u."id", count(f."id")::int AS "count"
+    FROM "User" u
+    LEFT JOIN "Feedback" f ON f."userId" = u."id"
+    GROUP BY u."id"
+) AS counts
+WHERE "User"."id" = counts."id" AND "User"."feedbackCount" <> counts."count"
+"""
+
+
+async def recount_feedback_counts(client: Optional[prisma.Prisma] = None) -> int:
+    """
+    Recomputes the feedback counters of every post and user, writing only the rows whose counter is wrong.
+
+    Args:
+        client (Optional[prisma.Prisma]): The client to run in. Defaults to the registered client.
+
+    Returns:
+        int: The number of posts and users whose counter was corrected.
+    """
+    client = client or prisma.get_client()
+    posts = await client.execute_raw(RECOUNT_POST_FEEDBACK_QUERY)
+    users = await client.execute_raw(RECOUNT_USER_FEEDBACK_QUERY)
+    return posts + users
+
+
+async def main() -> None:
+    client = prisma.Prisma()
+    await client.connect()
+    try:
+        print(f"Corrected {await recount_feedback_counts(client)} feedback counters")
+    finally:
+        await client.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+import asyncio
+import json
+from typing import Optional
+
+import prisma
+import prisma.models
+from project.blob_store import BlobReference, blob_store, parse_blob_content
+from project.errors import NotFoundError
+from pydantic import BaseModel
+
+
+class RawContent(BaseModel):
+    """
+    Where the bytes of a piece of content live: a reference into the blob store for uploaded files, or the inline data for content stored in the database.
+    """
+
+    contentId: int
+    blob: Optional[BlobReference] = None
+    inline: Optional[str] = None
+
+
+async def fetchContentRaw(contentId: int) -> RawContent:
+    """
+    Looks up where the bytes of a piece of content live, so they can be served as is rather than embedded in a JSON body.
+
+    Args:
+        contentId (int): Unique identifier for the content.
+
+    Returns:
+        RawContent: The content's blob reference, or its inline data.
+
+    Raises:
+        NotFoundError: If the content does not exist, or its blob is missing from the blob store.
+
+    Example:
+        raw = await fetchContentRaw(12)
+        > RawContent(contentId=12, blob=BlobReference(sha256='9f86d0...', size=73400320, mediaType='video/mp4'), inline=None)
+    """
+    post = await prisma.models.Post.prisma().find_unique(where={"id": contentId})
+    if not post:
+        raise NotFoundError("Content not found with the given ID.")
+    blob = parse_blob_content(post.content)
+    if blob is not None:
+        if not await asyncio.to_thread(blob_store.exists, blob.sha256):
+            raise NotFoundError("The data of this content is no longer available.")
+        return RawContent(contentId=post.id, blob=blob)
+    inline = post.content if isinstance(post.content, str) else json.dumps(post.content)
+    return RawContent(contentId=post.id, inline=inline)
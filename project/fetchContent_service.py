@@ -2,6 +2,8 @@ from datetime import datetime
 
 import prisma
 import prisma.models
+from project.cache import cached
+from project.errors import NotFoundError
 from pydantic import BaseModel
 
 
@@ -16,8 +18,10 @@ class ContentDataResponse(BaseModel):
     type: str
     createdAt: datetime
     userId: int
+    feedbackCount: int = 0
 
 
+@cached("fetchContent")
 async def fetchContent(contentId: int) -> ContentDataResponse:
     """
     Capable of fetching the requested content by contentId for Users and Guests. The route delivers specific content data secured against unauthorized edits, returning the content and its metadata.
@@ -35,7 +39,7 @@ async def fetchContent(contentId: int) -> ContentDataResponse:
     """
     post = await prisma.models.Post.prisma().find_unique(where={"id": contentId})
     if not post:
-        raise ValueError("Content not found with the given ID.")
+        raise NotFoundError("Content not found with the given ID.")
     return ContentDataResponse(
         id=post.id,
         title=post.title,
@@ -43,4 +47,5 @@ async def fetchContent(contentId: int) -> ContentDataResponse:
         type=post.type.name,
         createdAt=post.createdAt,
         userId=post.userId,
+        feedbackCount=post.feedbackCount,
     )
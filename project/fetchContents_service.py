@@ -0,0 +1,126 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import prisma
+import prisma.models
+from project.errors import InvalidRequestError
+from pydantic import BaseModel
+
+MAX_BATCH_IDS = 200
+
+CONTENT_FIELDS = ("title", "content", "type", "createdAt", "userId", "feedbackCount")
+
+DEFAULT_CONTENT_FIELDS = ("title", "type", "createdAt", "userId", "feedbackCount")
+
+
+class ContentFieldsResponse(BaseModel):
+    """
+    A piece of content with only the requested fields set. Fields that were not requested are left unset, and omitted from the response.
+    """
+
+    id: int
+    title: Optional[str] = None
+    content: Optional[Any] = None
+    type: Optional[str] = None
+    createdAt: Optional[datetime] = None
+    userId: Optional[int] = None
+    feedbackCount: Optional[int] = None
+
+
+class ContentBatchResponse(BaseModel):
+    """
+    The requested pieces of content, in the order they were requested, along with the IDs that do not exist.
+    """
+
+    items: List[ContentFieldsResponse]
+    missingIds: List[int]
+
+
+def parse_content_ids(ids: str) -> List[int]:
+    """
+    Parses a comma separated list of content IDs.
+
+    Args:
+        ids (str): The requested IDs, e.g. "7,3,99".
+
+    Returns:
+        List[int]: The IDs, in the order they were given.
+
+    Raises:
+        InvalidRequestError: If an ID is not an integer.
+    """
+    try:
+        return [int(content_id) for content_id in ids.split(",") if content_id.strip()]
+    except ValueError:
+        raise InvalidRequestError("Content IDs must be comma separated integers.")
+
+
+def parse_content_fields(fields: Optional[str]) -> List[str]:
+    """
+    Parses a comma separated field projection.
+
+    Args:
+        fields (Optional[str]): The requested fields, e.g. "title,type". "*" selects every field, including the content itself.
+
+    Returns:
+        List[str]: The requested fields, or DEFAULT_CONTENT_FIELDS if none were requested.
+
+    Raises:
+        InvalidRequestError: If an unknown field is requested.
+    """
+    if not fields:
+        return list(DEFAULT_CONTENT_FIELDS)
+    if fields.strip() == "*":
+        return list(CONTENT_FIELDS)
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in CONTENT_FIELDS + ("id",)]
+    if unknown:
+        raise InvalidRequestError(f"Unknown content fields: {', '.join(unknown)}.")
+    return [field for field in CONTENT_FIELDS if field in requested]
+
+
+async def fetchContents(
+    ids: List[int], fields: Optional[List[str]] = None
+) -> ContentBatchResponse:
+    """
+    Fetches several pieces of content in one query, for feeds that would otherwise fetch them one request at a time. Only the requested columns are read, so the potentially large content column is only loaded when it is asked for.
+
+    Args:
+        ids (List[int]): The IDs of the content to fetch. Duplicates are returned once.
+        fields (Optional[List[str]]): The fields to return besides the ID. Defaults to DEFAULT_CONTENT_FIELDS.
+
+    Returns:
+        ContentBatchResponse: The requested pieces of content, in the order they were requested, along with the IDs that do not exist.
+
+    Raises:
+        InvalidRequestError: If more than MAX_BATCH_IDS IDs or an unknown field are requested.
+
+    Example:
+        response = await fetchContents([7, 3, 99], ["title", "type"])
+        > ContentBatchResponse(items=[ContentFieldsResponse(id=7, title='Sunset', type='IMAGE'), ContentFieldsResponse(id=3, ...)], missingIds=[99])
+    """
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_BATCH_IDS:
+        raise InvalidRequestError(
+            f"At most {MAX_BATCH_IDS} content IDs can be fetched at once."
+        )
+    fields = list(DEFAULT_CONTENT_FIELDS) if fields is None else fields
+    unknown = [field for field in fields if field not in CONTENT_FIELDS]
+    if unknown:
+        raise InvalidRequestError(f"Unknown content fields: {', '.join(unknown)}.")
+    if not ids:
+        return ContentBatchResponse(items=[], missingIds=[])
+    columns = ", ".join(f'"{field}"' for field in ["id", *fields])
+    placeholders = ", ".join(f"${position}" for position in range(1, len(ids) + 1))
+    rows: List[Dict[str, Any]] = await prisma.get_client().query_raw(
+        f'SELECT {columns} FROM "Post" WHERE "id" IN ({placeholders})', *ids
+    )
+    rows_by_id = {row["id"]: row for row in rows}
+    return ContentBatchResponse(
+        items=[
+            ContentFieldsResponse(**rows_by_id[content_id])
+            for content_id in ids
+            if content_id in rows_by_id
+        ],
+        missingIds=[content_id for content_id in ids if content_id not in rows_by_id],
+    )
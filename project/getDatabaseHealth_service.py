@@ -0,0 +1,70 @@
+import logging
+import time
+from typing import Optional
+
+import prisma
+from project.database import connection_limit, metric_values
+from project.errors import ServiceUnavailableError
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseHealthResponse(BaseModel):
+    """
+    The state of the database connection pool: how many connections are open and busy, how many queries are waiting for one, and how long they waited on average. status is "saturated" when every connection is busy or queries are waiting.
+    """
+
+    status: str
+    latencyMs: float
+    connectionLimit: int
+    connectionsOpen: int
+    connectionsBusy: int
+    connectionsIdle: int
+    queriesWaiting: int
+    saturation: float
+    averageWaitMs: Optional[float]
+
+
+async def getDatabaseHealth() -> DatabaseHealthResponse:
+    """
+    Checks that the database answers and reports pool saturation and wait time from the Prisma client's metrics.
+
+    Returns:
+        DatabaseHealthResponse: The state of the database connection pool.
+
+    Raises:
+        ServiceUnavailableError: If the database does not answer.
+
+    Example:
+        health = await getDatabaseHealth()
+        > DatabaseHealthResponse(status="ok", latencyMs=0.8, connectionLimit=9, connectionsOpen=9, connectionsBusy=1, connectionsIdle=8, queriesWaiting=0, saturation=0.11, averageWaitMs=0.02)
+    """
+    client = prisma.get_client()
+    started_at = time.perf_counter()
+    try:
+        await client.query_raw("SELECT 1")
+    except Exception as e:
+        logger.warning("Database health check failed", exc_info=True)
+        raise ServiceUnavailableError("Database is unavailable.") from e
+    latency_ms = (time.perf_counter() - started_at) * 1000
+    metrics = metric_values(await client.get_metrics())
+    limit = connection_limit()
+    busy = int(metrics.get("prisma_pool_connections_busy", 0))
+    waiting = int(metrics.get("prisma_client_queries_wait", 0))
+    wait_histogram = metrics.get("prisma_client_queries_wait_histogram_ms")
+    return DatabaseHealthResponse(
+        status="saturated" if waiting > 0 or busy >= limit else "ok",
+        latencyMs=latency_ms,
+        connectionLimit=limit,
+        connectionsOpen=int(metrics.get("prisma_pool_connections_open", 0)),
+        connectionsBusy=busy,
+        connectionsIdle=int(metrics.get("prisma_pool_connections_idle", 0)),
+        queriesWaiting=waiting,
+        saturation=busy / limit,
+        averageWaitMs=(
+            wait_histogram.sum / wait_histogram.count
+            if wait_histogram is not None and wait_histogram.count
+            else None
+        ),
+    )
@@ -0,0 +1,95 @@
+from typing import List
+
+import prisma
+from pydantic import BaseModel
+
+TOP_DUPLICATES = 10
+
+DEDUPE_REPORT_QUERY = """
+SELECT
+    count(*) AS "uniqueObjects",
+    coalesce(sum("refCount"), 0)::bigint AS "references",
+    coalesce(sum("size"), 0)::bigint AS "storedBytes",
+    coalesce(sum("size" * "refCount"), 0)::bigint AS "logicalBytes",
+    coalesce(sum("size") FILTER (WHERE "blob"), 0)::bigint AS "blobStoredBytes",
+    coalesce(sum("size" * "refCount") FILTER (WHERE "blob"), 0)::bigint AS "blobLogicalBytes",
+    (SELECT count(*) FROM "Post" WHERE "contentHash" IS NULL) AS "unindexedPosts"
+FROM "ContentObject"
+WHERE "refCount" > 0
+"""
+
+TOP_DUPLICATES_QUERY = """
+SELECT "hash", "size", "blob", "refCount"
+FROM "ContentObject"
+WHERE "refCount" > 1
+ORDER BY "size" * ("refCount" - 1) DESC
+LIMIT $1
+"""
+
+
+class DuplicatePayload(BaseModel):
+    """
+    A payload referenced by more than one post, and how much storage sharing it saves.
+    """
+
+    hash: str
+    size: int
+    blob: bool
+    references: int
+    savedBytes: int
+
+
+class DedupeReportResponse(BaseModel):
+    """
+    How much content is duplicated across posts. logicalBytes is what storing every post's payload separately would take, storedBytes what storing each distinct payload once takes. Blob-backed payloads are actually stored once; the blob figures show the savings already realised.
+    """
+
+    uniqueObjects: int
+    references: int
+    logicalBytes: int
+    storedBytes: int
+    savedBytes: int
+    dedupeRatio: float
+    blobLogicalBytes: int
+    blobStoredBytes: int
+    unindexedPosts: int
+    topDuplicates: List[DuplicatePayload]
+
+
+async def getDedupeReport() -> DedupeReportResponse:
+    """
+    Reports how much content is duplicated across posts, computed from the content hash index without reading any payload.
+
+    Returns:
+        DedupeReportResponse: The totals, the dedupe ratio (logical bytes over stored bytes) and the duplicated payloads that save the most storage.
+
+    Example:
+        report = await getDedupeReport()
+        > DedupeReportResponse(uniqueObjects=8120, references=10433, logicalBytes=9663676416, storedBytes=6442450944, savedBytes=3221225472, dedupeRatio=1.5, ...)
+    """
+    client = prisma.get_client()
+    totals = (await client.query_raw(DEDUPE_REPORT_QUERY))[0]
+    top = await client.query_raw(TOP_DUPLICATES_QUERY, TOP_DUPLICATES)
+    logical_bytes = totals["logicalBytes"]
+    stored_bytes = totals["storedBytes"]
+    return DedupeReportResponse(
+        uniqueObjects=totals["uniqueObjects"],
+        references=totals["references"],
+        logicalBytes=logical_bytes,
+        storedBytes=stored_bytes,
+        savedBytes=logical_bytes - stored_bytes,
+        dedupeRatio=logical_bytes / stored_bytes if stored_bytes else 1.0,
+        blobLogicalBytes=totals["blobLogicalBytes"],
+        blobStoredBytes=totals["blobStoredBytes"],
+        unindexedPosts=totals["unindexedPosts"],
+        topDuplicates=[
+            DuplicatePayload(
+                hash=row["hash"],
+                size=row["size"],
+                blob=row["blob"],
+                references=row["refCount"],
+                savedBytes=row["size"] * (row["refCount"] - 1),
+            )
+            for row in top
+        ],
+    )
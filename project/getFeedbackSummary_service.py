@@ -0,0 +1,78 @@
+from datetime import datetime
+from typing import List, Optional
+
+import prisma
+import prisma.models
+from project.errors import NotFoundError
+from pydantic import BaseModel
+
+DEFAULT_RECENT_FEEDBACK = 5
+
+MAX_RECENT_FEEDBACK = 50
+
+
+class FeedbackSummaryItem(BaseModel):
+    """
+    One of the most recent feedback entries on a piece of content.
+    """
+
+    id: int
+    content: str
+    createdAt: datetime
+    userId: Optional[int] = None
+
+
+class FeedbackSummaryResponse(BaseModel):
+    """
+    Summary of the feedback on a piece of content: how many entries it has, when the latest was submitted, and the most recent entries.
+    """
+
+    contentId: int
+    feedbackCount: int
+    latestFeedbackAt: Optional[datetime] = None
+    recentFeedback: List[FeedbackSummaryItem]
+
+
+async def getFeedbackSummary(
+    contentId: int, limit: int = DEFAULT_RECENT_FEEDBACK
+) -> FeedbackSummaryResponse:
+    """
+    Retrieves the feedback summary of a piece of content in a single query: the maintained feedback counter of the content, along with its most recent feedback entries. The feedback bodies beyond the most recent entries are never loaded.
+
+    Args:
+        contentId (int): The unique identifier of the content.
+        limit (int): How many of the most recent feedback entries to return.
+
+    Returns:
+        FeedbackSummaryResponse: Summary of the feedback on a piece of content: how many entries it has, when the latest was submitted, and the most recent entries.
+
+    Example:
+        summary = await getFeedbackSummary(42, 3)
+        > FeedbackSummaryResponse(contentId=42, feedbackCount=118, latestFeedbackAt=datetime.datetime(...), recentFeedback=[FeedbackSummaryItem(id=977, ...), ...])
+    """
+    post = await prisma.models.Post.prisma().find_unique(
+        where={"id": contentId},
+        include={
+            "feedbacks": {
+                "take": max(limit, 1),
+                "order_by": [{"createdAt": "desc"}, {"id": "desc"}],
+            }
+        },
+    )
+    if not post:
+        raise NotFoundError("Content not found with the given ID.")
+    feedbacks = post.feedbacks or []
+    return FeedbackSummaryResponse(
+        contentId=post.id,
+        feedbackCount=post.feedbackCount,
+        latestFeedbackAt=feedbacks[0].createdAt if feedbacks else None,
+        recentFeedback=[
+            FeedbackSummaryItem(
+                id=feedback.id,
+                content=feedback.content,
+                createdAt=feedback.createdAt,
+                userId=feedback.userId,
+            )
+            for feedback in feedbacks[:limit]
+        ],
+    )
@@ -3,6 +3,8 @@ from typing import Optional
 
 import prisma
 import prisma.models
+from project.cache import cached
+from project.errors import NotFoundError
 from pydantic import BaseModel
 
 
@@ -27,6 +29,7 @@ class FeedbackDetailResponse(BaseModel):
     userDetails: UserDetail
 
 
+@cached("getFeedback")
 async def getFeedback(feedbackId: int) -> FeedbackDetailResponse:
     """
     Fetches details of a specific feedback entry. Requires the feedback ID as a path parameter. This endpoint will retrieve the feedback detail from the database including user details, feedback content, and timestamp. Intended primarily for admin use to monitor or review feedback.
@@ -45,7 +48,7 @@ async def getFeedback(feedbackId: int) -> FeedbackDetailResponse:
         where={"id": feedbackId}, include={"user": {"include": {"profile": True}}}
     )
     if not feedback or not feedback.user:
-        raise ValueError("Feedback not found or lacks associated user details")
+        raise NotFoundError("Feedback not found or lacks associated user details")
     user_detail = UserDetail(
         userId=feedback.user.id,
         email=feedback.user.email,
@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import List, Optional
+
+import prisma
+import prisma.enums
+import prisma.models
+from project.errors import NotFoundError
+from pydantic import BaseModel
+
+
+class TaskDetails(BaseModel):
+    """
+    Detailed information about a task within a project.
+    """
+
+    id: int
+    title: str
+    dueDate: Optional[datetime] = None
+    description: Optional[str] = None
+
+
+class ProjectMemberDetails(BaseModel):
+    """
+    A team member allocated to the project, along with their role in it.
+    """
+
+    userId: int
+    email: str
+    role: prisma.enums.ProjectRole
+
+
+class ProjectDetailsResponse(BaseModel):
+    """
+    Detailed information about a single project, including its tasks, allocated team members and current status.
+    """
+
+    id: int
+    name: str
+    status: prisma.enums.ProjectStatus
+    ownerId: Optional[int] = None
+    tasks: List[TaskDetails]
+    members: List[ProjectMemberDetails]
+
+
+async def getProject(id: int) -> ProjectDetailsResponse:
+    """
+    Fetches detailed information for a specific project using the project ID. This route will retrieve detailed data including tasks, allocated team members from the User Management module, and current status from the Collaborative Workspace module.
+
+    Args:
+        id (int): The unique identifier of the project to fetch.
+
+    Returns:
+        ProjectDetailsResponse: Detailed information about a single project, including its tasks, allocated team members and current status.
+
+    Example:
+        project_details = await getProject(1)
+        > ProjectDetailsResponse(id=1, name='Project Alpha', status=ProjectStatus.ACTIVE, ownerId=3, tasks=[...], members=[ProjectMemberDetails(userId=3, email='owner@example.com', role=ProjectRole.OWNER), ...])
+    """
+    project = await prisma.models.Project.prisma().find_unique(
+        where={"id": id},
+        include={"tasks": True, "members": {"include": {"user": True}}},
+    )
+    if project is None:
+        raise NotFoundError(f"No project found with ID {id}")
+    tasks = [
+        TaskDetails(
+            id=task.id,
+            title=task.title,
+            dueDate=task.dueDate,
+            description=task.description,
+        )
+        for task in project.tasks or []
+    ]
+    members = [
+        ProjectMemberDetails(
+            userId=member.userId, email=member.user.email, role=member.role
+        )
+        for member in project.members or []
+        if member.user
+    ]
+    return ProjectDetailsResponse(
+        id=project.id,
+        name=project.name,
+        status=project.status,
+        ownerId=project.userId,
+        tasks=tasks,
+        members=members,
+    )
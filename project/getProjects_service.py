@@ -1,18 +1,40 @@
+import asyncio
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 import prisma
 import prisma.enums
 import prisma.models
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+DEFAULT_PAGE_SIZE = 50
+
+MAX_PAGE_SIZE = 500
+
+CAPPED_TASKS_QUERY = """
+SELECT "projectId", "title", "dueDate", "description"
+FROM (
+    SELECT
+        t."projectId", t."title", t."dueDate", t."description", t."id",
+        ROW_NUMBER() OVER (PARTITION BY t."projectId" ORDER BY t."id") AS "position"
+    FROM "Task" t
+    WHERE t."projectId" IN ({placeholders})
+) ranked
+WHERE "position" <= ${limit}
+ORDER BY "projectId", "id"
+"""
 
 
 class GetProjectsRequest(BaseModel):
     """
-    This model represents the GET request for all projects. It does not require input fields as it retrieves all projects without conditions. But, it might include authorization checks based on user roles.
+    This model represents the GET request for projects. Projects are returned in pages ordered by id, using keyset (id cursor) pagination so every page costs the same regardless of how far into the table it is. With batchTasks the tasks of a page are loaded with one batched query, capped to taskLimit per project (0 returns only the task counts).
     """
 
-    pass
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    after: Optional[int] = None
+    batchTasks: bool = False
+    taskLimit: Optional[int] = Field(default=None, ge=0)
 
 
 class TaskDetails(BaseModel):
@@ -34,6 +56,7 @@ class ProjectDetails(BaseModel):
     name: str
     status: prisma.enums.ProjectStatus
     tasks: List[TaskDetails]
+    taskCount: Optional[int] = None
 
 
 class GetProjectsResponse(BaseModel):
@@ -42,6 +65,7 @@ class GetProjectsResponse(BaseModel):
     """
 
     projects: List[ProjectDetails]
+    nextCursor: Optional[int] = None
 
 
 class ProjectStatus(BaseModel):
@@ -50,39 +74,161 @@ class ProjectStatus(BaseModel):
     ARCHIVED: str = "ARCHIVED"
 
 
-async def getProjects(request: GetProjectsRequest) -> GetProjectsResponse:
+def _to_task_details(task: prisma.models.Task) -> TaskDetails:
     """
-    Retrieves a list of all projects from the database. Each project includes its tasks and current status.
+    Converts a Task row into the TaskDetails response shape.
 
     Args:
-        request (GetProjectsRequest): Contains any user-specific filters or authentication data (unused in this simplified version).
+        task (prisma.models.Task): The task row.
 
     Returns:
-        GetProjectsResponse: a response instance which contains a list of all projects with details.
+        TaskDetails: The task's title, due date and description.
     """
-    projects_query = await prisma.models.Project.prisma().find_many(
-        include={"tasks": True}
+    return TaskDetails(
+        title=task.title,
+        dueDate=task.dueDate,
+        description=task.description if task.description else "",
     )
-    projects = []
-    for project in projects_query:
-        tasks = (
-            [
+
+
+async def _load_tasks(
+    project_ids: List[int], task_limit: Optional[int]
+) -> Tuple[Dict[int, List[TaskDetails]], Dict[int, int]]:
+    """
+    Loads the tasks of a page of projects with one batched query, instead of a nested include per project, along with the number of tasks of each project. When task_limit is set, only the first task_limit tasks of each project are read from the database.
+
+    Args:
+        project_ids (List[int]): The ids of the projects in the page.
+        task_limit (Optional[int]): The maximum number of tasks to return per project. With 0 the tasks themselves are not fetched, only their counts.
+
+    Returns:
+        Tuple[Dict[int, List[TaskDetails]], Dict[int, int]]: The tasks of each project, capped to task_limit, and the total number of tasks of each project.
+    """
+    where = {"projectId": {"in": project_ids}}
+    counts_query = prisma.models.Task.prisma().group_by(
+        ["projectId"], where=where, count=True
+    )
+    tasks: Dict[int, List[TaskDetails]] = defaultdict(list)
+    if task_limit == 0:
+        counts = await counts_query
+    elif task_limit is None:
+        counts, task_rows = await asyncio.gather(
+            counts_query,
+            prisma.models.Task.prisma().find_many(
+                where=where, order=[{"projectId": "asc"}, {"id": "asc"}]
+            ),
+        )
+        for task in task_rows:
+            tasks[task.projectId].append(_to_task_details(task))
+    else:
+        # The cap is applied in the database, so large projects do not send every task over the wire.
+        placeholders = ", ".join(
+            f"${position}" for position in range(1, len(project_ids) + 1)
+        )
+        query = CAPPED_TASKS_QUERY.format(
+            placeholders=placeholders, limit=len(project_ids) + 1
+        )
+        counts, capped_rows = await asyncio.gather(
+            counts_query,
+            prisma.get_client().query_raw(query, *project_ids, task_limit),
+        )
+        for row in capped_rows:
+            tasks[row["projectId"]].append(
                 TaskDetails(
-                    title=task.title,
-                    dueDate=task.dueDate,
-                    description=task.description if task.description else "",
+                    title=row["title"],
+                    dueDate=row["dueDate"],
+                    description=row["description"] or "",
                 )
-                for task in project.tasks
-            ]
-            if project.tasks is not None
-            else []
-        )
-        project_details = ProjectDetails(
-            id=project.id,
-            name=project.name,
-            status=prisma.enums.ProjectStatus(project.status),
-            tasks=tasks,
+            )
+    task_counts = {row["projectId"]: row["_count"]["_all"] for row in counts}
+    return tasks, task_counts
+
+
+async def _fetch_page(
+    request: GetProjectsRequest, after: Optional[int]
+) -> Tuple[List[ProjectDetails], Optional[int]]:
+    """
+    Fetches one page of projects ordered by id, starting strictly after the given cursor.
+
+    Args:
+        request (GetProjectsRequest): The page size and the task loading options.
+        after (Optional[int]): The id of the last project of the previous page, if any.
+
+    Returns:
+        Tuple[List[ProjectDetails], Optional[int]]: The projects of the page, and the cursor of the next page if the page was full.
+    """
+    projects_query = await prisma.models.Project.prisma().find_many(
+        where={"id": {"gt": after}} if after is not None else None,
+        take=request.limit,
+        order={"id": "asc"},
+        include=None if request.batchTasks else {"tasks": True},
+    )
+    if request.batchTasks and projects_query:
+        tasks, task_counts = await _load_tasks(
+            [project.id for project in projects_query], request.taskLimit
         )
-        projects.append(project_details)
-    response = GetProjectsResponse(projects=projects)
+        projects = [
+            ProjectDetails(
+                id=project.id,
+                name=project.name,
+                status=prisma.enums.ProjectStatus(project.status),
+                tasks=tasks.get(project.id, []),
+                taskCount=task_counts.get(project.id, 0),
+            )
+            for project in projects_query
+        ]
+    else:
+        projects = [
+            ProjectDetails(
+                id=project.id,
+                name=project.name,
+                status=prisma.enums.ProjectStatus(project.status),
+                tasks=[_to_task_details(task) for task in project.tasks or []],
+            )
+            for project in projects_query
+        ]
+    next_cursor = projects[-1].id if len(projects) == request.limit else None
+    return projects, next_cursor
+
+
+async def getProjects(request: GetProjectsRequest) -> GetProjectsResponse:
+    """
+    Retrieves one page of projects from the database. Each project includes its tasks and current status.
+
+    Args:
+        request (GetProjectsRequest): The page size, the id cursor to continue from and how tasks should be loaded.
+
+    Returns:
+        GetProjectsResponse: a response instance which contains a page of projects with details, and the cursor of the next page if there are more projects.
+
+    Example:
+        page = await getProjects(GetProjectsRequest(limit=2))
+        > GetProjectsResponse(projects=[ProjectDetails(id=1, ...), ProjectDetails(id=4, ...)], nextCursor=4)
+        next_page = await getProjects(GetProjectsRequest(limit=2, after=page.nextCursor))
+        summary = await getProjects(GetProjectsRequest(batchTasks=True, taskLimit=0))
+        > GetProjectsResponse(projects=[ProjectDetails(id=1, ..., tasks=[], taskCount=12), ...], nextCursor=None)
+    """
+    projects, next_cursor = await _fetch_page(request, request.after)
+    response = GetProjectsResponse(projects=projects, nextCursor=next_cursor)
     return response
+
+
+async def streamProjects(
+    request: GetProjectsRequest,
+) -> AsyncIterator[ProjectDetails]:
+    """
+    Yields every project after the request cursor, fetching them page by page so only one page is held in memory at a time.
+
+    Args:
+        request (GetProjectsRequest): The page size used for each fetch, the id cursor to start after and how tasks should be loaded.
+
+    Yields:
+        ProjectDetails: Each project along with its tasks, in id order.
+    """
+    after = request.after
+    while True:
+        projects, after = await _fetch_page(request, after)
+        for project_details in projects:
+            yield project_details
+        if after is None:
+            return
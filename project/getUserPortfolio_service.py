@@ -2,6 +2,7 @@ from typing import Dict, List, Optional
 
 import prisma
 import prisma.models
+from project.cache import cached
 from pydantic import BaseModel
 
 
@@ -24,6 +25,7 @@ class UserPortfolioOutput(BaseModel):
     portfolios: List[PortfolioDetailed]
 
 
+@cached("getUserPortfolio")
 async def getUserPortfolio(userId: int) -> UserPortfolioOutput:
     """
     Retrieves the portfolio of a specific user. The response includes all content from the user's portfolio, sourced through integration with the Content Creation Tools module. Returns a detailed user portfolio if the specific user ID exists. Suitable for display purposes where any visitor (guest included) can view a user's public portfolio information.
@@ -3,6 +3,8 @@ from typing import List, Optional
 import prisma
 import prisma.enums
 import prisma.models
+from project.cache import cached
+from project.errors import NotFoundError
 from pydantic import BaseModel
 
 
@@ -36,8 +38,10 @@ class UserProfileResponse(BaseModel):
     role: prisma.enums.Role
     profile: EmbeddedProfileType
     projects: List[Project]
+    feedbackCount: int = 0
 
 
+@cached("getUser")
 async def getUser(userId: int) -> UserProfileResponse:
     """
     Retrieves a single user profile based on the user ID. This route is protected to ensure that a user
@@ -60,7 +64,7 @@ async def getUser(userId: int) -> UserProfileResponse:
         include={"profile": {"include": {"portfolio": True}}, "projects": True},
     )
     if not user:
-        raise ValueError("No user found with provided ID")
+        raise NotFoundError("No user found with provided ID")
     portfolio_data = [
         {"title": portfolio.title, "description": portfolio.description}
         for portfolio in (
@@ -82,5 +86,6 @@ async def getUser(userId: int) -> UserProfileResponse:
         role=user.role.name,
         profile=profile_data,
         projects=projects_data,
+        feedbackCount=user.feedbackCount,
     )
     return user_response
@@ -1,10 +1,55 @@
+import asyncio
 from typing import List
 
 import prisma
 import prisma.enums
 import prisma.models
+from project.workspace_summary import (
+    RECENT_FEEDBACK_DAYS,
+    TASK_DUE_SOON_DAYS,
+    get_workspace_summary,
+)
 from pydantic import BaseModel
 
+WORKSPACE_DETAILS_QUERY = """
+WITH projects AS (
+    SELECT p."id", p."name", p."status"
+    FROM "Project" p
+    WHERE p."userId" = $1
+      AND p."status" = 'ACTIVE'
+      AND EXISTS (SELECT 1 FROM "ProjectMember" pm WHERE pm."projectId" = p."id")
+), users AS (
+    SELECT u."id", u."email"
+    FROM "User" u
+    WHERE EXISTS (
+        SELECT 1
+        FROM "ProjectMember" pm
+        JOIN projects p ON p."id" = pm."projectId"
+        WHERE pm."userId" = u."id"
+    )
+)
+SELECT
+    (SELECT count(*) FROM users) AS "activeUserCount",
+    (SELECT count(*) FROM projects) AS "ongoingProjectCount",
+    (
+        SELECT coalesce(
+            json_agg(json_build_object('id', "id", 'email', "email") ORDER BY "id"),
+            '[]'::json
+        )
+        FROM users
+    ) AS "activeUsers",
+    (
+        SELECT coalesce(
+            json_agg(
+                json_build_object('id', "id", 'name', "name", 'status', "status")
+                ORDER BY "id"
+            ),
+            '[]'::json
+        )
+        FROM projects
+    ) AS "ongoingProjects"
+"""
+
 
 class User(BaseModel):
     """
@@ -33,6 +78,11 @@ class WorkspaceDetailsResponse(BaseModel):
     workspaceId: str
     activeUsers: List[User]
     ongoingProjects: List[Project]
+    activeUserCount: int = 0
+    ongoingProjectCount: int = 0
+    openTaskCount: int = 0
+    tasksDueSoonCount: int = 0
+    recentFeedbackCount: int = 0
     workspaceOverview: str
 
 
@@ -50,31 +100,33 @@ async def getWorkspaceDetails(workspaceId: str) -> WorkspaceDetailsResponse:
     """
     Retrieves full details of a specific workspace by ID, including all active users and ongoing projects. This information is essential for displaying the comprehensive state of the workspace on the prisma.models.Project Management Dashboard. Access checks through User Management are performed to ensure only authorized users can access the details.
 
+    The distinct users and projects, and their counts, are computed by a single aggregation query in the database, so the response costs O(users + projects) rows rather than one row per project membership. As before, only active projects with at least one member are listed, and only users who are members of one of them. Task and feedback counts come from the workspace's precomputed summary, read concurrently.
+
     Args:
         workspaceId (str): Unique identifier for a workspace, used to fetch its details.
 
     Returns:
         WorkspaceDetailsResponse: Detailed information about a workspace including all active users, ongoing projects, and relevant workspace details. Ensures that data encapsulation is respected with proper viewing permissions.
     """
-    project_members = await prisma.models.ProjectMember.prisma().find_many(
-        where={"project": {"userId": int(workspaceId), "status": "ACTIVE"}},
-        include={"user": True, "project": True},
+    rows, summary = await asyncio.gather(
+        prisma.get_client().query_raw(WORKSPACE_DETAILS_QUERY, int(workspaceId)),
+        get_workspace_summary(int(workspaceId)),
     )
-    active_users_set = set()
-    ongoing_projects_set = set()
-    for pm in project_members:
-        if pm.user and pm.project:
-            active_users_set.add(User(id=pm.user.id, email=pm.user.email))
-            ongoing_projects_set.add(
-                prisma.models.Project(
-                    id=pm.project.id, name=pm.project.name, status=pm.project.status
-                )
-            )
-    active_users = list(active_users_set)
-    ongoing_projects = list(ongoing_projects_set)
+    row = rows[0]
     return WorkspaceDetailsResponse(
         workspaceId=workspaceId,
-        activeUsers=active_users,
-        ongoingProjects=ongoing_projects,
-        workspaceOverview="Overview of current activities and users in the workspace.",
+        activeUsers=[User.model_validate(user) for user in row["activeUsers"]],
+        ongoingProjects=[
+            Project.model_validate(project) for project in row["ongoingProjects"]
+        ],
+        activeUserCount=row["activeUserCount"],
+        ongoingProjectCount=row["ongoingProjectCount"],
+        openTaskCount=summary.openTasks,
+        tasksDueSoonCount=summary.tasksDueSoon,
+        recentFeedbackCount=summary.recentFeedback,
+        workspaceOverview=(
+            f"{row['ongoingProjectCount']} ongoing projects with {row['activeUserCount']} active users, "
+            f"{summary.openTasks} open tasks ({summary.tasksDueSoon} due within {TASK_DUE_SOON_DAYS} days) "
+            f"and {summary.recentFeedback} feedback entries in the last {RECENT_FEEDBACK_DAYS} days."
+        ),
     )
@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from project.workspace_summary import get_workspace_summary
+from pydantic import BaseModel
+
+
+class WorkspaceSummaryResponse(BaseModel):
+    """
+    Precomputed activity counts of a workspace, for dashboards: active users, active projects, open tasks, tasks due soon and recent feedback.
+    """
+
+    workspaceId: int
+    activeUsers: int
+    activeProjects: int
+    openTasks: int
+    tasksDueSoon: int
+    recentFeedback: int
+    updatedAt: datetime
+
+
+async def getWorkspaceSummary(workspaceId: int) -> WorkspaceSummaryResponse:
+    """
+    Retrieves the activity summary of a workspace by reading its single precomputed row, instead of aggregating its projects, tasks and feedback on every request. The row is kept up to date by the write endpoints and rebuilt periodically in the background.
+
+    Args:
+        workspaceId (int): The ID of the user who owns the workspace's projects.
+
+    Returns:
+        WorkspaceSummaryResponse: Precomputed activity counts of a workspace, for dashboards: active users, active projects, open tasks, tasks due soon and recent feedback.
+
+    Example:
+        summary = await getWorkspaceSummary(1)
+        > WorkspaceSummaryResponse(workspaceId=1, activeUsers=12, activeProjects=3, openTasks=48, tasksDueSoon=5, recentFeedback=9, updatedAt=datetime.datetime(...))
+    """
+    summary = await get_workspace_summary(workspaceId)
+    return WorkspaceSummaryResponse(
+        workspaceId=summary.workspaceId,
+        activeUsers=summary.activeUsers,
+        activeProjects=summary.activeProjects,
+        openTasks=summary.openTasks,
+        tasksDueSoon=summary.tasksDueSoon,
+        recentFeedback=summary.recentFeedback,
+        updatedAt=summary.updatedAt,
+    )
@@ -0,0 +1,280 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+from prisma import Prisma
+from prisma.client import Batch
+from project.nplusone import N_PLUS_ONE_MODE, detect_n_plus_one, record_query
+from project.responses import DefaultJSONResponse
+
+DURATION_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+PHASES = ("total", "db", "model", "serialize")
+
+
+class RequestTimings:
+    """
+    What one request spent its time on. db is the wall clock time during which at least one Prisma query was in flight, so concurrent queries are not counted twice; model the time spent in the handler and building the response model outside of them; and serialize the time spent encoding the response body.
+    """
+
+    __slots__ = (
+        "started_at",
+        "queries",
+        "db",
+        "serialize",
+        "serialize_started_at",
+        "_in_flight",
+        "_db_started_at",
+    )
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.serialize_started_at: Optional[float] = None
+        self._in_flight = 0
+        self._db_started_at = 0.0
+
+    def query_started(self) -> None:
+        self.queries += 1
+        if self._in_flight == 0:
+            self._db_started_at = time.perf_counter()
+        self._in_flight += 1
+
+    def query_finished(self) -> None:
+        self._in_flight -= 1
+        if self._in_flight == 0:
+            self.db += time.perf_counter() - self._db_started_at
+
+    def phases(self, finished_at: float) -> Dict[str, float]:
+        total = finished_at - self.started_at
+        handled_at = self.serialize_started_at or finished_at
+        return {
+            "total": total,
+            "db": self.db,
+            "model": max(0.0, handled_at - self.started_at - self.db),
+            "serialize": self.serialize,
+        }
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """
+    Returns the timings of the request being handled, or None outside of a request.
+    """
+    return _current_timings.get()
+
+
+class Histogram:
+    """
+    A cumulative histogram with fixed bucket bounds, in the Prometheus style.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class RouteMetrics:
+    """
+    Per route histograms of request phase durations and Prisma query counts, kept in memory for the /metrics endpoint.
+    """
+
+    def __init__(self) -> None:
+        self._durations: Dict[Tuple[str, str, str], Histogram] = {}
+        self._queries: Dict[Tuple[str, str], Histogram] = {}
+
+    def observe(
+        self, method: str, route: str, timings: RequestTimings, finished_at: float
+    ) -> Dict[str, float]:
+        phases = timings.phases(finished_at)
+        for phase, seconds in phases.items():
+            key = (method, route, phase)
+            if key not in self._durations:
+                self._durations[key] = Histogram(DURATION_BUCKETS)
+            self._durations[key].observe(seconds)
+        if (method, route) not in self._queries:
+            self._queries[(method, route)] = Histogram(QUERY_COUNT_BUCKETS)
+        self._queries[(method, route)].observe(timings.queries)
+        return phases
+
+    def render(self) -> str:
+        lines = [
+            "# HELP request_phase_seconds Time spent per request phase.",
+            "# TYPE request_phase_seconds histogram",
+        ]
+        for (method, route, phase), histogram in sorted(self._durations.items()):
+            lines.extend(
+                histogram.render(
+                    "request_phase_seconds",
+                    f'method="{method}",route="{route}",phase="{phase}"',
+                )
+            )
+        lines.append("# HELP request_db_queries Prisma queries issued per request.")
+        lines.append("# TYPE request_db_queries histogram")
+        for (method, route), histogram in sorted(self._queries.items()):
+            lines.extend(
+                histogram.render(
+                    "request_db_queries", f'method="{method}",route="{route}"'
+                )
+            )
+        return "\n".join(lines) + "\n"
+
+
+route_metrics = RouteMetrics()
+
+
+def server_timing(phases: Dict[str, float], queries: int) -> str:
+    """
+    Formats request timings as a Server-Timing header value, in milliseconds.
+
+    Args:
+        phases (Dict[str, float]): Seconds spent per phase.
+        queries (int): The number of Prisma queries the request issued.
+
+    Returns:
+        str: The header value, e.g. 'db;dur=3.1;desc="2 queries", model;dur=0.8, ...'.
+    """
+    entries = []
+    for phase in PHASES:
+        entry = f"{phase};dur={phases[phase] * 1000:.1f}"
+        if phase == "db":
+            entry += f';desc="{queries} queries"'
+        entries.append(entry)
+    return ", ".join(entries)
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    Route class that times each request: the handler runs with a RequestTimings in context, which InstrumentedPrisma and TimedJSONResponse add to. The result is returned in a Server-Timing header and recorded in route_metrics.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        method = next(iter(sorted(self.methods)), "GET")
+
+        async def timed_handler(request: Request) -> Response:
+            timings = RequestTimings()
+            token = _current_timings.set(timings)
+            response = None
+            try:
+                if N_PLUS_ONE_MODE in ("warn", "raise"):
+                    with detect_n_plus_one(mode=N_PLUS_ONE_MODE):
+                        response = await handler(request)
+                else:
+                    response = await handler(request)
+                return response
+            finally:
+                _current_timings.reset(token)
+                phases = route_metrics.observe(
+                    method, self.path_format, timings, time.perf_counter()
+                )
+                if response is not None:
+                    response.headers["Server-Timing"] = server_timing(
+                        phases, timings.queries
+                    )
+
+        return timed_handler
+
+
+class TimedJSONResponse(DefaultJSONResponse):
+    """
+    The default response class, recording how long encoding the body takes.
+    """
+
+    def render(self, content: Any) -> bytes:
+        timings = _current_timings.get()
+        if timings is None:
+            return super().render(content)
+        timings.serialize_started_at = time.perf_counter()
+        try:
+            return super().render(content)
+        finally:
+            timings.serialize += time.perf_counter() - timings.serialize_started_at
+
+
+class InstrumentedBatch(Batch):
+    async def commit(self) -> None:
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.query_started()
+        try:
+            await super().commit()
+        finally:
+            if timings is not None:
+                timings.query_finished()
+
+
+class InstrumentedPrisma(Prisma):
+    """
+    Prisma client that adds every query it runs to the current request's timings, and to the N+1 detection scope if one is open. Transactions and batches started from it are instrumented too, so services need no changes.
+    """
+
+    async def _execute(
+        self,
+        *,
+        method: Any,
+        arguments: Dict[str, Any],
+        model: Any = None,
+        root_selection: Optional[List[str]] = None,
+    ) -> Any:
+        record_query(method, getattr(model, "__name__", None), arguments)
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.query_started()
+        try:
+            return await super()._execute(
+                method=method,
+                arguments=arguments,
+                model=model,
+                root_selection=root_selection,
+            )
+        finally:
+            if timings is not None:
+                timings.query_finished()
+
+    def batch_(self) -> Batch:
+        return InstrumentedBatch(client=self)
@@ -3,6 +3,7 @@ from typing import List
 import prisma
 import prisma.enums
 import prisma.models
+from project.cache import cached
 from pydantic import BaseModel
 
 
@@ -32,6 +33,7 @@ class GetWorkspacesResponse(BaseModel):
     workspaces: List[Project]
 
 
+@cached("listAllWorkspaces")
 async def listAllWorkspaces(request: GetWorkspacesRequest) -> GetWorkspacesResponse:
     """
     Provides a list of all available workspaces for the guest view, typically used on public dashboards or information screens. This endpoint is designed with limited details exposure, suitable for unauthenticated or lower access level user engagements.
@@ -1,10 +1,17 @@
+import base64
+import binascii
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import prisma
 import prisma.models
+from project.errors import InvalidRequestError
 from pydantic import BaseModel
 
+DEFAULT_PAGE_SIZE = 50
+
+MAX_PAGE_SIZE = 500
+
 
 class UserDetails(BaseModel):
     """
@@ -33,10 +40,52 @@ class FeedbackListResponse(BaseModel):
     """
 
     feedbacks: List[FeedbackDetail]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(created_at: datetime, feedback_id: int) -> str:
+    """
+    Encodes the position of a feedback entry as an opaque page cursor.
+
+    Args:
+        created_at (datetime): The creation time of the last entry of a page.
+        feedback_id (int): The ID of the last entry of a page, which breaks ties between entries created at the same time.
+
+    Returns:
+        str: The cursor to pass to listFeedback to fetch the following page.
+    """
+    raw = f"{created_at.isoformat()}|{feedback_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodes a cursor returned by encode_cursor.
+
+    Args:
+        cursor (str): The cursor of the previous page.
+
+    Returns:
+        Tuple[datetime, int]: The creation time and ID of the last entry of the previous page.
+
+    Raises:
+        InvalidRequestError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, _, feedback_id = raw.partition("|")
+        return datetime.fromisoformat(created_at), int(feedback_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidRequestError("Invalid feedback cursor.")
 
 
 async def listFeedback(
-    user_id: Optional[int], content_id: Optional[int]
+    user_id: Optional[int],
+    content_id: Optional[int],
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
 ) -> FeedbackListResponse:
     """
     Retrieves a list of feedback entries from users. This endpoint will query the feedback database and
@@ -44,37 +93,77 @@ async def listFeedback(
     feedback content, and a timestamp. Feedback can be filtered by user or content ID through
     query parameters. The response will be formatted as JSON.
 
+    Entries are returned newest first, one page at a time, using keyset pagination on (createdAt, id) so
+    that every page is served by the (userId, createdAt) or (postId, createdAt) index. The authors of a
+    page are loaded with one query, each distinct author once.
+
     Args:
         user_id (Optional[int]): Optional query parameter to filter feedback by specific user.
         content_id (Optional[int]): Optional query parameter to filter feedback by specific content.
+        limit (int): The maximum number of entries to return.
+        cursor (Optional[str]): The next_cursor of the previous page, if any.
+        created_after (Optional[datetime]): Only return entries created at or after this time.
+        created_before (Optional[datetime]): Only return entries created before this time.
 
     Returns:
         FeedbackListResponse: Response model containing a list of feedback entries, potentially including
-                              related user details.
+                              related user details, and the cursor of the following page if there is one.
+
+    Raises:
+        InvalidRequestError: If the cursor is malformed.
     """
-    filters = {}
-    if user_id:
+    filters: Dict[str, Any] = {}
+    if user_id is not None:
         filters["userId"] = user_id
-    if content_id:
+    if content_id is not None:
         filters["postId"] = content_id
+    created_at: Dict[str, datetime] = {}
+    if created_after is not None:
+        created_at["gte"] = created_after
+    if created_before is not None:
+        created_at["lt"] = created_before
+    if created_at:
+        filters["createdAt"] = created_at
+    if cursor is not None:
+        last_created_at, last_id = decode_cursor(cursor)
+        filters["OR"] = [
+            {"createdAt": {"lt": last_created_at}},
+            {"createdAt": last_created_at, "id": {"lt": last_id}},
+        ]
     feedbacks = await prisma.models.Feedback.prisma().find_many(
-        where=filters, include={"user": {"include": {"profile": True}}}
+        where=filters,
+        order=[{"createdAt": "desc"}, {"id": "desc"}],
+        take=limit + 1,
+    )
+    next_cursor = None
+    if len(feedbacks) > limit:
+        feedbacks = feedbacks[:limit]
+        next_cursor = encode_cursor(feedbacks[-1].createdAt, feedbacks[-1].id)
+    author_ids = list(
+        {feedback.userId for feedback in feedbacks if feedback.userId is not None}
     )
-    feedback_details = []
-    for feedback in feedbacks:
-        user_detail = None
-        if feedback.user:
-            user_detail = UserDetails(
-                user_id=feedback.user.id,
-                username=feedback.user.email,
-                avatar=feedback.user.profile.avatar if feedback.user.profile else None,
-            )
-        feedback_details.append(
-            FeedbackDetail(
-                id=feedback.id,
-                user_details=user_detail,
-                content=feedback.content,
-                created_at=feedback.createdAt,
-            )
+    authors = (
+        await prisma.models.User.prisma().find_many(
+            where={"id": {"in": author_ids}}, include={"profile": True}
+        )
+        if author_ids
+        else []
+    )
+    user_details = {
+        user.id: UserDetails(
+            user_id=user.id,
+            username=user.email,
+            avatar=user.profile.avatar if user.profile else None,
+        )
+        for user in authors
+    }
+    feedback_details = [
+        FeedbackDetail(
+            id=feedback.id,
+            user_details=user_details.get(feedback.userId),
+            content=feedback.content,
+            created_at=feedback.createdAt,
         )
-    return FeedbackListResponse(feedbacks=feedback_details)
+        for feedback in feedbacks
+    ]
+    return FeedbackListResponse(feedbacks=feedback_details, next_cursor=next_cursor)
@@ -0,0 +1,73 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, List, TypeVar
+
+T = TypeVar("T")
+
+
+class LookupFailed(Exception):
+    """
+    Raised by run_lookups when a lookup's result fails its check. The message is meant to be returned to the client.
+    """
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
+
+
+def _found(result: Any) -> bool:
+    return result is not None
+
+
+class Lookup(Generic[T]):
+    """
+    An independent read, such as an existence or authorization check, along with the check its result must pass and the message to fail with otherwise.
+    """
+
+    def __init__(
+        self,
+        query: Awaitable[T],
+        message: str,
+        check: Callable[[T], bool] = _found,
+    ) -> None:
+        self.query = query
+        self.message = message
+        self.check = check
+
+
+async def run_lookups(*lookups: Lookup[Any]) -> List[Any]:
+    """
+    Runs independent lookups concurrently instead of awaiting them one after another. Failures are reported in argument order: a lookup's failure is raised as soon as every lookup given before it has passed, and the lookups still running are then cancelled. Put authorization checks first, so a caller who fails them never learns the outcome of the lookups after them.
+
+    Args:
+        *lookups (Lookup): The lookups to run.
+
+    Returns:
+        List[Any]: The result of each lookup, in the order they were given.
+
+    Raises:
+        LookupFailed: With the message of the first lookup, in argument order, whose result fails its check.
+
+    Example:
+        project, user = await run_lookups(
+            Lookup(prisma.models.Project.prisma().find_unique(where={"id": 1}), "Project not found."),
+            Lookup(prisma.models.User.prisma().find_unique(where={"id": 2}), "User not found."),
+        )
+    """
+    tasks = [asyncio.ensure_future(lookup.query) for lookup in lookups]
+    pending = set(tasks)
+    checked = 0
+    try:
+        while checked < len(tasks):
+            task, lookup = tasks[checked], lookups[checked]
+            if not task.done():
+                _, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                continue
+            if not lookup.check(task.result()):
+                raise LookupFailed(lookup.message)
+            checked += 1
+    finally:
+        for task in pending:
+            task.cancel()
+    return [task.result() for task in tasks]
@@ -0,0 +1,133 @@
+import logging
+import os
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+N_PLUS_ONE_MODE = os.getenv("N_PLUS_ONE_MODE", "off").lower()
+
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+
+class NPlusOneError(RuntimeError):
+    """
+    Raised in raise mode when one request or detection scope issues the same query shape more than the threshold allows.
+    """
+
+    def __init__(self, fingerprint: str, count: int, threshold: int) -> None:
+        super().__init__(
+            f"Query issued {count} times in one request (threshold {threshold}): {fingerprint}"
+        )
+        self.fingerprint = fingerprint
+        self.count = count
+
+
+def _shape(value: Any) -> str:
+    if isinstance(value, dict):
+        return (
+            "{"
+            + ",".join(
+                f"{key}:{_shape(item)}"
+                for key, item in sorted(value.items())
+                if item is not None
+            )
+            + "}"
+        )
+    if isinstance(value, (list, tuple)):
+        return "[" + (_shape(value[0]) if value else "") + "]"
+    return "?"
+
+
+def fingerprint(method: str, model: Optional[str], arguments: Dict[str, Any]) -> str:
+    """
+    Identifies the shape of a Prisma query, ignoring the values it is called with. Raw queries are identified by their SQL.
+
+    Args:
+        method (str): The Prisma method, e.g. find_unique or query_raw.
+        model (Optional[str]): The name of the model queried, if any.
+        arguments (Dict[str, Any]): The arguments of the query.
+
+    Returns:
+        str: The fingerprint, e.g. 'Post.find_unique {where:{id:?}}'.
+
+    Example:
+        fingerprint("find_unique", "Post", {"where": {"id": 7}, "include": None})
+        > 'Post.find_unique {where:{id:?}}'
+    """
+    if method in ("query_raw", "query_first", "execute_raw"):
+        return f"{method} {' '.join(str(arguments.get('query', '')).split())}"
+    return f"{model or '-'}.{method} {_shape(arguments)}"
+
+
+class QueryShapeCounter:
+    """
+    Counts the query shapes issued within one request or detection scope, and reports each shape once when it goes over the threshold.
+    """
+
+    def __init__(self, threshold: int, mode: str) -> None:
+        self.threshold = threshold
+        self.mode = mode
+        self.counts: Counter = Counter()
+
+    def record(
+        self, method: str, model: Optional[str], arguments: Dict[str, Any]
+    ) -> None:
+        shape = fingerprint(method, model, arguments)
+        self.counts[shape] += 1
+        count = self.counts[shape]
+        if count <= self.threshold:
+            return
+        if self.mode == "raise":
+            raise NPlusOneError(shape, count, self.threshold)
+        if count == self.threshold + 1:
+            logger.warning(
+                "Possible N+1 query: issued more than %d times in one request: %s",
+                self.threshold,
+                shape,
+            )
+
+
+_current_counter: ContextVar[Optional[QueryShapeCounter]] = ContextVar(
+    "query_shape_counter", default=None
+)
+
+
+def record_query(method: str, model: Optional[str], arguments: Dict[str, Any]) -> None:
+    """
+    Adds a query to the current detection scope, if there is one.
+
+    Raises:
+        NPlusOneError: In raise mode, if the query's shape went over the threshold.
+    """
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.record(method, model, arguments)
+
+
+@contextmanager
+def detect_n_plus_one(
+    threshold: int = N_PLUS_ONE_THRESHOLD, mode: str = "raise"
+) -> Iterator[QueryShapeCounter]:
+    """
+    Counts the Prisma queries issued inside the block by shape, and warns or raises when a shape is issued more than threshold times. The server opens one scope per request when N_PLUS_ONE_MODE is warn or raise; tests can open their own around a service call.
+
+    Args:
+        threshold (int): How many times one shape may be issued.
+        mode (str): 'warn' to log a warning, or 'raise' to raise NPlusOneError from the offending query.
+
+    Returns:
+        Iterator[QueryShapeCounter]: The counter, to inspect the shapes issued.
+
+    Example:
+        with detect_n_plus_one(threshold=3):
+            await createProject(...)
+    """
+    counter = QueryShapeCounter(threshold, mode)
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
@@ -0,0 +1,203 @@
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, TypeVar
+
+import bcrypt
+from project.errors import ServiceUnavailableError
+from pydantic import BaseModel
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "64"))
+
+LATENCY_SAMPLE_SIZE = 1024
+
+# A bcrypt hash of a random value with the default cost, checked against when there is no stored hash so the check takes as long as a real one.
+DUMMY_PASSWORD_HASH = "$2b$12$kWvxZPwMsuXAqM2JIefS1.gCurktFh91Q4NmYPtK/383LFTJL5tX6"
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusyError(ServiceUnavailableError):
+    """
+    Raised when the password hashing queue is full, so the request can be rejected instead of waiting behind every other credential check.
+    """
+
+
+class PasswordHashingMetrics(BaseModel):
+    """
+    Snapshot of the password hashing pool: its size, how many operations are running or waiting, and how long they take.
+    """
+
+    workers: int
+    queueLimit: int
+    inFlight: int
+    queueDepth: int
+    maxQueueDepth: int
+    completed: int
+    rejected: int
+    hashLatencyP50Ms: float
+    hashLatencyP95Ms: float
+    hashLatencyMaxMs: float
+    waitLatencyP95Ms: float
+
+
+def _percentile(samples: Deque[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded thread pool so hashing never blocks the event loop. bcrypt releases the GIL while it works, so threads hash in parallel.
+    """
+
+    def __init__(self, workers: int, queue_limit: int) -> None:
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._pending = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._rejected = 0
+        self._hash_latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLE_SIZE)
+        self._wait_latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLE_SIZE)
+
+    async def _run(self, func: Callable[..., T], *args: bytes) -> T:
+        if self._pending >= self.workers + self.queue_limit:
+            self._rejected += 1
+            raise PasswordHasherBusyError("Password hashing queue is full.")
+        self._pending += 1
+        self._max_queue_depth = max(self._max_queue_depth, self._pending - self.workers)
+        submitted_at = time.perf_counter()
+
+        def timed() -> T:
+            started_at = time.perf_counter()
+            self._wait_latencies.append((started_at - submitted_at) * 1000)
+            try:
+                return func(*args)
+            finally:
+                self._hash_latencies.append((time.perf_counter() - started_at) * 1000)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, timed
+            )
+        finally:
+            self._pending -= 1
+            self._completed += 1
+
+    async def hash(self, password: str) -> str:
+        """
+        Hashes a password with a fresh salt.
+
+        Args:
+            password (str): The plain text password.
+
+        Returns:
+            str: The bcrypt hash, ready to be stored.
+        """
+        hashed = await self._run(
+            lambda raw: bcrypt.hashpw(raw, bcrypt.gensalt()), password.encode()
+        )
+        return hashed.decode()
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """
+        Checks a password against a stored bcrypt hash.
+
+        Args:
+            password (str): The plain text password.
+            hashed (str): The stored bcrypt hash.
+
+        Returns:
+            bool: True if the password matches. Values that are not bcrypt hashes never match.
+        """
+
+        def check(raw: bytes, stored: bytes) -> bool:
+            try:
+                return bcrypt.checkpw(raw, stored)
+            except ValueError:
+                return False
+
+        return await self._run(check, password.encode(), hashed.encode())
+
+    def metrics(self) -> PasswordHashingMetrics:
+        """
+        Returns a snapshot of the pool's queue depth and latencies.
+        """
+        return PasswordHashingMetrics(
+            workers=self.workers,
+            queueLimit=self.queue_limit,
+            inFlight=min(self._pending, self.workers),
+            queueDepth=max(0, self._pending - self.workers),
+            maxQueueDepth=self._max_queue_depth,
+            completed=self._completed,
+            rejected=self._rejected,
+            hashLatencyP50Ms=_percentile(self._hash_latencies, 0.5),
+            hashLatencyP95Ms=_percentile(self._hash_latencies, 0.95),
+            hashLatencyMaxMs=max(self._hash_latencies, default=0.0),
+            waitLatencyP95Ms=_percentile(self._wait_latencies, 0.95),
+        )
+
+    def shutdown(self) -> None:
+        """
+        Waits for running operations and stops the worker threads.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT)
+
+
+async def hash_password(password: str) -> str:
+    """
+    Hashes a password on the shared password hashing pool.
+
+    Args:
+        password (str): The plain text password.
+
+    Returns:
+        str: The bcrypt hash, ready to be stored.
+
+    Raises:
+        PasswordHasherBusyError: If the hashing queue is full.
+    """
+    return await password_hasher.hash(password)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    """
+    Checks a password against a stored bcrypt hash on the shared password hashing pool.
+
+    Args:
+        password (str): The plain text password.
+        hashed (str): The stored bcrypt hash.
+
+    Returns:
+        bool: True if the password matches.
+
+    Raises:
+        PasswordHasherBusyError: If the hashing queue is full.
+    """
+    return await password_hasher.verify(password, hashed)
+
+
+async def verify_dummy_password(password: str) -> None:
+    """
+    Runs a password check that never matches and takes as long as a real one, for when there is no stored hash to check against. This keeps unknown accounts from answering faster than known ones.
+
+    Args:
+        password (str): The plain text password.
+
+    Raises:
+        PasswordHasherBusyError: If the hashing queue is full.
+    """
+    await password_hasher.verify(password, DUMMY_PASSWORD_HASH)
@@ -1,5 +1,7 @@
 import prisma
 import prisma.models
+from project.cache import cached
+from project.errors import NotFoundError
 from pydantic import BaseModel
 
 
@@ -14,6 +16,7 @@ class PublicProjectInfoResponse(BaseModel):
     status: str
 
 
+@cached("publicProjectInfo")
 async def publicProjectInfo(id: int) -> PublicProjectInfoResponse:
     """
     Provides public information about a project targeted for guest users. Includes non-sensitive data like project name,
@@ -37,7 +40,7 @@ async def publicProjectInfo(id: int) -> PublicProjectInfoResponse:
         select={"id": True, "name": True, "description": True, "status": True},
     )  # TODO(autogpt): No parameter named "select". reportCallIssue
     if project is None:
-        raise ValueError(f"No project found with ID {id}")
+        raise NotFoundError(f"No project found with ID {id}")
     return PublicProjectInfoResponse(
         id=project.id,
         name=project.name,
@@ -0,0 +1,166 @@
+import os
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import anyio
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from project.etag import etag_matches
+
+RAW_CONTENT_MAX_AGE = int(os.getenv("RAW_CONTENT_MAX_AGE", "3600"))
+
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(ValueError):
+    """
+    Raised when a Range header does not overlap the resource.
+    """
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parses a Range request header. Only single byte ranges are honoured; anything else is ignored and the whole resource is served, as RFC 9110 allows.
+
+    Args:
+        header (Optional[str]): The value of the Range request header.
+        size (int): The size of the resource in bytes.
+
+    Returns:
+        Optional[Tuple[int, int]]: The first and last byte of the range, inclusive, or None to serve the whole resource.
+
+    Raises:
+        RangeNotSatisfiable: If the range starts past the end of the resource.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start, sep, end = header[len("bytes=") :].strip().partition("-")
+    if not sep or not (start.isdigit() or end.isdigit()):
+        return None
+    if not start.isdigit():
+        suffix = int(end)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - suffix), size - 1
+    first = int(start)
+    last = int(end) if end.isdigit() else size - 1
+    if first >= size:
+        raise RangeNotSatisfiable()
+    if last < first:
+        return None
+    return first, min(last, size - 1)
+
+
+async def _read_range(path: Path, start: int, length: int) -> AsyncIterator[bytes]:
+    async with await anyio.open_file(path, "rb") as file:
+        await file.seek(start)
+        while length > 0:
+            chunk = await file.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _selected_range(
+    request: Request, size: int, headers: Dict[str, str]
+) -> Optional[Tuple[int, int]]:
+    if_range = request.headers.get("if-range")
+    if if_range is not None and if_range.strip() != headers["ETag"]:
+        return None
+    return parse_range(request.headers.get("range"), size)
+
+
+def _base_headers(etag: str, attachment: bool) -> Dict[str, str]:
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": f"public, max-age={RAW_CONTENT_MAX_AGE}",
+        "X-Content-Type-Options": "nosniff",
+    }
+    if attachment:
+        headers["Content-Disposition"] = "attachment"
+    return headers
+
+
+def ranged_file_response(
+    request: Request,
+    path: Path,
+    size: int,
+    media_type: str,
+    etag: str,
+    attachment: bool = False,
+) -> Response:
+    """
+    Serves a file with a strong ETag and cache headers, honouring If-None-Match and single byte Range requests. A whole file is served by FileResponse, which hands the path to the server when it supports zero-copy sends; a range streams only the requested bytes.
+
+    Args:
+        request (Request): The incoming request.
+        path (Path): The file to serve.
+        size (int): The size of the file in bytes.
+        media_type (str): The media type of the file.
+        etag (str): The quoted strong ETag of the file.
+        attachment (bool): Whether to ask browsers to download the file rather than render it.
+
+    Returns:
+        Response: A 200, 206, 304 or 416 response.
+    """
+    headers = _base_headers(etag, attachment)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    try:
+        selected = _selected_range(request, size, headers)
+    except RangeNotSatisfiable:
+        return Response(
+            status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"}
+        )
+    if selected is None:
+        return FileResponse(path, media_type=media_type, headers=headers)
+    start, end = selected
+    return StreamingResponse(
+        _read_range(path, start, end - start + 1),
+        status_code=206,
+        media_type=media_type,
+        headers={
+            **headers,
+            "Content-Range": f"bytes {start}-{end}/{size}",
+            "Content-Length": str(end - start + 1),
+        },
+    )
+
+
+def ranged_bytes_response(
+    request: Request, body: bytes, media_type: str, etag: str, attachment: bool = False
+) -> Response:
+    """
+    Serves an in-memory body with the same validators, cache headers and Range handling as ranged_file_response, for content stored inline in the database.
+
+    Args:
+        request (Request): The incoming request.
+        body (bytes): The body to serve.
+        media_type (str): The media type of the body.
+        etag (str): The quoted strong ETag of the body.
+        attachment (bool): Whether to ask browsers to download the body rather than render it.
+
+    Returns:
+        Response: A 200, 206, 304 or 416 response.
+    """
+    headers = _base_headers(etag, attachment)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    try:
+        selected = _selected_range(request, len(body), headers)
+    except RangeNotSatisfiable:
+        return Response(
+            status_code=416,
+            headers={**headers, "Content-Range": f"bytes */{len(body)}"},
+        )
+    if selected is None:
+        return Response(content=body, media_type=media_type, headers=headers)
+    start, end = selected
+    return Response(
+        content=body[start : end + 1],
+        status_code=206,
+        media_type=media_type,
+        headers={**headers, "Content-Range": f"bytes {start}-{end}/{len(body)}"},
+    )
@@ -0,0 +1,51 @@
+import logging
+import os
+from typing import Dict, Optional, Type
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_JSON_ENCODER = os.getenv("RESPONSE_JSON_ENCODER", "orjson").lower()
+
+
+def _default_response_class() -> Type[JSONResponse]:
+    if RESPONSE_JSON_ENCODER != "orjson":
+        return JSONResponse
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        logger.warning(
+            "RESPONSE_JSON_ENCODER is orjson but orjson is not installed; "
+            "falling back to the standard library json encoder."
+        )
+        return JSONResponse
+    return ORJSONResponse
+
+
+DefaultJSONResponse = _default_response_class()
+
+
+def error_response(
+    message: str,
+    status_code: int = 500,
+    code: str = "internal_error",
+    headers: Optional[Dict[str, str]] = None,
+) -> JSONResponse:
+    """
+    Builds an error response, with the same encoder as successful responses.
+
+    Args:
+        message (str): The error message returned to the client.
+        status_code (int): The HTTP status code.
+        code (str): The machine readable error code.
+        headers (Optional[Dict[str, str]]): Extra response headers, e.g. Retry-After.
+
+    Returns:
+        JSONResponse: A response with an {"error": message, "code": code} body.
+    """
+    return DefaultJSONResponse(
+        content={"error": message, "code": code},
+        status_code=status_code,
+        headers=headers,
+    )
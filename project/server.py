@@ -1,12 +1,14 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import prisma
 import prisma.enums
 import project.addTaskToProject_service
 import project.authenticateUser_service
+import project.blob_store
 import project.createContent_service
 import project.createProject_service
 import project.createUser_service
@@ -19,17 +21,25 @@ import project.deleteUser_service
 import project.deleteUserPortfolio_service
 import project.deleteWorkspace_service
 import project.fetchContent_service
+import project.fetchContentRaw_service
+import project.fetchContents_service
+import project.getDatabaseHealth_service
+import project.getDedupeReport_service
 import project.getFeedback_service
+import project.getFeedbackSummary_service
 import project.getProject_service
 import project.getProjects_service
 import project.getProjectTasks_service
 import project.getUser_service
 import project.getUserPortfolio_service
 import project.getWorkspaceDetails_service
+import project.getWorkspaceSummary_service
 import project.listAllWorkspaces_service
 import project.listFeedback_service
 import project.listUsers_service
+import project.passwords
 import project.publicProjectInfo_service
+import project.ranges
 import project.submitFeedback_service
 import project.updateContent_service
 import project.updateFeedbackStatus_service
@@ -38,32 +48,76 @@ import project.updateUser_service
 import project.updateUserPortfolio_service
 import project.updateWorkspace_service
 import project.uploadContent_service
-from fastapi import FastAPI
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import Response
-from prisma import Prisma
+import project.workspace_summary
+from fastapi import Depends, FastAPI, Query, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from project.auth import require_session
+from project.database import datasource, warm_up
+from project.errors import ErrorResponse, install_error_handling
+from project.etag import compute_etag, conditional_response
+from project.instrumentation import (
+    InstrumentedPrisma,
+    InstrumentedRoute,
+    TimedJSONResponse,
+    route_metrics,
+)
+from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
-db_client = Prisma(auto_register=True)
+db_client = InstrumentedPrisma(auto_register=True, datasource=datasource())
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await db_client.connect()
+    await warm_up()
+    refresh = None
+    if project.workspace_summary.WORKSPACE_SUMMARY_REFRESH_SECONDS > 0:
+        refresh = asyncio.create_task(
+            project.workspace_summary.refresh_workspace_summaries()
+        )
     yield
+    if refresh is not None:
+        refresh.cancel()
     await db_client.disconnect()
+    project.passwords.password_hasher.shutdown()
+
+
+async def _ndjson(items: AsyncIterator[BaseModel]) -> AsyncIterator[str]:
+    async for item in items:
+        yield item.model_dump_json() + "\n"
 
 
 app = FastAPI(
     title="supertrooper",
     lifespan=lifespan,
     description="a prject for supertropper createions",
+    default_response_class=TimedJSONResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        401: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
 )
 
+app.router.route_class = InstrumentedRoute
+install_error_handling(app)
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def api_get_metrics() -> PlainTextResponse:
+    """
+    Exposes per route histograms of request time spent on Prisma queries, building response models and serializing them, and of queries per request, in the Prometheus text format.
+    """
+    return PlainTextResponse(route_metrics.render())
+
 
 @app.delete(
-    "/users/{userId}", response_model=project.deleteUser_service.DeleteUserResponseModel
+    "/users/{userId}",
+    response_model=project.deleteUser_service.DeleteUserResponseModel,
+    dependencies=[Depends(require_session)],
 )
 async def api_delete_deleteUser(
     userId: str,
@@ -71,23 +125,14 @@ async def api_delete_deleteUser(
     """
     Deletes a user profile based on the user ID. This action is heavily guarded and only an Admin can execute deletion. The function performs data cleanup across dependent modules like Project Management and User Portfolio to maintain data integrity.
     """
-    try:
-        res = project.deleteUser_service.deleteUser(userId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = project.deleteUser_service.deleteUser(userId)
+    return res
 
 
 @app.delete(
     "/portfolios/{userId}",
     response_model=project.deleteUserPortfolio_service.DeletePortfolioResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_delete_deleteUserPortfolio(
     userId: int,
@@ -95,23 +140,14 @@ async def api_delete_deleteUserPortfolio(
     """
     Deletes a user's portfolio. This action removes all portfolio content and its details from the database securely. Access is strictly limited to ensure that only the user themselves or an admin can delete the portfolio. A successful deletion will confirm the removal of the portfolio.
     """
-    try:
-        res = await project.deleteUserPortfolio_service.deleteUserPortfolio(userId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.deleteUserPortfolio_service.deleteUserPortfolio(userId)
+    return res
 
 
 @app.delete(
     "/content/delete/{contentId}",
     response_model=project.deleteContent_service.DeleteContentResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_delete_deleteContent(
     contentId: int,
@@ -119,23 +155,14 @@ async def api_delete_deleteContent(
     """
     The DELETE endpoint allows the deletion of content by contentId for Admins and authority-holding Users. Upon successful deletion, confirms the action with a success response.
     """
-    try:
-        res = await project.deleteContent_service.deleteContent(contentId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.deleteContent_service.deleteContent(contentId)
+    return res
 
 
 @app.post(
     "/workspace",
     response_model=project.createWorkspace_service.WorkspaceCreationResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_post_createWorkspace(
     userId: int, workspaceName: str, workspaceDescription: str
@@ -143,20 +170,10 @@ async def api_post_createWorkspace(
     """
     Allows an authorized user to create a new collaborative workspace. The function also notifies the Project Management Dashboard to add this new workspace to the user's list. Performs user validation to check if the user has 'Admin' privileges.
     """
-    try:
-        res = await project.createWorkspace_service.createWorkspace(
-            userId, workspaceName, workspaceDescription
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.createWorkspace_service.createWorkspace(
+        userId, workspaceName, workspaceDescription
+    )
+    return res
 
 
 @app.post(
@@ -164,27 +181,21 @@ async def api_post_createWorkspace(
     response_model=project.authenticateUser_service.AuthenticateUserResponse,
 )
 async def api_post_authenticateUser(
-    email: str, password: str
+    email: str, password: str, request: Request
 ) -> project.authenticateUser_service.AuthenticateUserResponse | Response:
     """
-    Handles user authentication. Accepts credentials, verifies them against the stored user data, and returns authentication status along with a session token. This action is public to allow Guest and User roles to authenticate.
-    """
-    try:
-        res = project.authenticateUser_service.authenticateUser(email, password)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    Handles user authentication. Accepts credentials, verifies them against the stored user data, and returns authentication status along with a session token. This action is public to allow Guest and User roles to authenticate. Repeated attempts from the same client, and repeated failed attempts for the same email from that client, are rate limited with a 429 response.
+    """
+    res = await project.authenticateUser_service.authenticateUser(
+        email, password, request.client.host if request.client else None
+    )
+    return res
 
 
 @app.post(
-    "/feedback", response_model=project.submitFeedback_service.PostFeedbackResponse
+    "/feedback",
+    response_model=project.submitFeedback_service.PostFeedbackResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_post_submitFeedback(
     userId: int, postId: int, content: str
@@ -192,23 +203,14 @@ async def api_post_submitFeedback(
     """
     Allows users to submit feedback on the content. Users need to provide their user ID (which will be checked against the User Management module to verify privileges) and feedback details. The API will save this information in the feedback database, linking it to the respective content and user profile if applicable. A successful operation will return a confirmation message and a status code of 201.
     """
-    try:
-        res = project.submitFeedback_service.submitFeedback(userId, postId, content)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.submitFeedback_service.submitFeedback(userId, postId, content)
+    return res
 
 
 @app.put(
     "/workspace/{workspaceId}",
     response_model=project.updateWorkspace_service.UpdateWorkspaceResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_put_updateWorkspace(
     workspaceId: int,
@@ -219,25 +221,16 @@ async def api_put_updateWorkspace(
     """
     Updates the settings or details of an existing workspace identified by the workspace ID. Access is secured to ensure only authorized 'Admin' roles can perform updates. It also integrates real-time updates to the Project Management Dashboard.
     """
-    try:
-        res = project.updateWorkspace_service.updateWorkspace(
-            workspaceId, projectName, projectStatus, description
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = project.updateWorkspace_service.updateWorkspace(
+        workspaceId, projectName, projectStatus, description
+    )
+    return res
 
 
 @app.delete(
     "/feedback/{feedbackId}",
     response_model=project.deleteFeedback_service.DeleteFeedbackResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_delete_deleteFeedback(
     feedbackId: int,
@@ -245,22 +238,14 @@ async def api_delete_deleteFeedback(
     """
     Permits an admin to delete a feedback entry. The endpoint requires the feedback ID as a path parameter. It will verify if the requester has admin rights before allowing the deletion from the database. This operation will provide a success or failure status code accordingly.
     """
-    try:
-        res = await project.deleteFeedback_service.deleteFeedback(feedbackId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.deleteFeedback_service.deleteFeedback(feedbackId)
+    return res
 
 
 @app.delete(
-    "/projects/{id}", response_model=project.deleteProject_service.DeleteProjectResponse
+    "/projects/{id}",
+    response_model=project.deleteProject_service.DeleteProjectResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_delete_deleteProject(
     id: int, admin_user_id: int
@@ -268,18 +253,8 @@ async def api_delete_deleteProject(
     """
     Deletes a project by ID. This route removes the project from the database and also updates the User Management module to reassign or deactivate users associated with this project.
     """
-    try:
-        res = await project.deleteProject_service.deleteProject(id, admin_user_id)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.deleteProject_service.deleteProject(id, admin_user_id)
+    return res
 
 
 @app.get(
@@ -287,23 +262,13 @@ async def api_delete_deleteProject(
     response_model=project.getUserPortfolio_service.UserPortfolioOutput,
 )
 async def api_get_getUserPortfolio(
-    userId: int,
+    userId: int, request: Request
 ) -> project.getUserPortfolio_service.UserPortfolioOutput | Response:
     """
     Retrieves the portfolio of a specific user. The response includes all content from the user's portfolio, sourced through integration with the Content Creation Tools module. Returns a detailed user portfolio if the specific user ID exists. Suitable for display purposes where any visitor (guest included) can view a user's public portfolio information.
     """
-    try:
-        res = await project.getUserPortfolio_service.getUserPortfolio(userId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.getUserPortfolio_service.getUserPortfolio(userId)
+    return conditional_response(request, res)
 
 
 @app.get(
@@ -316,23 +281,14 @@ async def api_get_getProjectTasks(
     """
     Retrieves all tasks for a specified project. This queries the internal task management system specific to the project's ID and integrates with the User Management to ensure only assigned roles can view their respective tasks.
     """
-    try:
-        res = await project.getProjectTasks_service.getProjectTasks(id, role)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.getProjectTasks_service.getProjectTasks(id, role)
+    return res
 
 
 @app.put(
     "/content/update/{contentId}",
     response_model=project.updateContent_service.ContentUpdateResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_put_updateContent(
     contentId: str,
@@ -343,25 +299,14 @@ async def api_put_updateContent(
     """
     This PUT endpoint enables Admins or the owning User to update existing content specified by contentId. It validates permissions and updates content details stored in the database, returning success or error messages.
     """
-    try:
-        res = project.updateContent_service.updateContent(
-            contentId, title, content, type
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = project.updateContent_service.updateContent(contentId, title, content, type)
+    return res
 
 
 @app.post(
     "/content/create",
     response_model=project.createContent_service.CreateContentResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_post_createContent(
     userId: int, title: str, content: Dict, type: str
@@ -369,24 +314,16 @@ async def api_post_createContent(
     """
     This POST endpoint allows authenticated users to create new multimedia content. It checks user credentials via User Management module and returns a content ID if successful. Only verified Admins and Users can create content.
     """
-    try:
-        res = await project.createContent_service.createContent(
-            userId, title, content, type
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.createContent_service.createContent(
+        userId, title, content, type
+    )
+    return res
 
 
 @app.put(
-    "/projects/{id}", response_model=project.updateProject_service.ProjectUpdateResponse
+    "/projects/{id}",
+    response_model=project.updateProject_service.ProjectUpdateResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_put_updateProject(
     id: int, name: str, description: Optional[str], deadline: Optional[datetime]
@@ -394,20 +331,10 @@ async def api_put_updateProject(
     """
     Updates project details for a specific project ID. Authorized users can modify project parameters such as name, description, deadlines, etc. Changes are synchronized with the Collaborative Workspace module to reflect updates in real-time.
     """
-    try:
-        res = await project.updateProject_service.updateProject(
-            id, name, description, deadline
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.updateProject_service.updateProject(
+        id, name, description, deadline
+    )
+    return res
 
 
 @app.get(
@@ -420,66 +347,54 @@ async def api_get_publicProjectInfo(
     """
     Provides public information about a project targeted for guest users. Includes non-sensitive data like project name, project description, and overall status, ensuring compliance with confidentiality standards.
     """
-    try:
-        res = await project.publicProjectInfo_service.publicProjectInfo(id)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.publicProjectInfo_service.publicProjectInfo(id)
+    return res
 
 
 @app.get(
     "/projects/{id}", response_model=project.getProject_service.ProjectDetailsResponse
 )
 async def api_get_getProject(
-    id: int,
+    id: int, request: Request
 ) -> project.getProject_service.ProjectDetailsResponse | Response:
     """
     Fetches detailed information for a specific project using the project ID. This route will retrieve detailed data including tasks, allocated team members from the User Management module, and current status from the Collaborative Workspace module.
     """
-    try:
-        res = project.getProject_service.getProject(id)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.getProject_service.getProject(id)
+    return conditional_response(request, res)
 
 
 @app.get("/projects", response_model=project.getProjects_service.GetProjectsResponse)
 async def api_get_getProjects(
-    request: project.getProjects_service.GetProjectsRequest,
+    limit: int = Query(
+        default=project.getProjects_service.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=project.getProjects_service.MAX_PAGE_SIZE,
+    ),
+    after: Optional[int] = None,
+    stream: bool = False,
+    batchTasks: bool = False,
+    taskLimit: Optional[int] = Query(default=None, ge=0),
 ) -> project.getProjects_service.GetProjectsResponse | Response:
     """
-    Retrieves a list of all projects. This endpoint queries the database for all project entries, returning them in a formatted JSON response. It integrates with the Collaborative Workspace module to fetch real-time status updates for each project displayed.
-    """
-    try:
-        res = await project.getProjects_service.getProjects(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
+    Retrieves a page of projects, ordered by id. Pass the returned `nextCursor` as `after` to fetch the following page. With `stream=true` every project after the cursor is streamed as newline-delimited JSON, fetched from the database `limit` projects at a time. With `batchTasks=true` the tasks of each page are loaded in one batched query, capped to `taskLimit` per project, and each project reports its `taskCount`.
+    """
+    request = project.getProjects_service.GetProjectsRequest(
+        limit=limit, after=after, batchTasks=batchTasks, taskLimit=taskLimit
+    )
+    if stream:
+        return StreamingResponse(
+            _ndjson(project.getProjects_service.streamProjects(request)),
+            media_type="application/x-ndjson",
         )
+    res = await project.getProjects_service.getProjects(request)
+    return res
 
 
 @app.post(
-    "/projects", response_model=project.createProject_service.CreateProjectResponse
+    "/projects",
+    response_model=project.createProject_service.CreateProjectResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_post_createProject(
     name: str, description: Optional[str], userId: int, members: List[int]
@@ -487,20 +402,25 @@ async def api_post_createProject(
     """
     Allows the creation of a new project. Users can post project details, which are then saved in the project database. This route also sends a notification to the User Management module to assign default roles to the project.
     """
-    try:
-        res = await project.createProject_service.createProject(
-            name, description, userId, members
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.createProject_service.createProject(
+        name, description, userId, members
+    )
+    return res
+
+
+@app.post(
+    "/projects/batch",
+    response_model=project.createProject_service.CreateProjectsBatchResponse,
+    dependencies=[Depends(require_session)],
+)
+async def api_post_createProjects(
+    projects: List[project.createProject_service.ProjectCreationRequest],
+) -> project.createProject_service.CreateProjectsBatchResponse | Response:
+    """
+    Creates a batch of projects along with their members in one call, for bulk imports. The whole batch is written in a single transaction: if any project or membership cannot be created, none of them are.
+    """
+    res = await project.createProject_service.createProjects(projects)
+    return res
 
 
 @app.get("/users", response_model=project.listUsers_service.QueryUsersResponse)
@@ -510,23 +430,14 @@ async def api_get_listUsers(
     """
     Lists all user profiles or filters them based on query parameters such as role or status. Useful for Admins to manage and overview all platform users. This route is protected and only accessible by Admins.
     """
-    try:
-        res = await project.listUsers_service.listUsers(role, status)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.listUsers_service.listUsers(role, status)
+    return res
 
 
 @app.post(
     "/projects/{id}/tasks",
     response_model=project.addTaskToProject_service.TaskCreationResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_post_addTaskToProject(
     project_id: int, description: str, deadline: datetime, assigned_user_id: int
@@ -534,20 +445,72 @@ async def api_post_addTaskToProject(
     """
     Adds a new task to a project with specific project ID. It requires task details such as the task description, deadline, and the assigned user's ID from User Management.
     """
-    try:
-        res = await project.addTaskToProject_service.addTaskToProject(
-            project_id, description, deadline, assigned_user_id
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.addTaskToProject_service.addTaskToProject(
+        project_id, description, deadline, assigned_user_id
+    )
+    return res
+
+
+@app.post(
+    "/projects/tasks/bulk",
+    response_model=project.addTaskToProject_service.BulkTaskCreationResponse,
+    dependencies=[Depends(require_session)],
+)
+async def api_post_addTasksToProjects(
+    tasks: List[project.addTaskToProject_service.BulkTaskInput],
+    chunk_size: int = Query(
+        default=project.addTaskToProject_service.DEFAULT_TASK_CHUNK_SIZE,
+        ge=1,
+        le=project.addTaskToProject_service.MAX_TASK_CHUNK_SIZE,
+    ),
+    stream: bool = False,
+) -> project.addTaskToProject_service.BulkTaskCreationResponse | Response:
+    """
+    Imports a batch of tasks into their projects. Referenced projects and users are validated with one query each and tasks are inserted in chunks of `chunk_size`, returning the outcome of every task by its position in the request. With `stream=true` a progress report is streamed as newline-delimited JSON after each chunk.
+    """
+    if stream:
+        return StreamingResponse(
+            _ndjson(
+                project.addTaskToProject_service.streamTasksToProjects(
+                    tasks, chunk_size
+                )
+            ),
+            media_type="application/x-ndjson",
+        )
+    res = await project.addTaskToProject_service.addTasksToProjects(tasks, chunk_size)
+    return res
+
+
+@app.get(
+    "/content/dedupe/report",
+    response_model=project.getDedupeReport_service.DedupeReportResponse,
+)
+async def api_get_getDedupeReport() -> (
+    project.getDedupeReport_service.DedupeReportResponse | Response
+):
+    """
+    Reports how much content is duplicated across posts: distinct payloads, references, logical versus stored bytes, the dedupe ratio and the duplicated payloads that save the most storage.
+    """
+    res = await project.getDedupeReport_service.getDedupeReport()
+    return res
+
+
+@app.get(
+    "/content",
+    response_model=project.fetchContents_service.ContentBatchResponse,
+    response_model_exclude_unset=True,
+)
+async def api_get_fetchContents(
+    ids: str, fields: Optional[str] = None
+) -> project.fetchContents_service.ContentBatchResponse | Response:
+    """
+    Fetches several pieces of content in one request, in the order given by the comma separated `ids`. `fields` is a comma separated projection of title, content, type, createdAt, userId and feedbackCount (`*` for all); by default everything but the content itself is returned. Unknown IDs are listed in `missingIds`.
+    """
+    res = await project.fetchContents_service.fetchContents(
+        project.fetchContents_service.parse_content_ids(ids),
+        project.fetchContents_service.parse_content_fields(fields),
+    )
+    return res
 
 
 @app.get(
@@ -555,49 +518,84 @@ async def api_post_addTaskToProject(
     response_model=project.fetchContent_service.ContentDataResponse,
 )
 async def api_get_fetchContent(
-    contentId: int,
+    contentId: int, request: Request
 ) -> project.fetchContent_service.ContentDataResponse | Response:
     """
     Capable of fetching the requested content by contentId for Users and Guests. The route delivers specific content data secured against unauthorized edits, returning the content and its metadata.
     """
-    try:
-        res = await project.fetchContent_service.fetchContent(contentId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
+    res = await project.fetchContent_service.fetchContent(contentId)
+    return conditional_response(request, res)
+
+
+@app.get("/content/{contentId}/raw")
+async def api_get_fetchContentRaw(contentId: int, request: Request) -> Response:
+    """
+    Serves the bytes of a piece of content as is, with its stored media type, a strong ETag and cache headers. Single byte Range requests are honoured, so clients can seek in videos without downloading them in full. Responses are marked nosniff, and media types outside ALLOWED_MEDIA_TYPES are served as downloads rather than rendered.
+    """
+    res = await project.fetchContentRaw_service.fetchContentRaw(contentId)
+    if res.blob is None:
+        body = (res.inline or "").encode()
+        return project.ranges.ranged_bytes_response(
+            request,
+            body,
+            "text/plain; charset=utf-8",
+            compute_etag(body),
         )
+    return project.ranges.ranged_file_response(
+        request,
+        project.blob_store.blob_store.path_for(res.blob.sha256),
+        res.blob.size,
+        res.blob.mediaType,
+        f'"{res.blob.sha256}"',
+        attachment=not project.blob_store.is_allowed_media_type(res.blob.mediaType),
+    )
+
+
+@app.get(
+    "/content/{contentId}/feedback/summary",
+    response_model=project.getFeedbackSummary_service.FeedbackSummaryResponse,
+)
+async def api_get_getFeedbackSummary(
+    contentId: int,
+    limit: int = Query(
+        default=project.getFeedbackSummary_service.DEFAULT_RECENT_FEEDBACK,
+        ge=0,
+        le=project.getFeedbackSummary_service.MAX_RECENT_FEEDBACK,
+    ),
+) -> project.getFeedbackSummary_service.FeedbackSummaryResponse | Response:
+    """
+    Retrieves the feedback summary of a piece of content: its feedback count, the time of its latest feedback and its `limit` most recent feedback entries, without loading the rest of its feedback.
+    """
+    res = await project.getFeedbackSummary_service.getFeedbackSummary(contentId, limit)
+    return res
 
 
 @app.get("/feedback", response_model=project.listFeedback_service.FeedbackListResponse)
 async def api_get_listFeedback(
-    user_id: Optional[int], content_id: Optional[int]
+    user_id: Optional[int] = None,
+    content_id: Optional[int] = None,
+    limit: int = Query(
+        default=project.listFeedback_service.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=project.listFeedback_service.MAX_PAGE_SIZE,
+    ),
+    cursor: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
 ) -> project.listFeedback_service.FeedbackListResponse | Response:
     """
-    Retrieves a list of feedback entries from users. This endpoint will query the feedback database and return an array of feedback entries. Each entry will contain user details (if available), feedback content, and a timestamp. Feedback can be filtered by user or content ID through query parameters. The response will be formatted as JSON.
-    """
-    try:
-        res = await project.listFeedback_service.listFeedback(user_id, content_id)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    Retrieves a list of feedback entries from users. This endpoint will query the feedback database and return an array of feedback entries. Each entry will contain user details (if available), feedback content, and a timestamp. Feedback can be filtered by user or content ID and by creation time through query parameters. Entries are returned newest first, `limit` at a time; pass the returned `next_cursor` as `cursor` to fetch the following page. The response will be formatted as JSON.
+    """
+    res = await project.listFeedback_service.listFeedback(
+        user_id, content_id, limit, cursor, created_after, created_before
+    )
+    return res
 
 
 @app.delete(
     "/workspace/{workspaceId}",
     response_model=project.deleteWorkspace_service.DeleteWorkspaceResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_delete_deleteWorkspace(
     workspaceId: int,
@@ -605,23 +603,14 @@ async def api_delete_deleteWorkspace(
     """
     Deletes a specific workspace by its ID. This is crucial for maintaining data integrity and lifecycle management of workspaces. Additionally, this change is communicated to the Project Management Dashboard to remove the workspace from all linked overviews. Restricted to 'Admin' role for security compliance.
     """
-    try:
-        res = await project.deleteWorkspace_service.deleteWorkspace(workspaceId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.deleteWorkspace_service.deleteWorkspace(workspaceId)
+    return res
 
 
 @app.post(
     "/portfolios",
     response_model=project.createUserPortfolio_service.CreatePortfolioResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_post_createUserPortfolio(
     user_id: int, title: str, description: Optional[str], auth_token: str
@@ -629,25 +618,16 @@ async def api_post_createUserPortfolio(
     """
     Creates a new portfolio for a registered user. This endpoint takes user details and portfolio parameters, creating a new portfolio entry linked to the user's account. It interacts with the User Management to verify user authenticity and roles. Appropriate response confirms portfolio creation with a link to the new portfolio.
     """
-    try:
-        res = await project.createUserPortfolio_service.createUserPortfolio(
-            user_id, title, description, auth_token
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.createUserPortfolio_service.createUserPortfolio(
+        user_id, title, description, auth_token
+    )
+    return res
 
 
 @app.patch(
     "/feedback/{feedbackId}/status",
     response_model=project.updateFeedbackStatus_service.UpdateFeedbackStatusResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_patch_updateFeedbackStatus(
     feedbackId: int, newStatus: str
@@ -655,20 +635,10 @@ async def api_patch_updateFeedbackStatus(
     """
     Allows an admin to update the status of a feedback entry, such as 'reviewed', 'addressed' or 'pending'. Requires feedback ID and the new status as parameters. Verifies admin rights before updating the entry in the database.
     """
-    try:
-        res = await project.updateFeedbackStatus_service.updateFeedbackStatus(
-            feedbackId, newStatus
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.updateFeedbackStatus_service.updateFeedbackStatus(
+        feedbackId, newStatus
+    )
+    return res
 
 
 @app.get(
@@ -681,23 +651,14 @@ async def api_get_getFeedback(
     """
     Fetches details of a specific feedback entry. Requires the feedback ID as a path parameter. This endpoint will retrieve the feedback detail from the database including user details, feedback content, and timestamp. Intended primarily for admin use to monitor or review feedback.
     """
-    try:
-        res = await project.getFeedback_service.getFeedback(feedbackId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.getFeedback_service.getFeedback(feedbackId)
+    return res
 
 
 @app.put(
     "/portfolios/{userId}",
     response_model=project.updateUserPortfolio_service.UpdatePortfolioResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_put_updateUserPortfolio(
     userId: int,
@@ -708,46 +669,30 @@ async def api_put_updateUserPortfolio(
     """
     Updates an existing user portfolio. It allows modification of portfolio details like adding new content items or updating existing items, directly interfacing with Content Creation Tools for content management. Security measures ensure that only the portfolio owner or an admin can make changes. Returns a confirmation of the updates made.
     """
-    try:
-        res = await project.updateUserPortfolio_service.updateUserPortfolio(
-            userId, title, description, contentItems
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.updateUserPortfolio_service.updateUserPortfolio(
+        userId, title, description, contentItems
+    )
+    return res
 
 
-@app.post("/users", response_model=project.createUser_service.CreateUserProfileResponse)
+@app.post(
+    "/users",
+    response_model=project.createUser_service.CreateUserProfileResponse,
+)
 async def api_post_createUser(
     name: str, email: str, password: str
 ) -> project.createUser_service.CreateUserProfileResponse | Response:
     """
     Creates a new user profile. It expects user detail inputs like name, email, and password. Returns the created user profile data. It is a protected endpoint ensuring only authenticated Admins can create users. Utilizes the data validation API to check the integrity of user inputs before creating the profile.
     """
-    try:
-        res = await project.createUser_service.createUser(name, email, password)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.createUser_service.createUser(name, email, password)
+    return res
 
 
 @app.post(
     "/portfolio/upload/{userId}/{contentId}",
     response_model=project.uploadContent_service.UploadContentResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_post_uploadContent(
     userId: int, contentId: int, content: project.uploadContent_service.ContentDetails
@@ -755,20 +700,37 @@ async def api_post_uploadContent(
     """
     This POST endpoint integrates with the User Portfolio module for uploading newly created or updated content by the contentId into the user's portfolio. Available strictly to authenticated Users and Admins.
     """
-    try:
-        res = await project.uploadContent_service.uploadContent(
-            userId, contentId, content
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.uploadContent_service.uploadContent(userId, contentId, content)
+    return res
+
+
+@app.post(
+    "/portfolio/upload/{userId}/{contentId}/stream",
+    response_model=project.uploadContent_service.UploadContentResponse,
+    dependencies=[Depends(require_session)],
+)
+async def api_post_uploadContentStream(
+    userId: int, contentId: int, title: str, type: str, request: Request
+) -> project.uploadContent_service.UploadContentResponse | Response:
+    """
+    Uploads large content as the raw request body, streamed to the content-addressed blob store instead of being read into memory. The request's Content-Type is stored as the content's media type, and must be one of ALLOWED_MEDIA_TYPES or the upload is rejected with 415. Identical uploads are deduplicated. Bodies over MAX_UPLOAD_BYTES are rejected with 413.
+    """
+    content_length = request.headers.get("content-length")
+    if (
+        content_length
+        and content_length.isdigit()
+        and int(content_length) > project.blob_store.MAX_UPLOAD_BYTES
+    ):
+        raise project.blob_store.BlobTooLargeError("Upload exceeds the maximum size.")
+    res = await project.uploadContent_service.uploadContentStream(
+        userId,
+        contentId,
+        title,
+        type,
+        request.headers.get("content-type", "application/octet-stream"),
+        request.stream(),
+    )
+    return res
 
 
 @app.get(
@@ -781,23 +743,14 @@ async def api_get_listAllWorkspaces(
     """
     Provides a list of all available workspaces for the guest view, typically used on public dashboards or information screens. This endpoint is designed with limited details exposure, suitable for unauthenticated or lower access level user engagements.
     """
-    try:
-        res = await project.listAllWorkspaces_service.listAllWorkspaces(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.listAllWorkspaces_service.listAllWorkspaces(request)
+    return res
 
 
 @app.put(
     "/users/{userId}",
     response_model=project.updateUser_service.UpdateUserProfileResponse,
+    dependencies=[Depends(require_session)],
 )
 async def api_put_updateUser(
     userId: int,
@@ -810,20 +763,10 @@ async def api_put_updateUser(
     """
     Updates user profile information. Accepts partial data like name or password changes. Ensures changes are validated using the security API before applying updates. It is a protected route allowing only the user or an Admin to make updates.
     """
-    try:
-        res = await project.updateUser_service.updateUser(
-            userId, name, email, password, bio, avatar
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.updateUser_service.updateUser(
+        userId, name, email, password, bio, avatar
+    )
+    return res
 
 
 @app.get(
@@ -836,36 +779,55 @@ async def api_get_getWorkspaceDetails(
     """
     Retrieves full details of a specific workspace by ID, including all active users and ongoing projects. This information is essential for displaying the comprehensive state of the workspace on the Project Management Dashboard. Access checks through User Management are performed to ensure only authorized users can access the details.
     """
-    try:
-        res = await project.getWorkspaceDetails_service.getWorkspaceDetails(workspaceId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.getWorkspaceDetails_service.getWorkspaceDetails(workspaceId)
+    return res
+
+
+@app.get(
+    "/workspace/{workspaceId}/summary",
+    response_model=project.getWorkspaceSummary_service.WorkspaceSummaryResponse,
+)
+async def api_get_getWorkspaceSummary(
+    workspaceId: int,
+) -> project.getWorkspaceSummary_service.WorkspaceSummaryResponse | Response:
+    """
+    Retrieves the precomputed activity summary of a workspace: active users, active projects, open tasks, tasks due soon and recent feedback. Dashboards read a single row instead of aggregating the workspace on every request.
+    """
+    res = await project.getWorkspaceSummary_service.getWorkspaceSummary(workspaceId)
+    return res
 
 
 @app.get("/users/{userId}", response_model=project.getUser_service.UserProfileResponse)
 async def api_get_getUser(
-    userId: int,
+    userId: int, request: Request
 ) -> project.getUser_service.UserProfileResponse | Response:
     """
     Retrieves a single user profile based on the user ID. This route is protected to ensure that a user can access only their profile or an Admin can view any profile. Returns detailed user information including linked module data from Content Creation Tools and the User Portfolio module.
     """
-    try:
-        res = await project.getUser_service.getUser(userId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.getUser_service.getUser(userId)
+    return conditional_response(request, res)
+
+
+@app.get(
+    "/health/db",
+    response_model=project.getDatabaseHealth_service.DatabaseHealthResponse,
+)
+async def api_get_getDatabaseHealth() -> (
+    project.getDatabaseHealth_service.DatabaseHealthResponse | Response
+):
+    """
+    Reports whether the database answers, along with connection pool saturation and the average time queries wait for a connection. Returns 503 if the database is unavailable.
+    """
+    res = await project.getDatabaseHealth_service.getDatabaseHealth()
+    return res
+
+
+@app.get(
+    "/metrics/password-hashing",
+    response_model=project.passwords.PasswordHashingMetrics,
+)
+async def api_get_passwordHashingMetrics() -> project.passwords.PasswordHashingMetrics:
+    """
+    Reports the state of the password hashing pool: queue depth, rejected operations and hash latency percentiles.
+    """
+    return project.passwords.password_hasher.metrics()
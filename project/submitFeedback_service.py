@@ -0,0 +1,67 @@
+from typing import Optional
+
+import prisma
+import prisma.models
+from project.cache import invalidate
+from project.lookups import Lookup, LookupFailed, run_lookups
+from project.workspace_summary import feedback_submitted
+from pydantic import BaseModel
+
+
+class PostFeedbackResponse(BaseModel):
+    """
+    Confirms that the feedback was saved, or explains why it was not.
+    """
+
+    success: bool
+    message: str
+    feedbackId: Optional[int] = None
+
+
+async def submitFeedback(
+    userId: int, postId: int, content: str
+) -> PostFeedbackResponse:
+    """
+    Allows users to submit feedback on the content. The user and the content are checked to exist before the feedback is saved, linked to both, in the same transaction that increments their feedback counters.
+
+    Args:
+        userId (int): The ID of the user submitting the feedback.
+        postId (int): The ID of the content the feedback is about.
+        content (str): The feedback itself.
+
+    Returns:
+        PostFeedbackResponse: Confirms that the feedback was saved, or explains why it was not.
+
+    Example:
+        response = await submitFeedback(1, 42, "Great write-up!")
+        > PostFeedbackResponse(success=True, message='Feedback submitted successfully.', feedbackId=7)
+    """
+    try:
+        await run_lookups(
+            Lookup(
+                prisma.models.User.prisma().find_unique(where={"id": userId}),
+                "User not found.",
+            ),
+            Lookup(
+                prisma.models.Post.prisma().find_unique(where={"id": postId}),
+                "Content not found.",
+            ),
+        )
+    except LookupFailed as e:
+        return PostFeedbackResponse(success=False, message=e.message)
+    async with prisma.get_client().tx() as transaction:
+        feedback = await prisma.models.Feedback.prisma(transaction).create(
+            data={"content": content, "userId": userId, "postId": postId}
+        )
+        await prisma.models.Post.prisma(transaction).update(
+            where={"id": postId}, data={"feedbackCount": {"increment": 1}}
+        )
+        await prisma.models.User.prisma(transaction).update(
+            where={"id": userId}, data={"feedbackCount": {"increment": 1}}
+        )
+    await invalidate("fetchContent", contentId=postId)
+    await invalidate("getUser", userId=userId)
+    await feedback_submitted(userId)
+    return PostFeedbackResponse(
+        success=True, message="Feedback submitted successfully.", feedbackId=feedback.id
+    )
@@ -1,5 +1,6 @@
 import prisma
 import prisma.models
+from project.cache import invalidate
 from pydantic import BaseModel
 
 
@@ -35,4 +36,5 @@ async def updateFeedbackStatus(
     updated_feedback = await prisma.models.Feedback.prisma().update(
         where={"id": feedbackId}, data={"content": newStatus}
     )
+    await invalidate("getFeedback", feedbackId=feedbackId)
     return UpdateFeedbackStatusResponse(success=True, updatedFeedback=updated_feedback)
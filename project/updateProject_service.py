@@ -5,6 +5,7 @@ from typing import Optional
 import prisma
 import prisma.enums
 import prisma.models
+from project.cache import invalidate, invalidate_endpoint
 from pydantic import BaseModel
 
 
@@ -57,6 +58,10 @@ async def updateProject(
         where={"id": id}, data=update_data, include={"tasks": True}
     )
     if db_project:
+        await invalidate("publicProjectInfo", id=id)
+        await invalidate_endpoint("listAllWorkspaces")
+        if db_project.userId is not None:
+            await invalidate("getUser", userId=db_project.userId)
         project_model = Project(
             id=db_project.id, name=db_project.name, status=db_project.status
         )
@@ -1,9 +1,22 @@
-from typing import List, Optional
+import asyncio
+from typing import Dict, List, Optional
 
 import prisma
 import prisma.models
+from project.cache import invalidate
+from project.content_index import (
+    RELEASE_QUERY,
+    RETAIN_QUERY,
+    collect_unreferenced,
+    content_hash,
+)
 from pydantic import BaseModel
 
+RESERVE_POST_IDS_QUERY = """
+SELECT nextval(pg_get_serial_sequence('"Post"', 'id'))::int AS "id"
+FROM generate_series(1, $1)
+"""
+
 
 class ContentItem(BaseModel):
     """
@@ -15,13 +28,24 @@ class ContentItem(BaseModel):
     contentType: str
 
 
+class ContentItemOutcome(BaseModel):
+    """
+    What happened to one content item of a portfolio update: "updated" for an existing item of the user, "created" for an item that did not exist yet, or "skipped" for an item that belongs to another user or that is listed again later in the same request. contentId is the ID of the post written, so for created items it is the ID of the new post.
+    """
+
+    contentId: int
+    outcome: str
+    message: str
+
+
 class UpdatePortfolioResponse(BaseModel):
     """
-    Confirms the updates made to a user's portfolio, including a list of updated or added content items.
+    Confirms the updates made to a user's portfolio, including a list of updated or added content items and the outcome of every requested item.
     """
 
     updated: bool
     updatedItems: List[ContentItem]
+    outcomes: List[ContentItemOutcome] = []
 
 
 async def updateUserPortfolio(
@@ -32,6 +56,13 @@ async def updateUserPortfolio(
     directly interfacing with Content Creation Tools for content management. Security measures ensure that only the portfolio owner or an
     admin can make changes. Returns a confirmation of the updates made.
 
+    The profile and the content items that already exist are looked up concurrently, with one query each. Items are then split into updates
+    (existing items of the user) and creates (items that do not exist yet), and written together with the portfolio in a single batched
+    transaction, along with the content hash index updates for their payloads. Items that belong to another user are skipped. The IDs of the
+    new posts are reserved beforehand, so they can be inserted by one create_many and still be returned. An existing item listed several
+    times is written once, with its last occurrence; its earlier occurrences are reported as skipped. Every requested item gets one outcome,
+    in request order.
+
     Args:
         userId (int): The unique identifier of the user whose portfolio is being updated.
         title (str): The new title of the portfolio.
@@ -39,52 +70,122 @@ async def updateUserPortfolio(
         contentItems (List[ContentItem]): List of content items to be added or updated in the portfolio.
 
     Returns:
-        UpdatePortfolioResponse: Confirms the updates made to a user's portfolio, including a list of updated or added content items.
+        UpdatePortfolioResponse: Confirms the updates made to a user's portfolio, including a list of updated or added content items and the outcome of every requested item.
     """
-    profile = await prisma.models.Profile.prisma().find_unique(
-        where={"userId": userId}, include={"portfolio": True}
+    profile, existing = await asyncio.gather(
+        prisma.models.Profile.prisma().find_unique(
+            where={"userId": userId}, include={"portfolio": True}
+        ),
+        existing_content([item.contentId for item in contentItems]),
     )
     if not profile or not profile.portfolio:
         return UpdatePortfolioResponse(updated=False, updatedItems=[])
-    portfolio = await prisma.models.Portfolio.prisma().update(
-        where={"id": profile.portfolio[0].id},
-        data={"title": title, "description": description},
-    )
-    updated_items = []
-    for item in contentItems:
-        if content_id_exists(item.contentId):
-            await prisma.models.Post.prisma().update(
-                where={"id": item.contentId},
-                data={
-                    "title": title,
-                    "content": item.contentData,
-                    "type": item.contentType,
-                },
+    updates: Dict[int, int] = {}
+    outcomes: Dict[int, ContentItemOutcome] = {}
+    creates: List[int] = []
+    for position, item in enumerate(contentItems):
+        post = existing.get(item.contentId)
+        if post is None:
+            creates.append(position)
+        elif post.userId != userId:
+            outcomes[position] = ContentItemOutcome(
+                contentId=item.contentId,
+                outcome="skipped",
+                message="Content item belongs to another user.",
             )
         else:
-            await prisma.models.Post.prisma().create(
+            if item.contentId in updates:
+                outcomes[updates[item.contentId]] = ContentItemOutcome(
+                    contentId=item.contentId,
+                    outcome="skipped",
+                    message="Content item is listed again later in the request; only its last occurrence is written.",
+                )
+            updates[item.contentId] = position
+    new_ids: Dict[int, int] = {}
+    if creates:
+        reserved = await prisma.get_client().query_raw(
+            RESERVE_POST_IDS_QUERY, len(creates)
+        )
+        new_ids = dict(zip(creates, (row["id"] for row in reserved)))
+    # Hashes are kept by position, as several new items may share a placeholder contentId.
+    hashes = [content_hash(item.contentData) for item in contentItems]
+    released = [existing[content_id].contentHash for content_id in updates]
+    async with prisma.get_client().batch_() as batcher:
+        batcher.portfolio.update(
+            where={"id": profile.portfolio[0].id},
+            data={"title": title, "description": description},
+        )
+        for position in [*updates.values(), *creates]:
+            batcher.execute_raw(RETAIN_QUERY, *hashes[position])
+        for hash in released:
+            if hash is not None:
+                batcher.execute_raw(RELEASE_QUERY, hash)
+        for content_id, position in updates.items():
+            item = contentItems[position]
+            batcher.post.update(
+                where={"id": content_id},
                 data={
                     "title": title,
-                    "content": item.contentData,
-                    "userId": userId,
+                    "content": prisma.Json(item.contentData),
+                    "contentHash": hashes[position][0],
                     "type": item.contentType,
-                }
+                },
             )
-        updated_items.append(item)
-    return UpdatePortfolioResponse(updated=True, updatedItems=updated_items)
+        if creates:
+            batcher.post.create_many(
+                data=[
+                    {
+                        "id": new_ids[position],
+                        "title": title,
+                        "content": prisma.Json(contentItems[position].contentData),
+                        "contentHash": hashes[position][0],
+                        "userId": userId,
+                        "type": contentItems[position].contentType,
+                    }
+                    for position in creates
+                ]
+            )
+    await collect_unreferenced(released)
+    await invalidate("getUserPortfolio", userId=userId)
+    await invalidate("getUser", userId=userId)
+    for content_id in updates:
+        await invalidate("fetchContent", contentId=content_id)
+    for content_id, position in updates.items():
+        outcomes[position] = ContentItemOutcome(
+            contentId=content_id, outcome="updated", message="Content item updated."
+        )
+    for position, content_id in new_ids.items():
+        outcomes[position] = ContentItemOutcome(
+            contentId=content_id, outcome="created", message="Content item created."
+        )
+    ordered = sorted(outcomes.items())
+    updated_items = [
+        contentItems[position].model_copy(update={"contentId": outcome.contentId})
+        for position, outcome in ordered
+        if outcome.outcome != "skipped"
+    ]
+    return UpdatePortfolioResponse(
+        updated=True,
+        updatedItems=updated_items,
+        outcomes=[outcome for _, outcome in ordered],
+    )
 
 
-async def content_id_exists(content_id: int) -> bool:
+async def existing_content(
+    content_ids: List[int],
+) -> Dict[int, prisma.models.Post]:
     """
-    Checks if a content item with a given ID exists in the database.
+    Finds which of the given content items exist, with a single query.
 
     Args:
-        content_id (int): The ID of the content item to check.
+        content_ids (List[int]): The IDs of the content items to check.
 
     Returns:
-        bool: True if the content item exists, False otherwise.
+        Dict[int, prisma.models.Post]: Each content item that exists, keyed by content ID.
     """
-    return (
-        await prisma.models.Post.prisma().find_unique(where={"id": content_id})
-        is not None
+    if not content_ids:
+        return {}
+    posts = await prisma.models.Post.prisma().find_many(
+        where={"id": {"in": list(set(content_ids))}}
     )
+    return {post.id: post for post in posts}
@@ -1,8 +1,10 @@
 from typing import List, Optional
 
-import bcrypt
 import prisma
 import prisma.models
+from project.auth import forget_failed_logins, forget_user_credentials
+from project.cache import invalidate, invalidate_endpoint
+from project.passwords import hash_password
 from pydantic import BaseModel
 
 
@@ -52,7 +54,7 @@ async def updateUser(
         update_user_data["email"] = email
         updated_fields.append("email")
     if password:
-        encrypted_password = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+        encrypted_password = await hash_password(password)
         update_user_data["password"] = encrypted_password
         updated_fields.append("password")
     if update_user_data:
@@ -70,6 +72,15 @@ async def updateUser(
             await prisma.models.Profile.prisma().update(
                 where={"userId": userId}, data=update_profile_data
             )
+    if "email" in updated_fields or "password" in updated_fields:
+        forget_user_credentials(userId)
+        forget_failed_logins(user.email)
+        if email:
+            forget_failed_logins(email)
+    if updated_fields:
+        await invalidate("getUser", userId=userId)
+    if "email" in updated_fields or "avatar" in updated_fields:
+        await invalidate_endpoint("getFeedback")
     return UpdateUserProfileResponse(
         success=True, userId=userId, updatedFields=updated_fields
     )
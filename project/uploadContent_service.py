@@ -1,8 +1,24 @@
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
 import prisma
 import prisma.enums
 import prisma.models
+from project.blob_store import (
+    BlobReference,
+    SpooledBlob,
+    blob_content,
+    blob_store,
+    upload_media_type,
+)
+from project.cache import invalidate
+from project.content_index import (
+    collect_unreferenced,
+    content_hash,
+    lock,
+    release,
+    retain,
+)
+from project.lookups import Lookup, LookupFailed, run_lookups
 from pydantic import BaseModel
 
 
@@ -25,6 +41,54 @@ class UploadContentResponse(BaseModel):
     success: bool
     message: str
     contentId: int
+    blob: Optional[BlobReference] = None
+    deduplicated: bool = False
+
+
+async def _save_post(
+    contentId: int,
+    data: Dict[str, Any],
+    payload: Any,
+    existing_hash: Optional[str],
+    spooled: Optional[SpooledBlob] = None,
+) -> Tuple[int, bool]:
+    """
+    Creates or updates a post, indexing its new payload and releasing the payload it replaces in the same transaction. For a streamed upload, the blob is put in place within the transaction, under the payload's lock and after its reference is taken.
+
+    Args:
+        contentId (int): The post to update, or 0 to create one.
+        data (Dict[str, Any]): The post's fields.
+        payload (Any): The post's content, as stored in Post.content.
+        existing_hash (Optional[str]): The content hash of the post being updated, if any.
+        spooled (Optional[SpooledBlob]): The spooled blob the payload refers to, for streamed uploads.
+
+    Returns:
+        Tuple[int, bool]: The post's ID, and whether an identical payload was already stored.
+    """
+    hash, size, blob = content_hash(payload)
+    try:
+        async with prisma.get_client().tx() as transaction:
+            if spooled is not None:
+                await lock(hash, transaction)
+            duplicate = await retain(hash, size, blob, transaction)
+            if spooled is not None:
+                await blob_store.commit(spooled)
+            if contentId > 0:
+                await release(existing_hash, transaction)
+                await prisma.models.Post.prisma(transaction).update(
+                    where={"id": contentId}, data={**data, "contentHash": hash}
+                )
+            else:
+                post = await prisma.models.Post.prisma(transaction).create(
+                    data={**data, "contentHash": hash}
+                )
+                contentId = post.id
+    except BaseException:
+        if spooled is not None:
+            await collect_unreferenced([hash])
+        raise
+    await collect_unreferenced([existing_hash])
+    return contentId, duplicate
 
 
 async def uploadContent(
@@ -61,12 +125,97 @@ async def uploadContent(
             return UploadContentResponse(
                 success=False, message="Content ID not found.", contentId=contentId
             )
-        updated_post = await prisma.models.Post.prisma().update(
-            where={"id": contentId}, data=content_data
+        _, duplicate = await _save_post(
+            contentId, content_data, content.data, existing_post.contentHash
         )
+        await invalidate("fetchContent", contentId=contentId)
         message = "Content updated successfully."
     else:
-        updated_post = await prisma.models.Post.prisma().create(data=content_data)
+        contentId, duplicate = await _save_post(0, content_data, content.data, None)
         message = "Content uploaded successfully."
-        contentId = updated_post.id
-    return UploadContentResponse(success=True, message=message, contentId=contentId)
+    return UploadContentResponse(
+        success=True, message=message, contentId=contentId, deduplicated=duplicate
+    )
+
+
+async def uploadContentStream(
+    userId: int,
+    contentId: int,
+    title: str,
+    type: str,
+    media_type: str,
+    chunks: AsyncIterator[bytes],
+) -> UploadContentResponse:
+    """
+    Uploads large content, such as images and videos, without holding it in memory. The body is read chunk by chunk and spooled to the content-addressed blob store; Post.content only stores a reference to the blob along with its size and media type. If identical bytes were uploaded before, the existing blob is reused and nothing new is written to disk.
+
+    Args:
+        userId (int): The ID of the user who is uploading the content. Must correspond to an existing user in the User database.
+        contentId (int): The content to replace, or 0 to create new content.
+        title (str): The title of the content.
+        type (str): The type of the content, one of IMAGE, VIDEO or TEXT.
+        media_type (str): The media type of the uploaded bytes.
+        chunks (AsyncIterator[bytes]): The uploaded bytes, e.g. the request body stream.
+
+    Returns:
+        UploadContentResponse: Response after successfully uploading content into the user's portfolio, including the stored blob's reference and whether it was deduplicated.
+
+    Raises:
+        BlobTooLargeError: If the upload exceeds MAX_UPLOAD_BYTES.
+        UnsupportedMediaTypeError: If media_type is not in ALLOWED_MEDIA_TYPES.
+
+    Example:
+        response = await uploadContentStream(1, 0, "Launch video", "VIDEO", "video/mp4", request.stream())
+        > UploadContentResponse(success=True, message='Content uploaded successfully.', contentId=12, blob=BlobReference(sha256='9f86d0...', size=73400320, mediaType='video/mp4'), deduplicated=False)
+    """
+    media_type = upload_media_type(media_type)
+    post_type = prisma.enums.PostType.__members__.get(type.upper())
+    if post_type is None:
+        return UploadContentResponse(
+            success=False, message="Unknown content type.", contentId=contentId
+        )
+    try:
+        _, existing_post = await run_lookups(
+            Lookup(
+                prisma.models.User.prisma().find_unique(where={"id": userId}),
+                "User not found.",
+            ),
+            Lookup(
+                prisma.models.Post.prisma().find_unique(where={"id": contentId}),
+                "Content ID not found.",
+                lambda post: contentId <= 0 or post is not None,
+            ),
+        )
+    except LookupFailed as e:
+        return UploadContentResponse(
+            success=False, message=e.message, contentId=contentId
+        )
+    spooled = await blob_store.spool_stream(chunks, media_type)
+    payload = blob_content(spooled.reference)
+    content_data = {
+        "title": title,
+        "content": prisma.Json(payload),
+        "type": post_type,
+        "userId": userId,
+    }
+    try:
+        if contentId > 0:
+            _, duplicate = await _save_post(
+                contentId, content_data, payload, existing_post.contentHash, spooled
+            )
+            await invalidate("fetchContent", contentId=contentId)
+            message = "Content updated successfully."
+        else:
+            contentId, duplicate = await _save_post(
+                0, content_data, payload, None, spooled
+            )
+            message = "Content uploaded successfully."
+    finally:
+        await blob_store.discard(spooled)
+    return UploadContentResponse(
+        success=True,
+        message=message,
+        contentId=contentId,
+        blob=spooled.reference,
+        deduplicated=duplicate,
+    )
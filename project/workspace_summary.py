@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+import prisma
+import prisma.models
+
+logger = logging.getLogger(__name__)
+
+TASK_DUE_SOON_DAYS = int(os.getenv("TASK_DUE_SOON_DAYS", "7"))
+
+RECENT_FEEDBACK_DAYS = int(os.getenv("RECENT_FEEDBACK_DAYS", "7"))
+
+WORKSPACE_SUMMARY_REFRESH_SECONDS = float(
+    os.getenv("WORKSPACE_SUMMARY_REFRESH_SECONDS", "300")
+)
+
+REBUILD_QUERY = """
+WITH owners AS (
+    SELECT DISTINCT p."userId" AS "id"
+    FROM "Project" p
+    WHERE $1::int IS NULL AND p."userId" IS NOT NULL
+    UNION
+    SELECT $1::int WHERE $1::int IS NOT NULL
+), projects AS (
+    SELECT p."id", p."userId" AS "owner"
+    FROM "Project" p
+    JOIN owners o ON o."id" = p."userId"
+    WHERE p."status" = 'ACTIVE'
+), members AS (
+    SELECT DISTINCT p."owner", pm."userId"
+    FROM "ProjectMember" pm
+    JOIN projects p ON p."id" = pm."projectId"
+), tasks AS (
+    SELECT
+        p."owner",
+        count(*) AS "open",
+        count(*) FILTER (
+            WHERE t."dueDate" >= now() AT TIME ZONE 'UTC'
+              AND t."dueDate" < now() AT TIME ZONE 'UTC' + make_interval(days => $2::int)
+        ) AS "dueSoon"
+    FROM "Task" t
+    JOIN projects p ON p."id" = t."projectId"
+    GROUP BY p."owner"
+), feedback AS (
+    SELECT m."owner", count(*) AS "recent"
+    FROM "Feedback" f
+    JOIN members m ON m."userId" = f."userId"
+    WHERE f."createdAt" >= now() AT TIME ZONE 'UTC' - make_interval(days => $3::int)
+    GROUP BY m."owner"
+)
+INSERT INTO "WorkspaceSummary" (
+    "workspaceId", "activeUsers", "activeProjects", "openTasks", "tasksDueSoon", "recentFeedback", "updatedAt"
+)
+SELECT
+    o."id",
+    (SELECT count(*) FROM members m WHERE m."owner" = o."id"),
+    (SELECT count(*) FROM projects p WHERE p."owner" = o."id"),
+    coalesce(t."open", 0),
+    coalesce(t."dueSoon", 0),
+    coalesce(f."recent", 0),
+    now() AT TIME ZONE 'UTC'
+FROM owners o
+LEFT JOIN tasks t ON t."owner" = o."id"
+LEFT JOIN feedback f ON f."owner" = o."id"
+ON CONFLICT ("workspaceId") DO UPDATE SET
+    "activeUsers" = EXCLUDED."activeUsers",
+    "activeProjects" = EXCLUDED."activeProjects",
+    "openTasks" = EXCLUDED."openTasks",
+    "tasksDueSoon" = EXCLUDED."tasksDueSoon",
+    "recentFeedback" = EXCLUDED."recentFeedback",
+    "updatedAt" = EXCLUDED."updatedAt"
+"""
+
+ADJUST_QUERY = """
+UPDATE "WorkspaceSummary" SET
+    "activeProjects" = "activeProjects" + $2::int,
+    "openTasks" = "openTasks" + $3::int,
+    "tasksDueSoon" = "tasksDueSoon" + $4::int,
+    "activeUsers" = CASE WHEN $5::boolean THEN (
+        SELECT count(DISTINCT pm."userId")
+        FROM "ProjectMember" pm
+        JOIN "Project" p ON p."id" = pm."projectId"
+        WHERE p."userId" = $1 AND p."status" = 'ACTIVE'
+    ) ELSE "activeUsers" END,
+    "updatedAt" = now() AT TIME ZONE 'UTC'
+WHERE "workspaceId" = $1
+"""
+
+FEEDBACK_QUERY = """
+UPDATE "WorkspaceSummary" SET
+    "recentFeedback" = greatest("recentFeedback" + $2::int, 0),
+    "updatedAt" = now() AT TIME ZONE 'UTC'
+WHERE "workspaceId" IN (
+    SELECT DISTINCT p."userId"
+    FROM "Project" p
+    JOIN "ProjectMember" pm ON pm."projectId" = p."id"
+    WHERE pm."userId" = $1 AND p."status" = 'ACTIVE'
+)
+"""
+
+
+async def rebuild_workspace_summary(workspace_id: int) -> None:
+    """
+    Recomputes the summary of one workspace from its projects, tasks and feedback, creating the row if it does not exist yet.
+
+    Args:
+        workspace_id (int): The workspace to rebuild, i.e. the ID of the user who owns its projects.
+    """
+    await prisma.get_client().execute_raw(
+        REBUILD_QUERY, workspace_id, TASK_DUE_SOON_DAYS, RECENT_FEEDBACK_DAYS
+    )
+
+
+async def rebuild_workspace_summaries() -> int:
+    """
+    Recomputes the summary of every workspace with a single statement. This also ages out tasks that are no longer due soon and feedback that is no longer recent, which incremental updates cannot do.
+
+    Returns:
+        int: The number of summaries written.
+    """
+    return await prisma.get_client().execute_raw(
+        REBUILD_QUERY, None, TASK_DUE_SOON_DAYS, RECENT_FEEDBACK_DAYS
+    )
+
+
+async def get_workspace_summary(
+    workspace_id: int,
+) -> prisma.models.WorkspaceSummary:
+    """
+    Reads the precomputed summary of a workspace, building it first if no write has touched the workspace since summaries were introduced.
+
+    Args:
+        workspace_id (int): The ID of the user who owns the workspace's projects.
+
+    Returns:
+        prisma.models.WorkspaceSummary: The workspace's summary row.
+    """
+    summary = await prisma.models.WorkspaceSummary.prisma().find_unique(
+        where={"workspaceId": workspace_id}
+    )
+    if summary is None:
+        await rebuild_workspace_summary(workspace_id)
+        summary = await prisma.models.WorkspaceSummary.prisma().find_unique_or_raise(
+            where={"workspaceId": workspace_id}
+        )
+    return summary
+
+
+async def _adjust(
+    workspace_id: int,
+    projects: int = 0,
+    open_tasks: int = 0,
+    due_soon: int = 0,
+    recount_users: bool = False,
+) -> None:
+    updated = await prisma.get_client().execute_raw(
+        ADJUST_QUERY, workspace_id, projects, open_tasks, due_soon, recount_users
+    )
+    if not updated:
+        await rebuild_workspace_summary(workspace_id)
+
+
+def _is_due_soon(due_date: Optional[datetime]) -> bool:
+    if due_date is None:
+        return False
+    if due_date.tzinfo is None:
+        due_date = due_date.replace(tzinfo=timezone.utc)
+    now = datetime.now(timezone.utc)
+    return now <= due_date < now + timedelta(days=TASK_DUE_SOON_DAYS)
+
+
+async def project_created(owner_id: Optional[int], count: int = 1) -> None:
+    """
+    Counts new active projects in their owner's workspace and recounts the workspace's active users, since their members may already belong to other projects.
+
+    Args:
+        owner_id (Optional[int]): The ID of the user who owns the projects, if any.
+        count (int): The number of projects created.
+    """
+    if owner_id is not None:
+        await _adjust(owner_id, projects=count, recount_users=True)
+
+
+async def project_removed(owner_id: Optional[int]) -> None:
+    """
+    Refreshes the workspace of a project that was deleted or changed status. Removing a project's contribution needs the same aggregation as rebuilding it, so the workspace is rebuilt.
+
+    Args:
+        owner_id (Optional[int]): The ID of the user who owned the project, if any.
+    """
+    if owner_id is not None:
+        await rebuild_workspace_summary(owner_id)
+
+
+async def tasks_added(
+    project: prisma.models.Project, due_dates: Iterable[Optional[datetime]]
+) -> None:
+    """
+    Counts new tasks of a project in its owner's workspace. Tasks of inactive projects are not counted.
+
+    Args:
+        project (prisma.models.Project): The project the tasks were added to.
+        due_dates (Iterable[Optional[datetime]]): The due date of each new task.
+    """
+    if project.userId is None or project.status != "ACTIVE":
+        return
+    due_dates = list(due_dates)
+    await _adjust(
+        project.userId,
+        open_tasks=len(due_dates),
+        due_soon=sum(1 for due_date in due_dates if _is_due_soon(due_date)),
+    )
+
+
+async def feedback_submitted(user_id: Optional[int]) -> None:
+    """
+    Counts new feedback in every workspace the submitting user is an active member of. Workspaces without a summary yet pick it up when they are first built.
+
+    Args:
+        user_id (Optional[int]): The ID of the user who submitted the feedback, if any.
+    """
+    if user_id is not None:
+        await prisma.get_client().execute_raw(FEEDBACK_QUERY, user_id, 1)
+
+
+async def feedback_deleted(user_id: Optional[int], created_at: datetime) -> None:
+    """
+    Uncounts deleted feedback from every workspace the submitting user is an active member of, if it was recent enough to be counted.
+
+    Args:
+        user_id (Optional[int]): The ID of the user who submitted the feedback, if any.
+        created_at (datetime): When the feedback was submitted.
+    """
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    recent_since = datetime.now(timezone.utc) - timedelta(days=RECENT_FEEDBACK_DAYS)
+    if user_id is not None and created_at >= recent_since:
+        await prisma.get_client().execute_raw(FEEDBACK_QUERY, user_id, -1)
+
+
+async def refresh_workspace_summaries(
+    interval: float = WORKSPACE_SUMMARY_REFRESH_SECONDS,
+) -> None:
+    """
+    Rebuilds every workspace summary every interval seconds, until cancelled. Meant to run as a background task for the lifetime of the app.
+
+    Args:
+        interval (float): The number of seconds between rebuilds.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            count = await rebuild_workspace_summaries()
+            logger.info("Rebuilt %d workspace summaries", count)
+        except Exception:
+            logger.exception("Failed to rebuild workspace summaries")